@@ -0,0 +1,56 @@
+"""Compare zipfile.extractall with ParallelZipExtractor on a synthetic build archive.
+
+Usage: python benchmarks/bench_extract.py [--size-mb 300] [--members 400] [--workers N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from fake_github import build_archive
+from utils.zip_extractor import ParallelZipExtractor
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed:8.2f} s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--members", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    work_directory = tempfile.mkdtemp(prefix="bench_extract_")
+    try:
+        archive_path = os.path.join(work_directory, "build.zip")
+        print(f"Building a {args.size_mb} MB archive with {args.members} members...")
+        build_archive(archive_path, args.size_mb, args.members)
+
+        def extractall():
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                zip_ref.extractall(os.path.join(work_directory, "extractall"))
+
+        extractor = ParallelZipExtractor(args.workers)
+        baseline = timed("zipfile.extractall", extractall)
+        parallel = timed(f"parallel ({extractor.workers} workers)", lambda: extractor.extract(
+            archive_path, os.path.join(work_directory, "parallel")))
+        print(f"Speedup: {baseline / parallel:.2f}x")
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure Manage Builds filter latency against the number of installed builds.
+
+Usage: python benchmarks/bench_filter.py [--sizes 100 1000 10000 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from utils.build_search import BuildSearchIndex
+
+QUERIES = ["open", "v1.2", "directx 1.1", "nightly", "zz", "sm64coopdx_v1.3.2"]
+
+
+def synthetic_builds(count):
+    rng = random.Random(9)
+    renderers = ["OpenGL", "DirectX"]
+    tags = ["", "_nightly", "_test", "_lab", "_mods"]
+    for index in range(count):
+        version = f"1.{rng.randint(0, 4)}.{rng.randint(0, 9)}"
+        renderer = rng.choice(renderers)
+        name = f"sm64coopdx_v{version}_Windows_{renderer}{rng.choice(tags)}_{index}"
+        yield name, (name, version, renderer)
+
+
+def average_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'builds':>8} {'query':<20} {'index ms':>10} {'scan ms':>10}")
+    for size in args.sizes:
+        index = BuildSearchIndex()
+        texts = {}
+        for name, fields in synthetic_builds(size):
+            index.add(name, fields)
+            texts[name] = "\n".join(fields).lower()
+
+        for query in QUERIES:
+            terms = query.lower().split()
+            indexed = average_ms(lambda: index.search(query), args.repeat)
+            scanned = average_ms(
+                lambda: [name for name, text in texts.items() if all(term in text for term in terms)],
+                args.repeat
+            )
+            print(f"{size:>8} {query:<20} {indexed:>10.3f} {scanned:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare install throughput with per-chunk Tk progress updates and with ProgressTracker sampling.
+
+Usage: python benchmarks/bench_progress.py [--size-mb 512] [--chunk-kb 8]
+
+The transfer is an in-memory stream of chunks, so the numbers isolate the UI cost.
+Needs a display for Tk.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from utils.progress import ProgressTracker, format_progress
+
+
+def chunks(size, chunk_size):
+    chunk = b"\0" * chunk_size
+    for _ in range(size // chunk_size):
+        yield chunk
+
+
+def per_chunk_updates(root, progress_bar, progress_label, size, chunk_size):
+    """The former install loop: every chunk updates the widgets and calls update_idletasks."""
+    downloaded_size = 0
+    for chunk in chunks(size, chunk_size):
+        downloaded_size += len(chunk)
+        progress = int((downloaded_size / size) * 100)
+        progress_bar["value"] = progress
+        progress_label.config(text=f"Progress: {progress}%")
+        root.update_idletasks()
+
+
+def sampled_updates(root, progress_bar, progress_label, size, chunk_size, refresh_ms):
+    """Transfer on a worker publishing to a ProgressTracker; the UI samples it every refresh_ms."""
+    tracker = ProgressTracker()
+    finished = threading.Event()
+
+    def transfer():
+        downloaded_size = 0
+        for chunk in chunks(size, chunk_size):
+            downloaded_size += len(chunk)
+            tracker.update(downloaded_size, size)
+        finished.set()
+
+    def sample():
+        event = tracker.sample()
+        progress_bar["value"] = int((event.done / event.total) * 100) if event.total else 0
+        progress_label.config(text=format_progress(event))
+        if finished.is_set():
+            root.quit()
+        else:
+            root.after(refresh_ms, sample)
+
+    threading.Thread(target=transfer, daemon=True).start()
+    sample()
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--chunk-kb", type=int, default=8)
+    parser.add_argument("--refresh-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    chunk_size = args.chunk_kb * 1024
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Tk is not available: {e}")
+    progress_label = tk.Label(root, text="Progress: 0%")
+    progress_label.pack()
+    progress_bar = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate")
+    progress_bar.pack()
+    root.update()
+
+    for label, run in (
+        ("per-chunk update_idletasks", lambda: per_chunk_updates(root, progress_bar, progress_label, size, chunk_size)),
+        (f"tracker sampled every {args.refresh_ms} ms",
+         lambda: sampled_updates(root, progress_bar, progress_label, size, chunk_size, args.refresh_ms)),
+    ):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<34}{args.size_mb / elapsed:10.1f} MB/s")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
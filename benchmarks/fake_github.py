@@ -0,0 +1,243 @@
+"""Local stand-in for the GitHub releases API and its asset downloads.
+
+Serves ``/repos/<owner>/<repo>/releases`` (paginated with a Link header, ETag /
+If-None-Match, X-RateLimit-* headers and an optional request budget),
+``/releases/latest`` and synthetic zip assets under ``/assets/`` with HEAD and byte
+range support. ``/assets/updated/`` serves the same archive with a few members changed,
+as the next release of a build would be. Everything is generated from a seed, so runs are reproducible.
+
+Usage: python benchmarks/fake_github.py [--port 8000] [--releases 40] [--asset-mb 8]
+"""
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zipfile
+from urllib.parse import urlsplit, parse_qs
+
+
+def build_archive(target, size_mb, members, seed=64, changed=()):
+    """Write a zip of about size_mb uncompressed MB to target (a path or a binary file).
+
+    Members alternate between random and compressible data, like a real build. The members
+    whose index is in changed get different contents of the same size.
+    """
+    rng = random.Random(seed)
+    member_size = max(1, int(size_mb * 1024 * 1024) // members)
+    words = [bytes(rng.choice(b"abcdefghijklmnopqrstuvwxyz") for _ in range(8)) for _ in range(512)]
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zip_ref:
+        for index in range(members):
+            if index % 2:
+                data = rng.randbytes(member_size) if hasattr(rng, "randbytes") else os.urandom(member_size)
+            else:
+                data = b" ".join(rng.choice(words) for _ in range(member_size // 9))
+            if index in changed:
+                data = data[::-1]
+            zip_ref.writestr(f"data/{index // 50}/member_{index}.bin", data)
+
+
+class FakeGitHub:
+    """Threaded HTTP server emulating the parts of GitHub the launcher uses.
+
+    rate_limit (requests per rate_window seconds, None for unlimited) applies to API
+    calls only; once exhausted they get 403 with X-RateLimit-Remaining: 0 until the window resets.
+    """
+
+    OWNER_REPO = "coop-deluxe/sm64coopdx"
+    PER_PAGE = 30
+
+    def __init__(self, releases=40, assets_per_release=2, asset_mb=8, asset_members=64, seed=64,
+                 rate_limit=None, rate_window=60, port=0):
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.api_requests = 0
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_requests = 0
+
+        # Un seul contenu synthétique partagé par tous les assets : seuls les noms changent
+        archive = io.BytesIO()
+        build_archive(archive, asset_mb, asset_members, seed)
+        self.asset_data = archive.getvalue()
+        self.asset_digest = "sha256:" + hashlib.sha256(self.asset_data).hexdigest()
+        self._archive_arguments = (asset_mb, asset_members, seed)
+        self.updated_data = None
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.releases_url = f"{self.base_url}/repos/{self.OWNER_REPO}/releases"
+        self.releases = self._make_releases(releases, assets_per_release)
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def asset_url(self, name):
+        return f"{self.base_url}/assets/{name}"
+
+    def make_update(self, changed_members):
+        """Generate the archive served under /assets/updated/, with changed_members members changed."""
+        archive = io.BytesIO()
+        size_mb, members, seed = self._archive_arguments
+        build_archive(archive, size_mb, members, seed, changed=range(changed_members))
+        self.updated_data = archive.getvalue()
+
+    def updated_asset_url(self, name):
+        return f"{self.base_url}/assets/updated/{name}"
+
+    def _make_releases(self, count, assets_per_release):
+        renderers = ["OpenGL", "DirectX", "Vulkan"]
+        releases = []
+        for index in range(count, 0, -1):
+            version = f"1.{index // 10}.{index % 10}"
+            assets = []
+            for renderer in renderers[:assets_per_release]:
+                name = f"sm64coopdx_v{version}_Windows_{renderer}.zip"
+                assets.append({
+                    "name": name,
+                    "size": len(self.asset_data),
+                    "digest": self.asset_digest,
+                    "browser_download_url": self.asset_url(name)
+                })
+            releases.append({
+                "id": index,
+                "tag_name": f"v{version}",
+                "name": f"v{version}",
+                "body": f"## v{version}\n\n- Synthetic release {index}",
+                "assets": assets
+            })
+        return releases
+
+    def _consume_rate_limit(self):
+        """Count one API request; return (allowed, remaining, reset_epoch)."""
+        with self._lock:
+            self.api_requests += 1
+            now = time.time()
+            if now - self._window_start >= self.rate_window:
+                self._window_start = now
+                self._window_requests = 0
+            reset = math.ceil(self._window_start + self.rate_window)
+            if self.rate_limit is None:
+                return True, 5000, reset
+            if self._window_requests >= self.rate_limit:
+                return False, 0, reset
+            self._window_requests += 1
+            return True, self.rate_limit - self._window_requests, reset
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self._dispatch(head=True)
+
+            def do_GET(self):
+                self._dispatch(head=False)
+
+            def _dispatch(self, head):
+                url = urlsplit(self.path)
+                if url.path.startswith("/assets/updated/") and fake.updated_data is not None:
+                    self._send_asset(head, fake.updated_data)
+                elif url.path.startswith("/assets/"):
+                    self._send_asset(head, fake.asset_data)
+                elif url.path.startswith(f"/repos/{fake.OWNER_REPO}/releases"):
+                    self._send_api(url, head)
+                else:
+                    self._send_bytes(404, b'{"message": "Not Found"}', head)
+
+            def _send_api(self, url, head):
+                allowed, remaining, reset = fake._consume_rate_limit()
+                headers = {
+                    "X-RateLimit-Limit": str(fake.rate_limit or 5000),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(reset)
+                }
+                if not allowed:
+                    self._send_bytes(403, b'{"message": "API rate limit exceeded"}', head, headers)
+                    return
+
+                if url.path.endswith("/latest"):
+                    body = fake.releases[0]
+                else:
+                    query = parse_qs(url.query)
+                    per_page = int(query.get("per_page", [fake.PER_PAGE])[0])
+                    page = int(query.get("page", ["1"])[0])
+                    body = fake.releases[(page - 1) * per_page:page * per_page]
+                    last_page = max(1, -(-len(fake.releases) // per_page))
+                    links = []
+                    if page < last_page:
+                        links.append(f'<{fake.releases_url}?per_page={per_page}&page={page + 1}>; rel="next"')
+                        links.append(f'<{fake.releases_url}?per_page={per_page}&page={last_page}>; rel="last"')
+                    if links:
+                        headers["Link"] = ", ".join(links)
+
+                data = json.dumps(body).encode()
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                headers["ETag"] = etag
+                if self.headers.get("If-None-Match") == etag:
+                    self._send_bytes(304, b"", head, headers)
+                    return
+                headers["Content-Type"] = "application/json"
+                self._send_bytes(200, data, head, headers)
+
+            def _send_asset(self, head, data):
+                headers = {"Accept-Ranges": "bytes", "ETag": f'"{fake.asset_digest[7:23]}"',
+                           "Content-Type": "application/zip"}
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(data) - 1
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    self._send_bytes(206, memoryview(data)[start:end + 1], head, headers)
+                else:
+                    self._send_bytes(200, data, head, headers)
+
+            def _send_bytes(self, status, data, head, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if not head and status != 304:
+                    self.wfile.write(data)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake GitHub releases API with synthetic assets.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--releases", type=int, default=40)
+    parser.add_argument("--asset-mb", type=float, default=8)
+    parser.add_argument("--asset-members", type=int, default=64)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(args.releases, asset_mb=args.asset_mb, asset_members=args.asset_members,
+                      rate_limit=args.rate_limit, port=args.port)
+    print(f"Serving {fake.releases_url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
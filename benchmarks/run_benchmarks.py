@@ -0,0 +1,365 @@
+"""Run the launcher benchmark scenarios against a local fake GitHub and write the results as JSON.
+
+Scenarios: catalog fetch (cold, revalidated, cached), download throughput, extraction and
+install, build list refresh with 10 / 1k / 10k builds (cold and warm index), cold start,
+the LAN mirror (a second launcher process running "cli.py serve") and a delta update
+against a full install of the same release.
+With --baseline, exits with status 1 if a scenario got slower than the baseline by more
+than --tolerance.
+
+Usage: python benchmarks/run_benchmarks.py [--output results.json] [--baseline previous.json]
+                                           [--quick] [--repeat 3] [--scenarios catalog download ...]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from fake_github import FakeGitHub
+
+SCENARIO_GROUPS = ("catalog", "download", "extract", "refresh", "cold_start", "mirror", "delta")
+
+
+def measure(func, repeat, setup=None):
+    """Run func repeat times (after setup, untimed) and return {"seconds": median, "runs": [...]}."""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(runs), "runs": runs}
+
+
+def bench_catalog(fake, work_directory, repeat):
+    from utils.github_manager import GitHubManager
+    from utils.release_cache import ReleaseCache
+
+    GitHubManager.REPO_URL = fake.releases_url
+    GitHubManager.LATEST_URL = fake.releases_url + "/latest"
+    cache_path = os.path.join(work_directory, "releases.json")
+
+    def reset_cache():
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        GitHubManager.cache = ReleaseCache(cache_path)
+
+    results = {
+        "catalog_cold": measure(lambda: GitHubManager.get_releases(), repeat, reset_cache),
+        # Entrée périmée : requête conditionnelle, réponse 304
+        "catalog_revalidate": measure(lambda: GitHubManager.get_releases(max_age=0), repeat),
+        "catalog_cached": measure(lambda: GitHubManager.get_releases(), repeat)
+    }
+    results["catalog_cold"]["releases"] = len(GitHubManager.get_releases())
+    return results
+
+
+def bench_download(fake, work_directory, repeat):
+    from utils.downloader import Downloader
+
+    url = fake.asset_url(fake.releases[0]["assets"][0]["name"])
+    destination = os.path.join(work_directory, "download.zip")
+    size_mb = len(fake.asset_data) / (1024 * 1024)
+
+    def remove():
+        if os.path.exists(destination):
+            os.remove(destination)
+
+    results = {}
+    for connections in (1, 4):
+        result = measure(lambda: Downloader(connections).download(url, destination), repeat, remove)
+        result["mb_per_second"] = size_mb / result["seconds"]
+        results[f"download_{connections}_connections"] = result
+    remove()
+    return results
+
+
+def bench_extract(fake, work_directory, repeat):
+    from utils.build_installer import BuildInstaller
+    from utils.zip_extractor import ParallelZipExtractor
+
+    archive_path = os.path.join(work_directory, "extract.zip")
+    with open(archive_path, "wb") as archive_file:
+        archive_file.write(fake.asset_data)
+    extract_directory = os.path.join(work_directory, "extracted")
+    builds_directory = os.path.join(work_directory, "install_builds")
+    asset = fake.releases[0]["assets"][0]
+
+    def clean_extract():
+        shutil.rmtree(extract_directory, ignore_errors=True)
+
+    def clean_builds():
+        shutil.rmtree(builds_directory, ignore_errors=True)
+
+    def clean_build():
+        shutil.rmtree(os.path.join(builds_directory, "bench"), ignore_errors=True)
+
+    def install(streaming, deduplicate):
+        return lambda: BuildInstaller.install(asset["browser_download_url"], asset["name"], "bench",
+                                              builds_directory, streaming=streaming, deduplicate=deduplicate,
+                                              expected_digest=asset["digest"])
+
+    results = {
+        "extract_parallel": measure(lambda: ParallelZipExtractor().extract(archive_path, extract_directory),
+                                    repeat, clean_extract),
+        "install_streaming": measure(install(True, False), repeat, clean_builds),
+        "install_downloaded": measure(install(False, False), repeat, clean_builds)
+    }
+    # Réinstallation avec le store déjà rempli : les fichiers sont liés au lieu d'être écrits
+    clean_builds()
+    install(True, True)()
+    results["install_deduplicated"] = measure(install(True, True), repeat, clean_build)
+    clean_extract()
+    clean_builds()
+    return results
+
+
+def bench_refresh(fake, work_directory, repeat, sizes):
+    from utils.file_manager import FileManager
+
+    results = {}
+    for count in sizes:
+        directory = os.path.join(work_directory, f"builds_{count}")
+        os.makedirs(directory)
+        for index in range(count):
+            build_path = os.path.join(directory, f"sm64coopdx_v1.{index % 5}.{index % 10}_Windows_OpenGL_{index}")
+            os.makedirs(build_path)
+            with open(os.path.join(build_path, "launcher_variables"), "w") as variables_file:
+                variables_file.write(f"game_version=1.{index % 5}.{index % 10}\nrenderer=OpenGL\n")
+            with open(os.path.join(build_path, "sm64coopdx.exe"), "wb") as exe_file:
+                exe_file.write(b"MZ" + bytes(1022))
+
+        index_path = os.path.join(directory, ".index.json")
+
+        def drop_index():
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        results[f"refresh_{count}_cold"] = measure(lambda: FileManager.scan_builds(directory), repeat, drop_index)
+        results[f"refresh_{count}_warm"] = measure(lambda: FileManager.scan_builds(directory), repeat)
+        shutil.rmtree(directory)
+    return results
+
+
+def bench_cold_start(fake, work_directory, repeat):
+    def run(arguments):
+        return lambda: subprocess.run([sys.executable] + arguments, cwd=work_directory, check=True,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    gui_import = (f"import sys; sys.path[:0] = [{os.path.join(ROOT, 'src')!r}, {ROOT!r}]; "
+                  "import gui.app_window")
+    return {
+        "cold_start_interpreter": measure(run(["-c", "pass"]), repeat),
+        "cold_start_cli_list": measure(run([os.path.join(ROOT, "src", "cli.py"), "list"]), repeat),
+        # Import de l'interface sans créer de fenêtre (aucun affichage n'est nécessaire)
+        "cold_start_gui_import": measure(run(["-c", gui_import]), repeat)
+    }
+
+
+def bench_mirror(fake, work_directory, repeat):
+    """Start a mirror server in its own process and fetch the catalog and an asset through it."""
+    import socket
+    import requests
+    from utils.downloader import Downloader
+    from utils.github_manager import GitHubManager
+    from utils.mirrors import get_mirrors, set_mirrors
+    from utils.release_cache import ReleaseCache
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server_directory = os.path.join(work_directory, "mirror_server")
+    os.makedirs(server_directory)
+    # Le serveur est un second launcher, pointé vers le faux GitHub
+    server_code = (
+        f"import sys; sys.path[:0] = [{os.path.join(ROOT, 'src')!r}, {ROOT!r}]; "
+        "from utils.github_manager import GitHubManager; "
+        f"GitHubManager.REPO_URL = {fake.releases_url!r}; GitHubManager.LATEST_URL = {fake.releases_url + '/latest'!r}; "
+        f"import cli; sys.exit(cli.main(['serve', '--host', '127.0.0.1', '--port', '{port}']))"
+    )
+    server = subprocess.Popen([sys.executable, "-c", server_code], cwd=server_directory,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    mirror = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                requests.get(f"{mirror}/ping", timeout=1).raise_for_status()
+                break
+            except requests.RequestException:
+                time.sleep(0.05)
+        set_mirrors([mirror])
+        GitHubManager.REPO_URL = fake.releases_url
+        GitHubManager.LATEST_URL = fake.releases_url + "/latest"
+        cache_path = os.path.join(work_directory, "mirror_releases.json")
+
+        def reset_cache():
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            GitHubManager.cache = ReleaseCache(cache_path)
+
+        results = {"mirror_catalog": measure(lambda: GitHubManager.get_releases(), repeat, reset_cache)}
+
+        url = fake.asset_url(fake.releases[0]["assets"][0]["name"])
+        destination = os.path.join(work_directory, "mirror_download.zip")
+        size_mb = len(fake.asset_data) / (1024 * 1024)
+
+        def remove():
+            if os.path.exists(destination):
+                os.remove(destination)
+
+        # Premier téléchargement : le miroir n'a pas l'asset, le client passe par GitHub et le miroir le récupère
+        results["mirror_download_miss"] = measure(lambda: Downloader().download(url, destination), 1, remove)
+        _, asset_url = get_mirrors().asset_candidates(url)[0]
+        for _ in range(600):
+            if requests.head(asset_url, timeout=5).status_code == 200:
+                break
+            time.sleep(0.05)
+
+        expected_digest = fake.asset_digest.split(":", 1)[1]
+        digests = []
+        result = measure(lambda: digests.append(Downloader().download(url, destination)), repeat, remove)
+        if any(digest != expected_digest for digest in digests):
+            raise RuntimeError("Mirror served an asset that does not match its digest.")
+        result["mb_per_second"] = size_mb / result["seconds"]
+        results["mirror_download_hit"] = result
+        remove()
+        return results
+    finally:
+        set_mirrors([])
+        server.terminate()
+        server.wait()
+
+
+def bench_delta(fake, work_directory, repeat, changed_members=4):
+    """Update an installed build to a release where changed_members members differ, against a full install."""
+    from utils.build_installer import BuildInstaller
+
+    fake.make_update(changed_members)
+    asset = fake.releases[0]["assets"][0]
+    updated_url = fake.updated_asset_url(asset["name"])
+    builds_directory = os.path.join(work_directory, "delta_builds")
+    BuildInstaller.install(asset["browser_download_url"], asset["name"], "base", builds_directory,
+                           deduplicate=False, expected_digest=asset["digest"])
+
+    def clean_build():
+        shutil.rmtree(os.path.join(builds_directory, "next"), ignore_errors=True)
+
+    reports = []
+    results = {
+        "delta_full_install": measure(lambda: BuildInstaller.install(updated_url, asset["name"], "next", builds_directory,
+                                                                    deduplicate=False), repeat, clean_build),
+        "delta_update": measure(lambda: reports.append(BuildInstaller.update(updated_url, asset["name"], "base", "next",
+                                                                            builds_directory, deduplicate=False)),
+                                repeat, clean_build)
+    }
+    if not all(report["delta"] for report in reports):
+        raise RuntimeError("The update fell back to a full install.")
+    results["delta_update"]["bytes_downloaded"] = reports[-1]["bytes_downloaded"]
+    results["delta_full_install"]["bytes_downloaded"] = len(fake.updated_data)
+    shutil.rmtree(builds_directory, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Return the list of scenarios slower than the baseline beyond tolerance."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        delta = result["seconds"] - previous["seconds"]
+        if delta > min_delta and result["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append((name, previous["seconds"], result["seconds"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Results of a previous run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed slowdown (default: 0.20 = 20%%).")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Ignore slowdowns smaller than this many seconds (default: 0.005).")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Smaller assets and no 10k-build refresh.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIO_GROUPS, default=list(SCENARIO_GROUPS))
+    parser.add_argument("--asset-mb", type=float, default=None, help="Uncompressed size of the synthetic assets.")
+    parser.add_argument("--asset-members", type=int, default=None)
+    args = parser.parse_args()
+
+    asset_mb = args.asset_mb or (8 if args.quick else 64)
+    asset_members = args.asset_members or (64 if args.quick else 400)
+    refresh_sizes = [10, 1000] if args.quick else [10, 1000, 10000]
+
+    work_directory = tempfile.mkdtemp(prefix="launcher_bench_")
+    fake = FakeGitHub(releases=40, asset_mb=asset_mb, asset_members=asset_members).start()
+    results = {}
+    try:
+        for group in args.scenarios:
+            print(f"Running {group}...")
+            if group == "catalog":
+                results.update(bench_catalog(fake, work_directory, args.repeat))
+            elif group == "download":
+                results.update(bench_download(fake, work_directory, args.repeat))
+            elif group == "extract":
+                results.update(bench_extract(fake, work_directory, args.repeat))
+            elif group == "refresh":
+                results.update(bench_refresh(fake, work_directory, args.repeat, refresh_sizes))
+            elif group == "cold_start":
+                results.update(bench_cold_start(fake, work_directory, args.repeat))
+            elif group == "mirror":
+                results.update(bench_mirror(fake, work_directory, args.repeat))
+            elif group == "delta":
+                results.update(bench_delta(fake, work_directory, args.repeat))
+    finally:
+        fake.stop()
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    for name, result in results.items():
+        extra = f"  ({result['mb_per_second']:.1f} MB/s)" if "mb_per_second" in result else ""
+        if "bytes_downloaded" in result:
+            extra += f"  ({result['bytes_downloaded'] / (1024 * 1024):.1f} MB over the wire)"
+        print(f"{name:<32}{result['seconds'] * 1000:10.1f} ms{extra}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "asset_mb": asset_mb,
+            "asset_members": asset_members,
+            "asset_bytes": len(fake.asset_data)
+        },
+        "results": results
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,77 @@
-LAUNCHER_VERSION = "0.1"
\ No newline at end of file
+LAUNCHER_VERSION = "0.1"
+
+# Dossier des données mises en cache par le launcher (catalogue des releases, ...)
+CACHE_DIRECTORY = "cache"
+
+# Durée (en secondes) pendant laquelle le catalogue GitHub en cache est utilisé sans revalidation
+RELEASE_CACHE_TTL = 600
+
+# Décompresse les builds pendant leur téléchargement au lieu d'écrire le zip puis de l'extraire
+STREAMING_INSTALL = True
+
+# Partage les fichiers identiques entre builds via un store adressé par contenu (liens physiques)
+DEDUPLICATE_BUILDS = True
+
+# Budget (en millisecondes) du démarrage à froid, vérifié par "main.py --profile-startup"
+STARTUP_BUDGET_MS = 1500
+
+# File d'installation : nombre d'installations simultanées et débit maximal global (octets/s, 0 = illimité)
+MAX_CONCURRENT_INSTALLS = 2
+INSTALL_BANDWIDTH_LIMIT = 0
+
+# Session HTTP partagée : connexions gardées ouvertes par hôte, délais (secondes) et nouvelles tentatives
+HTTP_POOL_SIZE = 10
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_READ_TIMEOUT = 60
+HTTP_RETRIES = 3
+HTTP_MAX_RETRY_WAIT = 60  # Attente maximale demandée par Retry-After / X-RateLimit-Reset avant d'abandonner
+HTTP_GZIP = True
+
+# Journal des opérations chronométrées (cache/trace.jsonl), tourné au-delà de TRACE_LOG_MAX_BYTES
+TRACE_LOG_ENABLED = True
+TRACE_LOG_MAX_BYTES = 1024 * 1024
+TRACE_LOG_BACKUPS = 3
+
+# Pré-téléchargement (optionnel) de la dernière release pendant que le launcher est inactif
+PREFETCH_NEW_RELEASES = False
+PREFETCH_INTERVAL = 3600  # Secondes entre deux vérifications du catalogue
+PREFETCH_BANDWIDTH_LIMIT = 1024 * 1024  # Octets/s
+PREFETCH_RENDERER = None  # None : moteur de rendu de la dernière build installée
+
+# Taille maximale du cache des assets pré-téléchargés (cache/assets), les moins récemment utilisés sont supprimés
+ASSET_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Délai (secondes) pendant lequel une build supprimée reste dans builds/.trash et peut être restaurée
+TRASH_GRACE_PERIOD = 30
+
+# Suivi des instances du jeu lancées par le launcher
+PROCESS_SAMPLE_INTERVAL = 1.0  # Secondes entre deux mesures CPU/mémoire
+PROCESS_OUTPUT_LINES = 500  # Lignes de stdout/stderr gardées par instance
+PROCESS_READY_TIMEOUT = 60  # Secondes avant d'abandonner la mesure du temps de démarrage
+PROCESS_LOG_KEEP = 20  # Instances dont la sortie reste dans cache/games (un fichier stdout et un stderr chacune)
+LAUNCH_STAGGER = 2.0  # Secondes entre deux instances lancées ensemble
+
+# Cache LAN : ce launcher sert son catalogue et ses assets aux autres launchers du réseau
+MIRROR_SERVER_ENABLED = False
+MIRROR_SERVER_HOST = "0.0.0.0"
+MIRROR_SERVER_PORT = 8640
+
+# Miroirs LAN essayés avant GitHub, le plus rapide d'abord (ex. ["http://192.168.1.10:8640"])
+MIRRORS = []
+MIRROR_PROBE_TIMEOUT = 1.0  # Secondes
+MIRROR_PROBE_TTL = 300  # Secondes entre deux mesures de latence des miroirs
+
+# Archivage des builds inactives dans builds/.archive
+ARCHIVE_CODEC = "auto"  # "auto" (zstd si le module zstandard est installé, sinon lzma), "zstd", "lzma" ou "zlib"
+ARCHIVE_LEVEL = None  # None : niveau par défaut du codec
+ARCHIVE_FRAME_SIZE = 4 * 1024 * 1024  # Octets non compressés par bloc, chaque bloc se décompresse indépendamment
+
+# Mise à jour différentielle d'une build installée vers une nouvelle release
+DELTA_MAX_RATIO = 0.6  # Au-delà de cette part de l'asset à télécharger, installation complète
+DELTA_MERGE_GAP = 64 * 1024  # Octets : deux membres modifiés plus proches sont récupérés en une seule requête
+
+# Données utilisateur d'une build (configuration, sauvegardes, mods et packs ajoutés) reprises par "Migrate Data"
+USER_DATA_PATHS = ["sm64config.txt", "sm64_save_file.bin", "mods", "dynos", "palettes"]
+# Dossiers dont les fichiers peuvent être partagés par lien physique quand le copy-on-write n'est pas disponible
+# (le jeu ne les modifie pas ; la configuration et les sauvegardes sont toujours copiées)
+USER_DATA_LINKED_PATHS = ["mods", "dynos"]
@@ -0,0 +1,424 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# Ajouter le dossier racine au chemin Python (config.py)
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import MAX_CONCURRENT_INSTALLS, LAUNCH_STAGGER, MIRROR_SERVER_HOST, MIRROR_SERVER_PORT
+
+# Aucune dépendance à Tk ici ; requests et les modules d'installation ne sont importés
+# que par les commandes qui en ont besoin, pour que "list" réponde en quelques millisecondes.
+
+
+def output(args, data, text_lines):
+    """Print data as JSON with --json, otherwise the human-readable lines."""
+    if args.json:
+        print(json.dumps(data, indent=2), file=args.stdout)
+    else:
+        for line in text_lines:
+            print(line, file=args.stdout)
+
+
+def command_list(args):
+    if args.remote:
+        from utils.github_manager import GitHubManager
+        releases = GitHubManager.get_releases()
+        lines = []
+        for release in releases:
+            lines.append(release["name"])
+            lines.extend(f"    {asset['name']}" for asset in release["assets"])
+        output(args, releases, lines)
+        return 0 if releases else 1
+
+    from utils.build_archive import BuildArchive
+    from utils.build_index import BuildIndex
+    entries = BuildIndex(args.directory).scan()
+    builds = [
+        dict({key: entry[key] for key in ("name", "game_version", "renderer", "size", "installed_at", "exe_path")},
+             archived=False)
+        for entry in entries
+    ]
+    # Builds archivées : lues depuis l'en-tête des packs, sans rien décompresser
+    builds += [
+        {"name": header["name"], "game_version": header["game_version"], "renderer": header["renderer"],
+         "size": header["original_size"], "installed_at": None, "exe_path": None, "archived": True}
+        for header in BuildArchive(args.directory).list()
+    ]
+    builds.sort(key=lambda build: build["name"])
+    lines = [
+        f"{build['name']}\t{build['game_version']}\t{build['renderer']}" + ("\tarchived" if build["archived"] else "")
+        for build in builds
+    ]
+    output(args, builds, lines or ["No builds installed."])
+    return 0
+
+
+def resolve_assets(specs, release_name=None):
+    """Turn asset names or URLs into (download_url, file_name, digest) tuples.
+
+    Raises ValueError for names not found in the release catalog.
+    """
+    resolved = []
+    releases = None
+    for spec in specs:
+        if spec.startswith(("http://", "https://")):
+            resolved.append((spec, os.path.basename(spec.split("?")[0]), None))
+            continue
+
+        if releases is None:
+            from utils.github_manager import GitHubManager
+            releases = GitHubManager.get_releases()
+        matches = [
+            asset
+            for release in releases if release_name is None or release["name"] == release_name
+            for asset in release["assets"] if asset["name"] == spec
+        ]
+        if not matches:
+            raise ValueError(f"Asset '{spec}' not found in the releases.")
+        # Les releases sont listées de la plus récente à la plus ancienne
+        resolved.append((matches[0]["browser_download_url"], matches[0]["name"], matches[0].get("digest")))
+    return resolved
+
+
+def command_install(args):
+    if args.name and len(args.assets) > 1:
+        print("--name can only be used when installing a single asset.", file=sys.stderr)
+        return 2
+
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.build_installer import BuildInstaller
+    try:
+        assets = resolve_assets(args.assets, args.release)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    # Deux installations du même nom se disputeraient le même dossier temporaire
+    names = [args.name or os.path.splitext(file_name)[0] for _, file_name, _ in assets]
+    duplicates = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicates:
+        print(f"Each build can only be installed once: {', '.join(duplicates)}", file=sys.stderr)
+        return 2
+
+    def install(asset):
+        download_url, file_name, digest = asset
+        custom_name = args.name or os.path.splitext(file_name)[0]
+        result = {"asset": file_name, "name": custom_name}
+        try:
+            if args.base:
+                # Mise à jour différentielle : seuls les fichiers modifiés depuis la build de base sont téléchargés
+                result["update"] = BuildInstaller.update(download_url, file_name, args.base, custom_name,
+                                                         args.directory, expected_digest=digest)
+                result["path"] = os.path.join(args.directory, custom_name)
+            else:
+                result["path"] = BuildInstaller.install(download_url, file_name, custom_name, args.directory,
+                                                        expected_digest=digest)
+            result["status"] = "installed"
+            if args.migrate_from:
+                from utils.file_manager import FileManager
+                result["migration"] = FileManager.migrate_user_data(args.directory, args.migrate_from, custom_name)
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        if not args.json:
+            print(f"{result['name']}: {result['status']}" + (f" ({result['error']})" if "error" in result else ""))
+            if "update" in result:
+                print(f"    {format_update_report(result['update'])}")
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        results = list(executor.map(install, assets))
+    if args.json:
+        output(args, results, [])
+    return 0 if all(result["status"] == "installed" for result in results) else 1
+
+
+def command_remove(args):
+    from utils.file_manager import FileManager
+
+    results = [
+        {"name": name, "removed": FileManager.delete_version(args.directory, name)}
+        for name in args.names
+    ]
+    lines = [f"{result['name']}: {'removed' if result['removed'] else 'not found'}" for result in results]
+    output(args, results, lines)
+    return 0 if all(result["removed"] for result in results) else 1
+
+
+def command_launch(args):
+    import subprocess
+    import time
+    from utils.build_archive import BuildArchive
+    from utils.build_index import BuildIndex
+
+    archive = BuildArchive(args.directory)
+    if archive.exists(args.name):
+        try:
+            stats = archive.rehydrate(args.name)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Restored archived build '{args.name}' in {stats['seconds']:.2f} s.", file=sys.stderr)
+    entry = BuildIndex(args.directory).get(args.name)
+    if entry is None or entry["exe_path"] is None:
+        print(f"Executable not found for build '{args.name}'.", file=sys.stderr)
+        return 1
+    if args.monitor:
+        return monitor_launch(args, entry)
+
+    from utils.tracing import tracer
+    pids = []
+    for index in range(max(1, args.instances)):
+        if index:
+            time.sleep(args.stagger)
+        with tracer.span("launch", build=args.name):
+            pids.append(subprocess.Popen([entry["exe_path"]] + args.game_args).pid)
+    output(args, {"name": args.name, "pids": pids},
+           [f"Launched '{args.name}' (PID {pid})." for pid in pids])
+    return 0
+
+
+def monitor_launch(args, entry):
+    """Launch under the ProcessSupervisor and report startup and resource figures once every instance exits."""
+    import time
+    from utils.process_supervisor import ProcessSupervisor
+
+    supervisor = ProcessSupervisor()
+    count = max(1, args.instances)
+    supervisor.launch_many(args.name, entry["exe_path"], count, args.stagger, args.game_args,
+                           entry["game_version"], entry["renderer"], args.ready_port).join()
+    try:
+        while supervisor.running():
+            time.sleep(supervisor.sample_interval)
+    except KeyboardInterrupt:
+        for instance in supervisor.running():
+            supervisor.terminate(instance)
+    supervisor.stop()
+
+    instances = [instance.to_dict() for instance in supervisor.instances]
+    lines = []
+    for instance in instances:
+        ready = "not ready" if instance["ready_ms"] is None else f"ready in {instance['ready_ms']:.0f} ms ({instance['ready_via']})"
+        peak = "n/a" if not instance["peak_rss"] else f"{instance['peak_rss'] / (1024 * 1024):.0f} MB"
+        cpu = "n/a" if instance["average_cpu"] is None else f"{instance['average_cpu']:.0f}%"
+        lines.append(f"PID {instance['pid']}: {ready}, peak RAM {peak}, average CPU {cpu}, exit code {instance['exit_code']}")
+    output(args, instances, lines)
+    return 0 if len(instances) == count and all(instance["exit_code"] == 0 for instance in instances) else 1
+
+
+def command_migrate(args):
+    from utils.file_manager import FileManager
+
+    try:
+        stats = FileManager.migrate_user_data(args.directory, args.source, args.target)
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 1
+    # Le résumé est déjà affiché par migrate_user_data
+    output(args, stats, [])
+    return 0
+
+
+def command_archive(args):
+    from utils.build_archive import BuildArchive
+
+    archive = BuildArchive(args.directory)
+    results = []
+    lines = []
+    for name in args.names:
+        try:
+            stats = archive.archive(name)
+        except (OSError, ValueError) as e:
+            results.append({"name": name, "error": str(e)})
+            lines.append(f"{name}: {e}")
+            continue
+        results.append(stats)
+        lines.append(f"{name}: {format_megabytes(stats['original_size'])} packed into {format_megabytes(stats['packed_size'])}, "
+                     f"{format_megabytes(stats['saved_bytes'])} saved on disk ({stats['seconds']:.1f} s)")
+    output(args, results, lines)
+    return 0 if all("error" not in result for result in results) else 1
+
+
+def command_restore(args):
+    from utils.build_archive import BuildArchive
+
+    archive = BuildArchive(args.directory)
+    results = []
+    lines = []
+    for name in args.names:
+        try:
+            stats = archive.rehydrate(name)
+        except (OSError, ValueError) as e:
+            results.append({"name": name, "error": str(e)})
+            lines.append(f"{name}: {e}")
+            continue
+        results.append(stats)
+        lines.append(f"{name}: restored {stats['files']} files in {stats['seconds']:.2f} s")
+    output(args, results, lines)
+    return 0 if all("error" not in result for result in results) else 1
+
+
+def command_mods(args):
+    from utils.mod_index import ModIndex
+    from utils.mod_store import ModStore
+
+    if not os.path.isdir(os.path.join(args.directory, args.name)):
+        print(f"Build '{args.name}' not found.", file=sys.stderr)
+        return 1
+    mods = ModIndex(args.directory).scan(args.name)
+    shared = set(record["sha256"] for record in ModStore(args.directory).list())
+    for mod in mods:
+        mod["shared"] = mod["sha256"] in shared
+    lines = [
+        f"{mod['id']}\t{mod['name']}\t{format_megabytes(mod['size'])}\t{mod['files']} files"
+        + ("\tshared" if mod["shared"] else "")
+        for mod in mods
+    ]
+    output(args, mods, lines)
+    return 0
+
+
+def format_update_report(report):
+    if not report["delta"]:
+        return f"full install ({report['reason']}) in {report['seconds']:.1f} s"
+    line = (f"{report['downloaded_files']} of {report['files']} files downloaded: "
+            f"{format_megabytes(report['bytes_downloaded'])} instead of {format_megabytes(report['full_bytes'])}, "
+            f"{report['seconds']:.1f} s")
+    if report["full_download_seconds"] is not None:
+        line += f" (full download alone: ~{report['full_download_seconds']:.1f} s)"
+    return line
+
+
+def format_megabytes(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def command_verify(args):
+    from utils.integrity import BuildAuditor
+
+    reports = BuildAuditor().audit(args.directory)
+    if args.names:
+        reports = [report for report in reports if report["name"] in args.names]
+    lines = []
+    for report in reports:
+        if report["unverified"]:
+            lines.append(f"{report['name']}: no file hashes recorded")
+        elif report["modified"] or report["missing"]:
+            lines.append(f"{report['name']}: {len(report['modified'])} modified, {len(report['missing'])} missing")
+            lines.extend(f"    modified: {path}" for path in report["modified"])
+            lines.extend(f"    missing: {path}" for path in report["missing"])
+        else:
+            lines.append(f"{report['name']}: OK ({report['checked']} files)")
+    output(args, reports, lines)
+    return 1 if any(report["modified"] or report["missing"] for report in reports) else 0
+
+
+def command_serve(args):
+    from utils.mirror_server import MirrorServer
+
+    server = MirrorServer(args.host, args.port)
+    print(f"Serving releases and cached assets on http://{args.host}:{server.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="launcher", description="sm64coopdx Launcher (command line)")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    parser.add_argument("--directory", default="builds", help="Builds directory (default: builds).")
+    parser.add_argument("--mirror", action="append", metavar="URL",
+                        help="LAN mirror to try before GitHub (repeatable; default: MIRRORS in config.py).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List installed builds.")
+    list_parser.add_argument("--remote", action="store_true", help="List the GitHub releases and their assets instead.")
+    list_parser.set_defaults(handler=command_list)
+
+    install_parser = commands.add_parser("install", help="Install one or more release assets.")
+    install_parser.add_argument("assets", nargs="+", help="Asset file names (as shown by 'list --remote') or URLs.")
+    install_parser.add_argument("--release", help="Only look for the assets in this release.")
+    install_parser.add_argument("--name", help="Build name (single asset only; defaults to the asset name).")
+    install_parser.add_argument("--from", dest="base", metavar="BUILD",
+                                help="Installed build to update from: only the files that changed are downloaded.")
+    install_parser.add_argument("--migrate-from", metavar="BUILD",
+                                help="Bring the configuration, saves and mods of this build over once installed.")
+    install_parser.add_argument("--jobs", type=int, default=MAX_CONCURRENT_INSTALLS,
+                                help=f"Concurrent installs (default: {MAX_CONCURRENT_INSTALLS}).")
+    install_parser.set_defaults(handler=command_install)
+
+    remove_parser = commands.add_parser("remove", help="Delete installed builds.")
+    remove_parser.add_argument("names", nargs="+")
+    remove_parser.set_defaults(handler=command_remove)
+
+    launch_parser = commands.add_parser("launch", help="Start an installed build; arguments after \"--\" go to the game.")
+    launch_parser.add_argument("name")
+    launch_parser.add_argument("--instances", type=int, default=1, help="Number of instances to start (default: 1).")
+    launch_parser.add_argument("--stagger", type=float, default=LAUNCH_STAGGER,
+                               help=f"Seconds between two instances (default: {LAUNCH_STAGGER:g}).")
+    launch_parser.add_argument("--monitor", action="store_true",
+                               help="Stay attached, then report startup time, CPU and memory of every instance.")
+    launch_parser.add_argument("--ready-port", type=int,
+                               help="With --monitor, an instance is ready once it binds this port (+1 per instance).")
+    launch_parser.set_defaults(handler=command_launch, game_args=[])
+
+    verify_parser = commands.add_parser("verify", help="Check installed builds against their recorded file hashes.")
+    verify_parser.add_argument("names", nargs="*", help="Builds to check (default: all).")
+    verify_parser.set_defaults(handler=command_verify)
+
+    migrate_parser = commands.add_parser("migrate", help="Bring the user data (config, saves, mods) of a build over to another.")
+    migrate_parser.add_argument("source")
+    migrate_parser.add_argument("target")
+    migrate_parser.set_defaults(handler=command_migrate)
+
+    mods_parser = commands.add_parser("mods", help="List the mods of an installed build.")
+    mods_parser.add_argument("name")
+    mods_parser.set_defaults(handler=command_mods)
+
+    archive_parser = commands.add_parser("archive", help="Pack installed builds into compressed cold storage.")
+    archive_parser.add_argument("names", nargs="+")
+    archive_parser.set_defaults(handler=command_archive)
+
+    restore_parser = commands.add_parser("restore", help="Unpack archived builds.")
+    restore_parser.add_argument("names", nargs="+")
+    restore_parser.set_defaults(handler=command_restore)
+
+    serve_parser = commands.add_parser("serve", help="Serve the release catalog and cached assets to other launchers.")
+    serve_parser.add_argument("--host", default=MIRROR_SERVER_HOST, help=f"Address to listen on (default: {MIRROR_SERVER_HOST}).")
+    serve_parser.add_argument("--port", type=int, default=MIRROR_SERVER_PORT,
+                              help=f"Port to listen on (default: {MIRROR_SERVER_PORT}).")
+    serve_parser.set_defaults(handler=command_serve)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Tout ce qui suit "--" est transmis tel quel au jeu, options de launch comprises
+    game_args = []
+    if "--" in argv:
+        separator = argv.index("--")
+        argv, game_args = argv[:separator], argv[separator + 1:]
+    args = build_parser().parse_args(argv)
+    if game_args and args.command != "launch":
+        build_parser().error("arguments after \"--\" are only accepted by launch")
+    args.game_args = game_args
+    if args.mirror:
+        from utils.mirrors import set_mirrors
+        set_mirrors(args.mirror)
+    args.stdout = sys.stdout
+    if not args.json:
+        return args.handler(args)
+    # Les messages d'information des modules partagés vont sur stderr pour garder un JSON valide
+    with contextlib.redirect_stdout(sys.stderr):
+        return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import contextlib
 import os
-import subprocess
-import zipfile
-import requests
-from utils.github_manager import GitHubManager
-from config import LAUNCHER_VERSION
-from PIL import Image, ImageTk
+import time
+from utils.file_manager import FileManager
+from utils.build_index import BuildIndex
+from utils.build_store import BuildStore
+from utils.builds_watcher import BuildsWatcher
+from utils.build_search import BuildSearchIndex
+from utils.build_trash import BuildTrash
+from utils.build_archive import BuildArchive
+from utils.mod_index import ModIndex
+from utils.mod_store import ModStore
+from utils.task_runner import TaskRunner
+from utils.progress import format_progress
+from utils.install_queue import InstallQueue
+from utils.tracing import tracer, traced
+from config import LAUNCHER_VERSION, PREFETCH_NEW_RELEASES, TRASH_GRACE_PERIOD, LAUNCH_STAGGER, MIRROR_SERVER_ENABLED
 import sys
-import markdown
-from tkhtmlview import HTMLLabel
+
+# requests, markdown, tkhtmlview et zipfile ne sont importés qu'au moment où un onglet ou une
+# fenêtre en a besoin (souvent depuis un thread de fond) pour garder un démarrage rapide.
 
 def get_resource_path(relative_path):
     """Retourne le chemin absolu d'une ressource, que l'application soit exécutée depuis un exécutable ou le code source."""
@@ -19,15 +30,69 @@ def get_resource_path(relative_path):
     return os.path.join(relative_path)
 
 class AppWindow:
-    def __init__(self):
-        self.root = tk.Tk()
+    # Délai après la dernière frappe avant de filtrer le tableau des builds
+    FILTER_DELAY_MS = 150
+
+    # Intervalle de rafraîchissement des barres de progression (20 images par seconde)
+    PROGRESS_REFRESH_MS = 50
+
+    # Intervalle de rafraîchissement de la fenêtre de la file d'installation
+    QUEUE_REFRESH_MS = 250
+
+    # Intervalle de rafraîchissement de la fenêtre des instances du jeu
+    INSTANCES_REFRESH_MS = 1000
+
+    # Intervalle de rafraîchissement de la fenêtre "Diagnostics"
+    DIAGNOSTICS_REFRESH_MS = 1000
+
+    # Délai (secondes) après l'ouverture avant la première vérification du pré-téléchargement
+    PREFETCH_START_DELAY = 60
+    # Choix "aucune build" des listes "Migrate Data From"
+    NO_DATA_SOURCE = "(none)"
+
+    def __init__(self, profiler=None):
+        # Instant de démarrage, pour mesurer le délai avant le premier affichage
+        self._startup_time = time.perf_counter()
+        self.profiler = profiler
+
+        with self._phase("Tk root"):
+            self.root = tk.Tk()
         self.root.title("sm64coopdx Launcher")
         self.root.geometry("800x600")
         self.root.resizable(False, False)  # Empêche le redimensionnement
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Exécute les opérations réseau et disque hors du thread Tk
+        self.tasks = TaskRunner(self.root)
+
+        # File d'installation (reprend les installations restées en attente à la dernière fermeture)
+        self.install_queue = InstallQueue(on_change=lambda job: self.tasks.post(self._on_install_job_changed, job))
+        self.queue_window = None
+
+        # Superviseur des instances du jeu, créé au premier lancement
+        self.supervisor = None
+        self.instances_window = None
+
+        # Builds installées (nom -> valeurs du tableau) et index de recherche pour le filtre
+        self.builds = {}
+        self.build_search = BuildSearchIndex()
+        self._filter_job = None
+
+        # Widgets de l'onglet "Manage Builds", créés à sa première ouverture
+        self.version_table = None
+        self.dedup_label = None
+        self.undo_frame = None
+        self._undo_job = None
+        self._archive_busy = False
+
+        # Widgets de l'onglet "Mods", créés à sa première ouverture
+        self.mods_table = None
+        self.shared_mods = []
 
         # Création du Notebook pour les onglets
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = notebook
 
         # Onglet "Launch Game"
         self.launch_tab = tk.Frame(notebook)
@@ -37,21 +102,70 @@ class AppWindow:
         self.manage_tab = tk.Frame(notebook)
         notebook.add(self.manage_tab, text="Manage Builds")
 
+        # Onglet "Mods"
+        self.mods_tab = tk.Frame(notebook)
+        notebook.add(self.mods_tab, text="Mods")
+
         # Onglet "About"
         self.about_tab = tk.Frame(notebook)
         notebook.add(self.about_tab, text="About")
 
         # Contenu de l'onglet "Launch Game"
-        self.setup_launch_tab()
-
-        # Contenu de l'onglet "Manage Builds"
-        self.setup_manage_tab()
+        with self._phase("Launch tab"):
+            self.setup_launch_tab()
 
-        # Contenu de l'onglet "Manage Builds"
-        self.setup_about_tab()
+        # Contenu des onglets "Manage Builds", "Mods" et "About" : construit à leur première ouverture
+        self._pending_tabs = {
+            str(self.manage_tab): self.setup_manage_tab,
+            str(self.mods_tab): self.setup_mods_tab,
+            str(self.about_tab): self.setup_about_tab
+        }
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Charger les builds installées au démarrage
-        self.refresh_versions()
+        with self._phase("Build list"):
+            self.refresh_versions()
+
+        # Suivre les changements du dossier "builds" pour mettre à jour le tableau ligne par ligne
+        with self._phase("Builds watcher"):
+            self.builds_watcher = BuildsWatcher("builds", lambda events: self.tasks.post(self._on_builds_changed, events))
+            self.builds_watcher.start()
+
+        # Les builds supprimées passent par builds/.trash et sont effacées du disque en arrière-plan
+        self.trash = BuildTrash("builds")
+        self.trash.start()
+
+        # Pré-télécharger la dernière release pendant les temps morts (désactivé par défaut, voir config.py)
+        self.prefetcher = None
+        if PREFETCH_NEW_RELEASES and profiler is None:
+            from utils.prefetcher import Prefetcher
+            self.prefetcher = Prefetcher(is_idle=self._is_idle)
+            self.prefetcher.start(delay=self.PREFETCH_START_DELAY)
+
+        # Mode serveur : partager le catalogue et les assets en cache avec les autres launchers du réseau
+        self.mirror_server = None
+        if MIRROR_SERVER_ENABLED and profiler is None:
+            from utils.mirror_server import MirrorServer
+            try:
+                self.mirror_server = MirrorServer().start()
+            except OSError as e:
+                print(f"Error starting the LAN mirror server: {e}")
+
+    def _phase(self, name):
+        """Mesure une étape de la construction de la fenêtre quand le démarrage est profilé."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(name)
+
+    def _is_idle(self):
+        """Vrai si aucune installation n'est en cours ou en attente (appelé depuis le thread du prefetcher)."""
+        return not any(job.state in ("queued", "running") for job in list(self.install_queue.jobs))
+
+    def _on_tab_changed(self, event):
+        """Construit le contenu d'un onglet la première fois qu'il est affiché."""
+        setup_tab = self._pending_tabs.pop(self.notebook.select(), None)
+        if setup_tab is not None:
+            setup_tab()
 
     def setup_launch_tab(self):
         """Configure l'onglet pour lancer le jeu avec une disposition en trois parties horizontales."""
@@ -99,10 +213,23 @@ class AppWindow:
             text="Launch",
             state=tk.DISABLED,
             font=("Arial", 12),
-            width=15
+            width=15,
+            command=self.launch_version
         )
         self.launch_button.pack(side=tk.LEFT)
 
+        # Nombre d'instances à lancer (tests de coop en local)
+        self.instance_count = tk.Spinbox(middle_frame, from_=1, to=8, width=3, font=("Arial", 12))
+        self.instance_count.pack(side=tk.LEFT, padx=(10, 0))
+
+        # Bouton pour afficher les instances en cours
+        running_button = tk.Button(middle_frame, text="Running", font=("Arial", 12), command=self.show_instances)
+        running_button.pack(side=tk.LEFT, padx=(10, 0))
+
+        # Message discret sous le sélecteur (restauration d'une build archivée)
+        self.launch_status_label = tk.Label(main_frame, text="", font=("Arial", 10), fg="grey", anchor="w")
+        self.launch_status_label.pack(fill=tk.X)
+
         # Lier la sélection dans la Combobox à l'activation du bouton "Launch"
         self.version_combobox.bind("<<ComboboxSelected>>", self.on_version_select)
 
@@ -122,16 +249,12 @@ class AppWindow:
         changelog_scrollbar = tk.Scrollbar(changelog_container, orient=tk.VERTICAL)
         changelog_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        # Zone de texte pour afficher le changelog
-        self.changelog_text = HTMLLabel(changelog_container, html="<p>Loading...</p>")
+        # Zone de texte provisoire : le widget HTML n'est créé qu'à l'arrivée du changelog
+        self.changelog_container = changelog_container
+        self.changelog_scrollbar = changelog_scrollbar
+        self.changelog_text = tk.Label(changelog_container, text="Loading...", anchor="nw", justify=tk.LEFT)
         self.changelog_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Configurer la scrollbar pour qu'elle défile avec le contenu
-        self.changelog_text.configure(yscrollcommand=changelog_scrollbar.set)
-        changelog_scrollbar.config(command=self.changelog_text.yview)
-
-        # Lier la molette de la souris au défilement
-        self.changelog_text.bind("<MouseWheel>", self._on_mousewheel)  # Windows
+        self._changelog_is_html = False
 
         # Charger le changelog depuis GitHub
         self.load_changelog()
@@ -148,6 +271,7 @@ class AppWindow:
 
         # Zone de filtre avec un hint
         filter_entry = tk.Entry(top_frame, width=30, fg="grey")
+        self.filter_entry = filter_entry
         filter_entry.pack(side=tk.LEFT, padx=5)
         filter_entry.insert(0, "Filter by name...")
 
@@ -167,6 +291,9 @@ class AppWindow:
         filter_entry.bind("<FocusIn>", on_focus_in)
         filter_entry.bind("<FocusOut>", on_focus_out)
 
+        # Filtrer le tableau au fil de la frappe, une fois la saisie posée
+        filter_entry.bind("<KeyRelease>", lambda e: self._schedule_filter())
+
         # Boutons
         rename_button = tk.Button(top_frame, text="Rename", state=tk.DISABLED, command=self.rename_version)
         rename_button.pack(side=tk.LEFT, padx=5)
@@ -174,27 +301,41 @@ class AppWindow:
         delete_button = tk.Button(top_frame, text="Delete", state=tk.DISABLED, command=self.delete_version)
         delete_button.pack(side=tk.LEFT, padx=5)
 
+        # Archive une build inutilisée dans un pack compressé, ou restaure une build archivée
+        self.archive_button = tk.Button(top_frame, text="Archive", state=tk.DISABLED, command=self.toggle_archive)
+        self.archive_button.pack(side=tk.LEFT, padx=5)
+
+        # Mise à jour différentielle de la build sélectionnée vers une autre release
+        self.update_button = tk.Button(top_frame, text="Update", state=tk.DISABLED, command=self.update_version)
+        self.update_button.pack(side=tk.LEFT, padx=5)
+
         # Bouton Refresh
         refresh_button = tk.Button(top_frame, text="Refresh", command=self.refresh_versions)
         refresh_button.pack(side=tk.LEFT, padx=5)
 
         # Bouton Install New (collé à droite)
-        install_button = tk.Button(top_frame, text="Install New", command=self.download_version)
-        install_button.pack(side=tk.RIGHT, padx=(5,20))
+        self.install_button = tk.Button(top_frame, text="Install New", command=self.download_version)
+        self.install_button.pack(side=tk.RIGHT, padx=(5,20))
+
+        # Bouton pour afficher la file d'installation
+        queue_button = tk.Button(top_frame, text="Install Queue", command=self.show_install_queue)
+        queue_button.pack(side=tk.RIGHT, padx=5)
 
         # Conteneur pour le tableau avec padding
         table_frame = tk.Frame(self.manage_tab)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=5)  # Ajout de padding (20px)
 
         # Tableau pour afficher les builds
-        columns = ("folder_name", "game_version", "renderer")
+        columns = ("folder_name", "game_version", "renderer", "status")
         self.version_table = ttk.Treeview(table_frame, columns=columns, show="headings", height=15)
         self.version_table.heading("folder_name", text="Build Name")
         self.version_table.heading("game_version", text="Game Version")
         self.version_table.heading("renderer", text="Renderer")
-        self.version_table.column("folder_name", width=500)
+        self.version_table.heading("status", text="Status")
+        self.version_table.column("folder_name", width=430)
         self.version_table.column("game_version", width=50)
         self.version_table.column("renderer", width=50)
+        self.version_table.column("status", width=70)
         self.version_table.pack(fill=tk.BOTH, expand=True)
 
         # Lier la sélection dans le tableau à l'activation des boutons
@@ -208,9 +349,244 @@ class AppWindow:
         open_folder_button = tk.Button(bottom_frame, text="Open Build Folder", state=tk.DISABLED, command=self.open_version_folder)
         open_folder_button.pack(side=tk.LEFT, padx=20)
 
+        # Bouton "Audit Builds" : vérifie les fichiers de toutes les builds contre leurs hashes
+        self.audit_button = tk.Button(bottom_frame, text="Audit Builds", command=self.audit_builds)
+        self.audit_button.pack(side=tk.LEFT)
+
+        # Bouton "Migrate Data" : reprend la configuration, les sauvegardes et les mods d'une autre build
+        self.migrate_button = tk.Button(bottom_frame, text="Migrate Data...", state=tk.DISABLED,
+                                        command=self.migrate_version_data)
+        self.migrate_button.pack(side=tk.LEFT, padx=(5, 0))
+
+        # Bandeau "Undo" affiché après une suppression, le temps du délai de grâce
+        self.undo_frame = tk.Frame(bottom_frame)
+        self.undo_label = tk.Label(self.undo_frame, text="", font=("Arial", 10))
+        self.undo_label.pack(side=tk.LEFT, padx=(20, 5))
+        self.undo_button = tk.Button(self.undo_frame, text="Undo")
+        self.undo_button.pack(side=tk.LEFT)
+
+        # Espace disque économisé grâce au partage des fichiers identiques entre builds
+        self.dedup_label = tk.Label(bottom_frame, text="", font=("Arial", 10), fg="grey")
+        self.dedup_label.pack(side=tk.RIGHT, padx=20)
+
+        # Afficher les builds déjà connues puis l'espace économisé par la déduplication
+        for values in self.builds.values():
+            self.version_table.insert("", "end", iid=values[0], values=values)
+        self._apply_filter()
+        self.tasks.submit(BuildStore(os.path.join("builds", ".store")).stats, on_success=self._show_dedup_stats)
+
         # Activer le bouton "Open Build Folder" lorsqu'une version est sélectionnée
         self.version_table.bind("<<TreeviewSelect>>", lambda e: self.on_version_table_select(rename_button, delete_button, open_folder_button))
 
+    def setup_mods_tab(self):
+        """Configure l'onglet pour gérer les mods des builds et le store de mods partagés."""
+        top_frame = tk.Frame(self.mods_tab)
+        top_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(top_frame, text="Mods of:", font=("Arial", 14)).pack(side=tk.LEFT, padx=(20, 5))
+
+        # Liste des builds installées, relue à chaque ouverture de la liste
+        self.mods_build_combobox = ttk.Combobox(top_frame, state="readonly", width=40, postcommand=self._update_mods_builds)
+        self.mods_build_combobox.pack(side=tk.LEFT, padx=5)
+        self.mods_build_combobox.bind("<<ComboboxSelected>>", lambda e: self.refresh_mods())
+
+        refresh_button = tk.Button(top_frame, text="Refresh", command=self.refresh_mods)
+        refresh_button.pack(side=tk.LEFT, padx=5)
+
+        # Nombre de mods et durée du dernier scan
+        self.mods_scan_label = tk.Label(top_frame, text="", font=("Arial", 10), fg="grey")
+        self.mods_scan_label.pack(side=tk.RIGHT, padx=20)
+
+        table_frame = tk.Frame(self.mods_tab)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=5)
+
+        # Tableau des mods de la build (identifiant de ligne : nom du dossier ou du fichier du mod)
+        columns = ("name", "description", "size", "files", "shared")
+        self.mods_table = ttk.Treeview(table_frame, columns=columns, show="headings", height=13)
+        self.mods_table.heading("name", text="Mod")
+        self.mods_table.heading("description", text="Description")
+        self.mods_table.heading("size", text="Size")
+        self.mods_table.heading("files", text="Files")
+        self.mods_table.heading("shared", text="Shared")
+        self.mods_table.column("name", width=170)
+        self.mods_table.column("description", width=340)
+        self.mods_table.column("size", width=70, anchor=tk.E)
+        self.mods_table.column("files", width=50, anchor=tk.E)
+        self.mods_table.column("shared", width=60, anchor=tk.CENTER)
+        self.mods_table.pack(fill=tk.BOTH, expand=True)
+
+        # Boutons agissant sur les mods sélectionnés
+        build_mods_frame = tk.Frame(self.mods_tab)
+        build_mods_frame.pack(fill=tk.X, pady=(0, 5))
+
+        share_button = tk.Button(build_mods_frame, text="Share", state=tk.DISABLED, command=self.share_mods)
+        share_button.pack(side=tk.LEFT, padx=(20, 5))
+
+        disable_button = tk.Button(build_mods_frame, text="Remove from Build", state=tk.DISABLED, command=self.disable_mods)
+        disable_button.pack(side=tk.LEFT, padx=5)
+
+        def on_mods_select(event):
+            state = tk.NORMAL if self.mods_table.selection() else tk.DISABLED
+            share_button.config(state=state)
+            disable_button.config(state=state)
+
+        self.mods_table.bind("<<TreeviewSelect>>", on_mods_select)
+
+        # Store de mods partagés : un mod partagé peut être activé dans n'importe quelle build sans copie
+        store_frame = tk.Frame(self.mods_tab)
+        store_frame.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(store_frame, text="Shared Mods:").pack(side=tk.LEFT, padx=(20, 5))
+        self.shared_mods_combobox = ttk.Combobox(store_frame, state="readonly", width=45)
+        self.shared_mods_combobox.pack(side=tk.LEFT, padx=5)
+
+        enable_button = tk.Button(store_frame, text="Enable in Build", command=self.enable_shared_mod)
+        enable_button.pack(side=tk.LEFT, padx=5)
+
+        remove_button = tk.Button(store_frame, text="Remove from Store", command=self.remove_shared_mod)
+        remove_button.pack(side=tk.LEFT, padx=5)
+
+        # Sélectionner la build choisie dans l'onglet "Launch Game", sinon la première
+        builds = self._update_mods_builds()
+        if builds:
+            selected_version = self.version_combobox.get()
+            self.mods_build_combobox.set(selected_version if selected_version in builds else builds[0])
+        self.refresh_mods()
+
+    def _update_mods_builds(self):
+        """Met à jour la liste des builds de l'onglet "Mods" (les builds archivées n'ont pas de dossier)."""
+        builds = sorted(name for name in self.builds if not self._is_archived(name))
+        self.mods_build_combobox.config(values=builds)
+        return builds
+
+    def refresh_mods(self):
+        """Relit en arrière-plan les mods de la build sélectionnée et le store de mods partagés."""
+        build_name = self.mods_build_combobox.get()
+        self.mods_scan_label.config(text="Scanning mods..." if build_name else "")
+        self.tasks.submit(
+            self._scan_mods, build_name,
+            on_success=lambda result: self._show_mods(build_name, *result),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to read the mods of '{build_name}'.\n{e}")
+        )
+
+    @staticmethod
+    def _scan_mods(build_name):
+        """Retourne (mods de la build, mods partagés, durée du scan) ; appelé depuis un thread de fond."""
+        start = time.perf_counter()
+        mods = ModIndex("builds").scan(build_name) if build_name else []
+        return mods, ModStore("builds").list(), time.perf_counter() - start
+
+    def _show_mods(self, build_name, mods, shared_mods, seconds):
+        """Remplit le tableau des mods et la liste des mods partagés."""
+        # Résultat d'un scan devenu obsolète : une autre build a été choisie entre-temps
+        if build_name != self.mods_build_combobox.get():
+            return
+        shared_digests = set(record["sha256"] for record in shared_mods)
+        self.mods_table.delete(*self.mods_table.get_children())
+        for mod in mods:
+            self.mods_table.insert("", "end", iid=mod["id"], values=(
+                mod["name"], mod["description"], self._format_size(mod["size"]), mod["files"],
+                "Yes" if mod["sha256"] in shared_digests else ""
+            ))
+        self.mods_table.event_generate("<<TreeviewSelect>>")
+
+        self.shared_mods = shared_mods
+        self.shared_mods_combobox.config(values=[f"{record['name']} ({record['id']})" for record in shared_mods])
+        if not shared_mods:
+            self.shared_mods_combobox.set("")
+        elif self.shared_mods_combobox.current() < 0:
+            self.shared_mods_combobox.current(0)
+
+        if build_name:
+            self.mods_scan_label.config(text=f"{len(mods)} mods, scanned in {seconds * 1000:.0f} ms")
+
+    @staticmethod
+    def _format_size(size):
+        if size < 1024 * 1024:
+            return f"{size / 1024:.0f} KB"
+        return f"{size / (1024 * 1024):.1f} MB"
+
+    def share_mods(self):
+        """Ajoute les mods sélectionnés au store de mods partagés."""
+        build_name = self.mods_build_combobox.get()
+        mod_ids = self.mods_table.selection()
+        if not build_name or not mod_ids:
+            return
+
+        def share():
+            store = ModStore("builds")
+            return [store.share(build_name, mod_id) for mod_id in mod_ids]
+
+        self.tasks.submit(
+            share,
+            on_success=lambda records: self.refresh_mods(),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to share the selected mods.\n{e}")
+        )
+
+    def disable_mods(self):
+        """Retire les mods sélectionnés de la build (les mods partagés restent dans le store)."""
+        build_name = self.mods_build_combobox.get()
+        mod_ids = self.mods_table.selection()
+        if not build_name or not mod_ids:
+            return
+        names = ", ".join(self.mods_table.set(mod_id, "name") for mod_id in mod_ids)
+        if not messagebox.askyesno("Confirm Removal", f"Remove {names} from '{build_name}'?\n"
+                                   "Shared mods stay in the store and can be enabled again."):
+            return
+
+        def disable():
+            store = ModStore("builds")
+            for mod_id in mod_ids:
+                store.disable(build_name, mod_id)
+
+        self.tasks.submit(
+            disable,
+            on_success=lambda result: self.refresh_mods(),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to remove the selected mods.\n{e}")
+        )
+
+    def _selected_shared_mod(self):
+        index = self.shared_mods_combobox.current()
+        if index < 0 or index >= len(self.shared_mods):
+            messagebox.showerror("Error", "Please select a shared mod.")
+            return None
+        return self.shared_mods[index]
+
+    def enable_shared_mod(self):
+        """Active le mod partagé choisi dans la build sélectionnée, par liens vers le store."""
+        build_name = self.mods_build_combobox.get()
+        if not build_name:
+            messagebox.showerror("Error", "Please select a build.")
+            return
+        record = self._selected_shared_mod()
+        if record is None:
+            return
+        self.tasks.submit(
+            ModStore("builds").enable, record["sha256"], build_name,
+            on_success=lambda mod_id: self.refresh_mods(),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to enable '{record['name']}'.\n{e}")
+        )
+
+    def remove_shared_mod(self):
+        """Retire le mod partagé choisi du store ; les builds où il est activé gardent leur copie."""
+        record = self._selected_shared_mod()
+        if record is None:
+            return
+        if not messagebox.askyesno("Confirm Removal", f"Remove '{record['name']}' from the shared mods?\n"
+                                   "Builds where it is enabled keep it."):
+            return
+
+        def on_success(freed):
+            self.shared_mods_combobox.set("")
+            self.refresh_mods()
+            messagebox.showinfo("Shared Mods", f"'{record['name']}' removed from the store, {freed / (1024 * 1024):.1f} MB freed.")
+
+        self.tasks.submit(
+            ModStore("builds").remove, record["sha256"],
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to remove '{record['name']}'.\n{e}")
+        )
+
     def setup_about_tab(self):
         """Configure l'onglet 'About'."""
         about_label = tk.Label(self.about_tab, text="About sm64coopdx Launcher", font=("Arial", 16))
@@ -269,47 +645,237 @@ class AppWindow:
         version_label = tk.Label(self.about_tab, text=f"Launcher Version: {LAUNCHER_VERSION}", font=("Arial", 12))
         version_label.pack(pady=0)
 
+        # Bouton pour afficher les temps des opérations du launcher
+        diagnostics_button = tk.Button(self.about_tab, text="Diagnostics", command=self.show_diagnostics)
+        diagnostics_button.pack(pady=20)
+
+    def show_diagnostics(self):
+        """Ouvre la fenêtre "Diagnostics" : durées p50/p95 des opérations récentes et statistiques HTTP."""
+        diagnostics_window = tk.Toplevel(self.root)
+        diagnostics_window.title("Diagnostics")
+        diagnostics_window.geometry("700x400")
+
+        columns = ("operation", "count", "p50", "p95", "errors", "bytes")
+        operations_table = ttk.Treeview(diagnostics_window, columns=columns, show="headings", height=12)
+        for column, heading, width in (
+            ("operation", "Operation", 220), ("count", "Count", 60), ("p50", "p50 (ms)", 80),
+            ("p95", "p95 (ms)", 80), ("errors", "Errors", 60), ("bytes", "MB", 80)
+        ):
+            operations_table.heading(column, text=heading)
+            operations_table.column(column, width=width)
+        operations_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        http_label = tk.Label(diagnostics_window, text="", font=("Arial", 10), fg="grey", anchor="w")
+        http_label.pack(fill=tk.X, padx=10)
+
+        def export_trace():
+            from tkinter import filedialog
+            path = filedialog.asksaveasfilename(
+                parent=diagnostics_window, defaultextension=".json", initialfile="launcher_trace.json",
+                filetypes=[("Chrome trace", "*.json")]
+            )
+            if path:
+                count = tracer.export_chrome_trace(path)
+                messagebox.showinfo("Diagnostics", f"Exported {count} spans to {path}.\nOpen it in chrome://tracing or Perfetto.",
+                                    parent=diagnostics_window)
+
+        tk.Button(diagnostics_window, text="Export Chrome Trace", command=export_trace).pack(pady=10)
+
+        def refresh():
+            if not diagnostics_window.winfo_exists():
+                return
+            for name, stats in sorted(tracer.stats().items()):
+                values = (name, stats["count"], f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}",
+                          stats["errors"], f"{stats['bytes'] / (1024 * 1024):.1f}")
+                if operations_table.exists(name):
+                    operations_table.item(name, values=values)
+                else:
+                    operations_table.insert("", "end", iid=name, values=values)
+
+            # Statistiques HTTP seulement si le module réseau est déjà chargé (ne pas importer requests ici)
+            http_client = sys.modules.get("utils.http_client")
+            if http_client is not None:
+                http_label.config(text=http_client.get_session().metrics.summary().splitlines()[0])
+            diagnostics_window.after(self.DIAGNOSTICS_REFRESH_MS, refresh)
+
+        refresh()
+
     def refresh_versions(self):
-        """Met à jour la liste des builds installées."""
-        versions_directory = "builds"
-
-        if not os.path.exists(versions_directory):
-            os.makedirs(versions_directory)
-
-        # Effacer le tableau actuel
-        for row in self.version_table.get_children():
-            self.version_table.delete(row)
-
-        # Effacer les éléments de la combobox
-        self.version_combobox["values"] = []
-
-        # Parcourir les sous-dossiers dans "builds"
-        builds = []
-        for version in os.listdir(versions_directory):
-            version_path = os.path.join(versions_directory, version)
-            if os.path.isdir(version_path):
-                # Lire les variables depuis "variables.txt"
-                variables_file_path = os.path.join(version_path, "launcher_variables")
-                game_version = "Unknown"
-                renderer = "Unknown"
-                if os.path.exists(variables_file_path):
-                    with open(variables_file_path, "r") as variables_file:
-                        for line in variables_file:
-                            key, value = line.strip().split("=", 1)
-                            if key == "game_version":
-                                game_version = value
-                            elif key == "renderer":
-                                renderer = value
-
-                # Ajouter la version au tableau
-                self.version_table.insert("", "end", values=(version, game_version, renderer))
-
-                # Ajouter la version à la liste des builds
-                builds.append(version)
+        """Met à jour la liste des builds installées (le parcours du disque se fait en arrière-plan)."""
+        self.tasks.submit(
+            self._scan_all_builds, "builds",
+            on_success=lambda scanned: self._show_versions(*scanned),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to read installed builds.\n{e}")
+        )
+        if self.dedup_label is not None:
+            self.tasks.submit(BuildStore(os.path.join("builds", ".store")).stats, on_success=self._show_dedup_stats)
+
+    @staticmethod
+    def _scan_all_builds(directory):
+        """Lit les builds installées et les builds archivées (exécuté en arrière-plan)."""
+        return FileManager.scan_builds(directory), FileManager.scan_archived(directory)
+
+    def audit_builds(self):
+        """Vérifie en arrière-plan l'intégrité de toutes les builds installées."""
+        # Import local : l'audit n'est utile qu'à la demande
+        from utils.integrity import BuildAuditor
+
+        self.audit_button.config(state=tk.DISABLED, text="Auditing...")
+
+        def finished():
+            self.audit_button.config(state=tk.NORMAL, text="Audit Builds")
+
+        def on_error(e):
+            finished()
+            messagebox.showerror("Error", f"Failed to audit builds.\n{e}")
+
+        def on_success(reports):
+            finished()
+            self._show_audit_report(reports)
+
+        self.tasks.submit(BuildAuditor().audit, "builds", on_success=on_success, on_error=on_error)
+
+    def _show_audit_report(self, reports):
+        """Affiche le résultat de l'audit des builds."""
+        lines = []
+        for report in reports:
+            if report["unverified"]:
+                lines.append(f"{report['name']}: no file hashes recorded (installed by an older launcher)")
+            elif report["modified"] or report["missing"]:
+                lines.append(f"{report['name']}: {len(report['modified'])} modified, {len(report['missing'])} missing")
+                lines.extend(f"    modified: {path}" for path in report["modified"])
+                lines.extend(f"    missing: {path}" for path in report["missing"])
+            else:
+                lines.append(f"{report['name']}: OK ({report['checked']} files)")
+        if not lines:
+            lines.append("No builds installed.")
+
+        report_window = tk.Toplevel(self.root)
+        report_window.title("Build Audit")
+        report_window.geometry("600x400")
+        report_text = tk.Text(report_window, wrap=tk.NONE, font=("Courier", 10))
+        report_text.insert("1.0", "\n".join(lines))
+        report_text.config(state=tk.DISABLED)
+        report_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def _show_dedup_stats(self, stats):
+        """Affiche l'espace disque économisé par la déduplication des builds."""
+        saved_mb = stats["saved_bytes"] / (1024 * 1024)
+        self.dedup_label.config(text=f"Deduplication saves {saved_mb:.1f} MB ({stats['blobs']} shared files)")
+
+    def _show_versions(self, scanned_builds, archived_builds=()):
+        """Applique au tableau les builds lues par refresh_versions, ligne par ligne.
+
+        Chaque ligne a pour identifiant le nom du dossier : seules les lignes ajoutées,
+        supprimées ou modifiées sont touchées, ce qui conserve la sélection et le défilement.
+        Les builds archivées sont affichées avec le statut "Archived".
+        """
+        wanted = set(version for version, _, _ in scanned_builds) | set(version for version, _, _ in archived_builds)
+        # Les lignes masquées par le filtre sont détachées, pas supprimées : self.builds les connaît toutes
+        for row in set(self.builds) - wanted:
+            self._remove_version_row(row)
+
+        for version, game_version, renderer in archived_builds:
+            self._upsert_version_row(version, game_version, renderer, "Archived")
+        for version, game_version, renderer in scanned_builds:
+            self._upsert_version_row(version, game_version, renderer)
+
+        self._apply_filter()
+        self._update_combobox()
+
+    def _upsert_version_row(self, version, game_version, renderer, status=""):
+        """Ajoute ou met à jour la ligne d'une build ; _apply_filter la place ensuite dans l'ordre."""
+        values = (version, game_version, renderer, status)
+        self.builds[version] = values
+        self.build_search.add(version, values)
+
+        # Tableau pas encore construit (onglet "Manage Builds" jamais ouvert)
+        if self.version_table is None:
+            return
+        if self.version_table.exists(version):
+            current = tuple(str(value) for value in self.version_table.item(version, "values"))
+            if current != values:
+                self.version_table.item(version, values=values)
+        else:
+            self.version_table.insert("", "end", iid=version, values=values)
+
+    def _remove_version_row(self, version):
+        """Supprime la ligne d'une build, qu'elle soit affichée ou masquée par le filtre."""
+        self.builds.pop(version, None)
+        self.build_search.remove(version)
+        if self.version_table is not None and self.version_table.exists(version):
+            self.version_table.delete(version)
+
+    def _schedule_filter(self):
+        """Relance le filtrage FILTER_DELAY_MS après la dernière frappe."""
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(self.FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """Affiche, dans l'ordre alphabétique, les builds correspondant au texte du filtre.
+
+        Les autres lignes sont détachées du tableau (set_children) et non recréées.
+        """
+        self._filter_job = None
+        if self.version_table is None:
+            return
+        query = self.filter_entry.get()
+        if query == "Filter by name...":
+            query = ""
+
+        visible = tuple(sorted(self.build_search.search(query)))
+        if self.version_table.get_children() != visible:
+            self.version_table.set_children("", *visible)
+
+    def _on_builds_changed(self, events):
+        """Répercute sur le tableau les changements signalés par le BuildsWatcher."""
+        selected_version = self.version_combobox.get()
+        for event in events:
+            kind, name = event[0], event[1]
+            if kind == "removed" and self._is_archived(name):
+                # Dossier effacé par l'archivage : la build reste listée, sous forme de pack
+                continue
+            if kind in ("removed", "renamed") and name in self.builds:
+                was_selected = self.version_table is not None and name in self.version_table.selection()
+                self._remove_version_row(name)
+                if kind == "renamed":
+                    new_name = event[2]
+                    if selected_version == name:
+                        selected_version = new_name
+                    self.tasks.submit(BuildIndex("builds").get, new_name,
+                                      on_success=lambda entry, reselect=was_selected: self._show_build_entry(entry, reselect))
+            elif kind == "renamed":
+                # L'ajout de l'ancien nom attend encore BuildIndex.get : le nouveau nom est une build ajoutée
+                self.tasks.submit(BuildIndex("builds").get, event[2], on_success=self._show_build_entry)
+            elif kind in ("added", "changed"):
+                self.tasks.submit(BuildIndex("builds").get, name, on_success=self._show_build_entry)
+        self._update_combobox(selected_version)
+
+    def _is_archived(self, version):
+        return version in self.builds and self.builds[version][3] == "Archived"
+
+    def _show_build_entry(self, entry, select=False):
+        """Affiche une entrée de BuildIndex renvoyée par un thread de fond."""
+        if entry is None:
+            return
+        self._upsert_version_row(entry["name"], entry["game_version"], entry["renderer"])
+        self._apply_filter()
+        if select and self.version_table is not None:
+            self.version_table.selection_add(entry["name"])
+        self._update_combobox()
+
+    def _update_combobox(self, selected_version=None):
+        """Synchronise la combobox avec toutes les builds (filtre ignoré) en conservant la build choisie."""
+        builds = sorted(self.builds)
+        if selected_version is None:
+            selected_version = self.version_combobox.get()
 
         # Mettre à jour la combobox avec les builds disponibles
-        if builds:
-            self.version_combobox["values"] = builds
+        self.version_combobox["values"] = builds
+        if selected_version in builds:
+            self.version_combobox.set(selected_version)
+        elif builds:
             self.version_combobox.set(builds[0])  # Sélectionner la première version par défaut
         else:
             self.version_combobox.set("No builds of sm64coopdx installed")
@@ -326,45 +892,264 @@ class AppWindow:
         """Active les boutons Rename, Delete et Open Folder lorsqu'une version est sélectionnée."""
         selected_items = self.version_table.selection()
         if selected_items:
+            archived = self._is_archived(selected_items[0])
             rename_button.config(state=tk.NORMAL)
             delete_button.config(state=tk.NORMAL)
-            open_folder_button.config(state=tk.NORMAL)
+            # Une build archivée n'a plus de dossier à ouvrir
+            open_folder_button.config(state=tk.DISABLED if archived else tk.NORMAL)
+            self.update_button.config(state=tk.DISABLED if archived else tk.NORMAL)
+            self.migrate_button.config(state=tk.DISABLED if archived else tk.NORMAL)
+            if self._archive_busy:
+                self.archive_button.config(state=tk.DISABLED)
+            else:
+                self.archive_button.config(state=tk.NORMAL, text="Restore" if archived else "Archive")
         else:
             rename_button.config(state=tk.DISABLED)
             delete_button.config(state=tk.DISABLED)
             open_folder_button.config(state=tk.DISABLED)
+            self.archive_button.config(state=tk.DISABLED)
+            self.update_button.config(state=tk.DISABLED)
+            self.migrate_button.config(state=tk.DISABLED)
 
     def launch_version(self):
-        """Lance la version sélectionnée en exécutant son fichier .exe."""
+        """Lance la version sélectionnée (une ou plusieurs instances) sous le suivi du superviseur."""
         selected_version = self.version_combobox.get()
         if not selected_version or selected_version == "No builds of sm64coopdx installed":
             messagebox.showerror("Error", "Please select a valid version to launch.")
             return
 
-        # Utiliser le nom fixe "sm64coopdx.exe"
-        exe_path = os.path.join("builds", selected_version, "sm64coopdx.exe")
+        try:
+            count = max(1, int(self.instance_count.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a number of instances.")
+            return
 
-        if os.path.exists(exe_path):
-            try:
-                subprocess.Popen([exe_path], shell=True)  # Lancer l'exécutable
-                messagebox.showinfo("Success", f"Launching '{selected_version}'...")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to launch '{selected_version}'.\n{e}")
-        else:
+        if self._is_archived(selected_version):
+            self._restore_and_launch(selected_version)
+            return
+
+        # Chemin de l'exécutable lu depuis l'index des builds (sm64coopdx.exe ou sm64coopdx)
+        entry = BuildIndex("builds").get(selected_version)
+        if entry is None or entry["exe_path"] is None:
             messagebox.showerror("Error", f"Executable not found for version '{selected_version}'.")
+            return
+
+        if self.supervisor is None:
+            # Import local : le superviseur et son thread de mesure ne servent qu'une fois le jeu lancé
+            from utils.process_supervisor import ProcessSupervisor
+            self.supervisor = ProcessSupervisor()
+
+        try:
+            if count == 1:
+                self.supervisor.launch(selected_version, entry["exe_path"], game_version=entry["game_version"],
+                                       renderer=entry["renderer"])
+            else:
+                # Instances espacées de LAUNCH_STAGGER secondes, lancées depuis un thread de fond
+                self.supervisor.launch_many(selected_version, entry["exe_path"], count, LAUNCH_STAGGER,
+                                            game_version=entry["game_version"], renderer=entry["renderer"])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to launch '{selected_version}'.\n{e}")
+            return
+        self.show_instances()
+
+    def _restore_and_launch(self, version):
+        """Restaure en arrière-plan une build archivée, puis la lance."""
+        self.launch_button.config(state=tk.DISABLED, text="Restoring...")
+        self.launch_status_label.config(text=f"Restoring '{version}' from the archive...")
+
+        def on_error(e):
+            self.launch_button.config(state=tk.NORMAL, text="Launch")
+            self.launch_status_label.config(text="")
+            messagebox.showerror("Error", f"Failed to restore '{version}'.\n{e}")
+
+        def on_success(stats):
+            self.launch_button.config(state=tk.NORMAL, text="Launch")
+            self.launch_status_label.config(text=f"Restored '{version}' in {stats['seconds']:.1f} s.")
+            row = self.builds[version]
+            self._upsert_version_row(version, row[1], row[2])
+            self._apply_filter()
+            self.launch_version()
+
+        self.tasks.submit(BuildArchive("builds").rehydrate, version, on_success=on_success, on_error=on_error)
+
+    def toggle_archive(self):
+        """Archive la build sélectionnée, ou la restaure si elle est déjà archivée."""
+        selected_items = self.version_table.selection()
+        if not selected_items:
+            return
+        selected_version = selected_items[0]
+        row = self.builds[selected_version]
+        archived = self._is_archived(selected_version)
+
+        self._archive_busy = True
+        self.archive_button.config(state=tk.DISABLED, text="Restoring..." if archived else "Archiving...")
+
+        def finished():
+            self._archive_busy = False
+            self.archive_button.config(state=tk.NORMAL, text="Archive" if archived else "Restore")
+
+        def on_error(e):
+            self._archive_busy = False
+            self.archive_button.config(state=tk.NORMAL, text="Restore" if archived else "Archive")
+            messagebox.showerror("Error", f"Failed to {'restore' if archived else 'archive'} '{selected_version}'.\n{e}")
+
+        def on_archived(stats):
+            finished()
+            self._upsert_version_row(selected_version, row[1], row[2], "Archived")
+            self._apply_filter()
+            self._update_combobox()
+            megabytes = lambda size: f"{size / (1024 * 1024):.1f} MB"
+            messagebox.showinfo(
+                "Build Archived",
+                f"'{selected_version}' has been archived in {stats['seconds']:.1f} s.\n\n"
+                f"Build size: {megabytes(stats['original_size'])}\n"
+                f"Pack size: {megabytes(stats['packed_size'])}\n"
+                f"Freed on disk: {megabytes(stats['freed_bytes'])}\n"
+                f"Saved: {megabytes(stats['saved_bytes'])}"
+            )
+
+        def on_restored(stats):
+            finished()
+            self._upsert_version_row(selected_version, row[1], row[2])
+            self._apply_filter()
 
-    def download_version(self):
-        """Ouvre une fenêtre pour télécharger une nouvelle version."""
-        # Récupérer les builds disponibles depuis GitHub
-        releases = GitHubManager.get_releases()
+        if archived:
+            self.tasks.submit(BuildArchive("builds").rehydrate, selected_version, on_success=on_restored, on_error=on_error)
+        else:
+            self.tasks.submit(BuildArchive("builds").archive, selected_version, on_success=on_archived, on_error=on_error)
+
+    def show_instances(self):
+        """Ouvre (ou ramène au premier plan) la fenêtre des instances du jeu en cours."""
+        if self.instances_window is not None and self.instances_window.winfo_exists():
+            self.instances_window.lift()
+            return
+
+        instances_window = tk.Toplevel(self.root)
+        instances_window.title("Running Instances")
+        instances_window.geometry("760x380")
+        self.instances_window = instances_window
+
+        # Tableau des instances
+        columns = ("pid", "build", "renderer", "state", "ready", "cpu", "rss", "peak")
+        instances_table = ttk.Treeview(instances_window, columns=columns, show="headings", height=10)
+        for column, heading, width in (
+            ("pid", "PID", 60), ("build", "Build Name", 200), ("renderer", "Renderer", 70), ("state", "State", 70),
+            ("ready", "Startup (ms)", 90), ("cpu", "CPU %", 60), ("rss", "RAM (MB)", 80), ("peak", "Peak (MB)", 80)
+        ):
+            instances_table.heading(column, text=heading)
+            instances_table.column(column, width=width)
+        instances_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        def selected_instances():
+            if self.supervisor is None:
+                return []
+            ids = set(int(iid) for iid in instances_table.selection())
+            return [instance for instance in list(self.supervisor.instances) if instance.id in ids]
+
+        def show_output():
+            for instance in selected_instances()[:1]:
+                output_window = tk.Toplevel(instances_window)
+                output_window.title(f"Output of {instance.build} (PID {instance.pid})")
+                output_window.geometry("700x400")
+                output_text = tk.Text(output_window, wrap=tk.NONE)
+                output_text.pack(fill=tk.BOTH, expand=True)
+                output_text.insert(tk.END, "\n".join(list(instance.stdout)))
+                if instance.stderr:
+                    output_text.insert(tk.END, "\n\n--- stderr ---\n" + "\n".join(list(instance.stderr)))
+                output_text.config(state=tk.DISABLED)
+
+        def compare():
+            """Compare le temps de démarrage et les ressources par build et moteur de rendu."""
+            if self.supervisor is None:
+                return
+            lines = []
+            for (build, renderer), figures in self.supervisor.compare().items():
+                ready = "n/a" if figures["ready_median_ms"] is None else f"{figures['ready_median_ms']:.0f} ms"
+                peak = "n/a" if figures["peak_rss"] is None else f"{figures['peak_rss'] / (1024 * 1024):.0f} MB"
+                cpu = "n/a" if figures["average_cpu"] is None else f"{figures['average_cpu']:.0f}%"
+                lines.append(f"{build} ({renderer}) x{figures['instances']}: startup {ready}, peak RAM {peak}, CPU {cpu}")
+            messagebox.showinfo("Compare Builds", "\n".join(lines) or "No instance has been launched yet.",
+                                parent=instances_window)
+
+        # Boutons d'action sur les instances sélectionnées
+        buttons_frame = tk.Frame(instances_window)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        for text, command in (
+            ("Stop", lambda: [self.supervisor.terminate(instance) for instance in selected_instances()]),
+            ("Show Output", show_output),
+            ("Compare Builds", compare),
+            ("Clear Exited", lambda: self.supervisor and self.supervisor.clear_exited())
+        ):
+            tk.Button(buttons_frame, text=text, command=command).pack(side=tk.LEFT, padx=(0, 5))
+
+        def megabytes(value):
+            return "" if not value else f"{value / (1024 * 1024):.0f}"
+
+        def refresh_instances():
+            """Met à jour les lignes du tableau à partir des mesures du superviseur."""
+            if not instances_window.winfo_exists():
+                return
+            instance_ids = set()
+            instances = list(self.supervisor.instances) if self.supervisor is not None else []
+            for instance in instances:
+                iid = str(instance.id)
+                instance_ids.add(iid)
+                figures = instance.to_dict()
+                values = (
+                    instance.pid or "", instance.build, instance.renderer, instance.error or instance.state,
+                    "" if figures["ready_ms"] is None else f"{figures['ready_ms']:.0f} ({instance.ready_via})",
+                    "" if figures["cpu_percent"] is None else f"{figures['cpu_percent']:.0f}",
+                    megabytes(figures["rss"]), megabytes(figures["peak_rss"])
+                )
+                if instances_table.exists(iid):
+                    instances_table.item(iid, values=values)
+                else:
+                    instances_table.insert("", "end", iid=iid, values=values)
+            for iid in instances_table.get_children():
+                if iid not in instance_ids:
+                    instances_table.delete(iid)
+            instances_window.after(self.INSTANCES_REFRESH_MS, refresh_instances)
+
+        refresh_instances()
+
+    def download_version(self, base_name=None):
+        """Récupère les releases en arrière-plan puis ouvre la fenêtre de téléchargement.
+
+        base_name présélectionne la build à partir de laquelle faire une mise à jour différentielle.
+        """
+        self.install_button.config(state=tk.DISABLED)
+        self.tasks.submit(
+            self._fetch_releases,
+            on_success=lambda releases: self._open_install_window(releases, base_name),
+            on_error=lambda e: self._open_install_window([])
+        )
+
+    def update_version(self):
+        """Ouvre la fenêtre d'installation pour mettre à jour la build sélectionnée."""
+        selected_items = self.version_table.selection()
+        if selected_items:
+            self.download_version(base_name=selected_items[0])
+
+    @staticmethod
+    def _fetch_releases():
+        """Récupère les releases depuis un thread de fond (requests n'est importé qu'ici)."""
+        from utils.github_manager import GitHubManager
+        return GitHubManager.get_releases()
+
+    def _open_install_window(self, releases, base_name=None):
+        """Ouvre une fenêtre pour télécharger une nouvelle version parmi les releases récupérées."""
+        self.install_button.config(state=tk.NORMAL)
         if not releases:
             messagebox.showerror("Error", "Failed to fetch releases from GitHub.")
             return
 
+        from utils.asset_cache import AssetCache
+        asset_cache = AssetCache()
+
         # Créer une nouvelle fenêtre pour afficher les releases et les fichiers ZIP
         selection_window = tk.Toplevel(self.root)
         selection_window.title("Install New Build")
-        selection_window.geometry("600x450")
+        selection_window.geometry("600x550")
         selection_window.minsize(450, 400)
         selection_window.resizable(False, False)  # Empêche le redimensionnement
 
@@ -400,6 +1185,19 @@ class AppWindow:
         version_name_entry = tk.Entry(progress_frame)
         version_name_entry.pack(fill=tk.X, expand=True, padx=5, pady=(0, 10))
 
+        # Build de base : seuls les fichiers modifiés depuis cette build sont téléchargés
+        full_download = "(full download)"
+        tk.Label(progress_frame, text="Update From:").pack(anchor="w", padx=5)
+        base_combobox = ttk.Combobox(progress_frame, state="readonly",
+                                     values=[full_download] + sorted(name for name in self.builds if not self._is_archived(name)))
+        base_combobox.set(base_name if base_name in self.builds else full_download)
+        base_combobox.pack(fill=tk.X, expand=True, padx=5, pady=(0, 10))
+
+        # Build dont les données utilisateur (configuration, sauvegardes, mods) sont reprises après l'installation
+        tk.Label(progress_frame, text="Migrate Data From:").pack(anchor="w", padx=5)
+        migrate_combobox = self._data_source_combobox(progress_frame, base_name)
+        migrate_combobox.pack(fill=tk.X, expand=True, padx=5, pady=(0, 10))
+
         # Barre de progression
         progress_label = tk.Label(progress_frame, text="Progress: 0%")
         progress_label.pack(anchor="w", padx=5)
@@ -407,7 +1205,7 @@ class AppWindow:
         progress_bar.pack(fill=tk.X, expand=True, padx=5)
 
         # Bouton pour télécharger le fichier sélectionné (désactivé par défaut)
-        download_button = tk.Button(selection_window, text="Download", state=tk.DISABLED)
+        download_button = tk.Button(selection_window, text="Add to Install Queue", state=tk.DISABLED)
         download_button.pack(pady=10)
 
         # Variable pour stocker la release sélectionnée
@@ -428,7 +1226,9 @@ class AppWindow:
             asset_listbox.delete(0, tk.END)
             filtered_assets = [asset for asset in assets if "windows" in asset["name"].lower()]
             for asset in filtered_assets:
-                asset_listbox.insert(tk.END, asset["name"])
+                # Les assets déjà pré-téléchargés s'installent sans téléchargement
+                ready = asset_cache.contains(asset["browser_download_url"])
+                asset_listbox.insert(tk.END, asset["name"] + ("  (downloaded)" if ready else ""))
 
             # Désactiver le bouton Download tant qu'aucun fichier ZIP n'est sélectionné
             download_button.config(state=tk.DISABLED)
@@ -453,75 +1253,210 @@ class AppWindow:
             download_url = selected_asset["browser_download_url"]
             file_name = selected_asset["name"]
 
-            # Extraire la version du jeu et le renderer à partir du nom de l'asset
-            game_version = "Unknown"
-            renderer = "Unknown"
-            if "_v" in file_name:
-                try:
-                    # Extraire la version
-                    version_part = file_name.split("_v")[1]
-                    game_version = version_part.split("_")[0]  # Prendre la partie avant le prochain "_"
-
-                    # Extraire le renderer (par exemple, "OpenGL" ou "DirectX")
-                    renderer = file_name.split("_")[-1].split(".")[0]  # Prendre la dernière partie avant l'extension
-                except IndexError:
-                    pass
-
             # Récupérer le nom personnalisé de la version
             custom_name = version_name_entry.get().strip()
             if not custom_name:
                 custom_name = os.path.splitext(file_name)[0]  # Utiliser le nom par défaut si aucun nom n'est fourni
 
-            # Assurez-vous que le dossier 'builds' existe
-            versions_directory = "builds"
-            if not os.path.exists(versions_directory):
-                os.makedirs(versions_directory)
-
-            # Chemin complet pour le fichier téléchargé
-            file_path = os.path.join(versions_directory, file_name)
-            extract_directory = os.path.join(versions_directory, custom_name)
-
+            # Ajouter l'installation à la file ; la barre de progression suit le dernier job ajouté
+            base = base_combobox.get()
             try:
-                # Télécharger le fichier avec une barre de progression
-                response = requests.get(download_url, stream=True)
-                response.raise_for_status()
-
-                total_size = int(response.headers.get("content-length", 0))
-                downloaded_size = 0
-
-                with open(file_path, "wb") as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-                        downloaded_size += len(chunk)
-                        progress = int((downloaded_size / total_size) * 100)
-                        progress_bar["value"] = progress
-                        progress_label.config(text=f"Progress: {progress}%")
-                        selection_window.update_idletasks()
-
-                # Décompresser le fichier ZIP
-                with zipfile.ZipFile(file_path, "r") as zip_ref:
-                    zip_ref.extractall(extract_directory)
-
-                # Écrire les variables dans un fichier texte
-                variables_file_path = os.path.join(extract_directory, "launcher_variables")
-                with open(variables_file_path, "w") as variables_file:
-                    variables_file.write(f"game_version={game_version}\n")
-                    variables_file.write(f"renderer={renderer}\n")
-
-                # Supprimer le fichier ZIP après extraction
-                os.remove(file_path)
-
-                messagebox.showinfo("Success", f"Build '{custom_name}' has been installed.")
-                self.refresh_versions()  # Rafraîchir la liste des builds
-                selection_window.destroy()  # Fermer la fenêtre de sélection
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to download or install the version.\n{e}")
+                job = self.install_queue.submit(download_url, file_name, custom_name, digest=selected_asset.get("digest"),
+                                                base_name=None if base == full_download else base,
+                                                migrate_from=self._data_source(migrate_combobox))
+            except FileExistsError as e:
+                messagebox.showerror("Error", str(e), parent=selection_window)
+                return
+            # Un second clic ajouterait le même job : le bouton se réactive au choix d'un autre fichier
+            download_button.config(state=tk.DISABLED)
+            self.show_install_queue()
+
+            def show_progress():
+                if not selection_window.winfo_exists():
+                    return
+                event = job.tracker.sample()
+                progress_bar["value"] = int((event.done / event.total) * 100) if event.total else 0
+                if job.state in ("queued", "paused"):
+                    progress_label.config(text=f"'{custom_name}' is {job.state}.")
+                elif job.state == "running":
+                    progress_label.config(text=format_progress(event))
+                else:
+                    progress_label.config(text=f"'{custom_name}': {job.state}.")
+                    return
+                selection_window.after(self.PROGRESS_REFRESH_MS, show_progress)
+
+            show_progress()
 
         # Lier les événements
         release_listbox.bind("<<ListboxSelect>>", update_assets)
         asset_listbox.bind("<<ListboxSelect>>", enable_download_button)
         download_button.config(command=download_selected_asset)
 
+    def _on_install_job_changed(self, job):
+        """Réagit à la fin d'une installation de la file."""
+        if job.state == "done":
+            self.refresh_versions()  # Rafraîchir la liste des builds
+            if job.report is not None and job.report["delta"]:
+                self._show_update_report(job)
+            elif job.migration is not None:
+                self._show_migration_report(job.migrate_from, job.custom_name, job.migration)
+        elif job.state == "failed":
+            messagebox.showerror("Error", f"Failed to download or install '{job.custom_name}'.\n{job.error}")
+
+    def _show_update_report(self, job):
+        """Compare une mise à jour différentielle terminée à une installation complète."""
+        report = job.report
+        megabytes = lambda size: f"{size / (1024 * 1024):.1f} MB"
+        message = (
+            f"'{job.custom_name}' was built from '{job.base_name}' in {report['seconds']:.1f} s.\n\n"
+            f"Files downloaded: {report['downloaded_files']} of {report['files']}\n"
+            f"Downloaded: {megabytes(report['bytes_downloaded'])} instead of {megabytes(report['full_bytes'])}"
+        )
+        if report["full_download_seconds"] is not None:
+            message += f"\nA full download would have taken about {report['full_download_seconds']:.1f} s."
+        if job.migration is not None:
+            message += "\n\n" + self._format_migration(job.migrate_from, job.migration)
+        messagebox.showinfo("Update Installed", message)
+
+    def _data_source_combobox(self, parent, selected=None, exclude=None):
+        """Liste déroulante des builds dont les données utilisateur peuvent être reprises."""
+        sources = sorted(name for name in self.builds if name != exclude and not self._is_archived(name))
+        combobox = ttk.Combobox(parent, state="readonly", values=[self.NO_DATA_SOURCE] + sources)
+        combobox.set(selected if selected in sources else self.NO_DATA_SOURCE)
+        return combobox
+
+    def _data_source(self, combobox):
+        source = combobox.get()
+        return None if source == self.NO_DATA_SOURCE else source
+
+    @staticmethod
+    def _format_migration(source_name, stats):
+        megabytes = lambda size: f"{size / (1024 * 1024):.1f} MB"
+        return (f"Data migrated from '{source_name}' in {stats['seconds']:.2f} s: {stats['files']} files, "
+                f"{megabytes(stats['bytes_copied'])} copied, {megabytes(stats['bytes_shared'])} shared without copying.")
+
+    def _show_migration_report(self, source_name, target_name, stats):
+        messagebox.showinfo("Data Migrated", f"'{target_name}' is up to date.\n\n" + self._format_migration(source_name, stats))
+
+    def _start_migration(self, source_name, target_name):
+        """Reprend en arrière-plan les données utilisateur de source_name dans target_name."""
+        self.tasks.submit(
+            FileManager.migrate_user_data, "builds", source_name, target_name,
+            on_success=lambda stats: self._show_migration_report(source_name, target_name, stats),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to migrate data from '{source_name}'.\n{e}")
+        )
+
+    def migrate_version_data(self):
+        """Ouvre une fenêtre pour reprendre dans la build sélectionnée les données d'une autre build."""
+        selected_items = self.version_table.selection()
+        if not selected_items:
+            return
+        target_name = selected_items[0]
+
+        migrate_window = tk.Toplevel(self.root)
+        migrate_window.title("Migrate Data")
+        migrate_window.geometry("500x150")
+        migrate_window.resizable(False, False)
+
+        tk.Label(migrate_window, text=f"Bring configuration, saves and mods into: {target_name}").pack(pady=10)
+        tk.Label(migrate_window, text="Migrate Data From:").pack(pady=5)
+        source_combobox = self._data_source_combobox(migrate_window, exclude=target_name)
+        source_combobox.pack(fill=tk.X, padx=10, pady=5)
+
+        def confirm_migration():
+            source_name = self._data_source(source_combobox)
+            if source_name is None:
+                messagebox.showerror("Error", "Please select a build to migrate data from.")
+                return
+            migrate_window.destroy()
+            self._start_migration(source_name, target_name)
+
+        tk.Button(migrate_window, text="Migrate", command=confirm_migration).pack(pady=10)
+
+    def show_install_queue(self):
+        """Ouvre (ou ramène au premier plan) la fenêtre de suivi de la file d'installation."""
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.queue_window.lift()
+            return
+
+        queue_window = tk.Toplevel(self.root)
+        queue_window.title("Install Queue")
+        queue_window.geometry("700x350")
+        self.queue_window = queue_window
+
+        # Tableau des installations
+        columns = ("build", "priority", "state", "progress")
+        jobs_table = ttk.Treeview(queue_window, columns=columns, show="headings", height=10)
+        jobs_table.heading("build", text="Build Name")
+        jobs_table.heading("priority", text="Priority")
+        jobs_table.heading("state", text="State")
+        jobs_table.heading("progress", text="Progress")
+        jobs_table.column("build", width=220)
+        jobs_table.column("priority", width=60)
+        jobs_table.column("state", width=80)
+        jobs_table.column("progress", width=300)
+        jobs_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        def selected_jobs():
+            ids = set(int(iid) for iid in jobs_table.selection())
+            return [job for job in self.install_queue.jobs if job.id in ids]
+
+        def change_priority(delta):
+            for job in selected_jobs():
+                self.install_queue.set_priority(job, job.priority + delta)
+
+        # Boutons d'action sur les jobs sélectionnés
+        buttons_frame = tk.Frame(queue_window)
+        buttons_frame.pack(fill=tk.X, padx=10)
+        for text, command in (
+            ("Pause", lambda: [self.install_queue.pause(job) for job in selected_jobs()]),
+            ("Resume", lambda: [self.install_queue.resume(job) for job in selected_jobs()]),
+            ("Cancel", lambda: [self.install_queue.cancel(job) for job in selected_jobs()]),
+            ("Priority +", lambda: change_priority(1)),
+            ("Priority -", lambda: change_priority(-1)),
+            ("Clear Finished", self.install_queue.clear_finished)
+        ):
+            tk.Button(buttons_frame, text=text, command=command).pack(side=tk.LEFT, padx=(0, 5))
+
+        # Limite de débit globale
+        bandwidth_frame = tk.Frame(queue_window)
+        bandwidth_frame.pack(fill=tk.X, padx=10, pady=10)
+        tk.Label(bandwidth_frame, text="Bandwidth cap (MB/s, 0 = unlimited):").pack(side=tk.LEFT)
+        bandwidth_entry = tk.Entry(bandwidth_frame, width=8)
+        bandwidth_entry.insert(0, f"{self.install_queue.bucket.rate / (1024 * 1024):g}")
+        bandwidth_entry.pack(side=tk.LEFT, padx=5)
+
+        def apply_bandwidth():
+            try:
+                limit_mb = float(bandwidth_entry.get().replace(",", "."))
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a number of MB/s.", parent=queue_window)
+                return
+            self.install_queue.bucket.rate = int(max(0, limit_mb) * 1024 * 1024)
+
+        tk.Button(bandwidth_frame, text="Apply", command=apply_bandwidth).pack(side=tk.LEFT)
+
+        def refresh_jobs():
+            """Met à jour les lignes du tableau à partir de l'état des jobs."""
+            if not queue_window.winfo_exists():
+                return
+            job_ids = set()
+            for job in self.install_queue.jobs:
+                iid = str(job.id)
+                job_ids.add(iid)
+                progress = format_progress(job.tracker.sample()) if job.state == "running" else (job.error or "")
+                values = (job.custom_name, job.priority, job.state, progress)
+                if jobs_table.exists(iid):
+                    jobs_table.item(iid, values=values)
+                else:
+                    jobs_table.insert("", "end", iid=iid, values=values)
+            for iid in jobs_table.get_children():
+                if iid not in job_ids:
+                    jobs_table.delete(iid)
+            queue_window.after(self.QUEUE_REFRESH_MS, refresh_jobs)
+
+        refresh_jobs()
+
     def delete_version(self):
         """Supprime la version sélectionnée."""
         selected_items = self.version_table.selection()
@@ -529,27 +1464,63 @@ class AppWindow:
             messagebox.showerror("Error", "Please select a valid version to delete.")
             return
 
-        # Récupérer le nom du dossier de la version sélectionnée
-        selected_version = self.version_table.item(selected_items[0], "values")[0]
+        # L'identifiant de la ligne est le nom du dossier de la version sélectionnée
+        selected_version = selected_items[0]
 
         # Chemin du dossier de la version
         version_path = os.path.join("builds", selected_version)
 
-        if os.path.exists(version_path):
+        if self._is_archived(selected_version):
+            # Une build archivée n'est qu'un pack : pas de corbeille, la suppression est définitive
+            if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete the archived build '{selected_version}'?\n"
+                                                       "This cannot be undone."):
+                try:
+                    BuildArchive("builds").delete(selected_version)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to delete version '{selected_version}'.\n{e}")
+                    return
+                self._remove_version_row(selected_version)
+                self._update_combobox()
+        elif os.path.exists(version_path):
             # Demander confirmation avant de supprimer
             if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete version '{selected_version}'?"):
                 try:
-                    # Supprimer le dossier et son contenu
-                    import shutil
-                    shutil.rmtree(version_path)
-                    messagebox.showinfo("Success", f"Build '{selected_version}' has been deleted.")
-                    # Rafraîchir la liste des builds
-                    self.refresh_versions()
+                    # Simple renommage vers builds/.trash : les fichiers sont effacés plus tard en arrière-plan
+                    trash_id = self.trash.delete(selected_version)
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to delete version '{selected_version}'.\n{e}")
+                    return
+                self._remove_version_row(selected_version)
+                self._update_combobox()
+                self._show_undo(selected_version, trash_id)
         else:
             messagebox.showerror("Error", f"Build '{selected_version}' not found.")
 
+    def _show_undo(self, version_name, trash_id):
+        """Affiche le bandeau permettant de restaurer une build supprimée pendant le délai de grâce."""
+        if self._undo_job is not None:
+            self.root.after_cancel(self._undo_job)
+        self.undo_label.config(text=f"Deleted '{version_name}'.")
+        self.undo_button.config(command=lambda: self._undo_delete(trash_id))
+        self.undo_frame.pack(side=tk.LEFT)
+        self._undo_job = self.root.after(TRASH_GRACE_PERIOD * 1000, self._hide_undo)
+
+    def _hide_undo(self):
+        self._undo_job = None
+        self.undo_frame.pack_forget()
+
+    def _undo_delete(self, trash_id):
+        """Restaure la dernière build supprimée."""
+        if self._undo_job is not None:
+            self.root.after_cancel(self._undo_job)
+        self._hide_undo()
+        try:
+            self.trash.restore(trash_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to restore the build.\n{e}")
+            return
+        self.refresh_versions()
+
     def rename_version(self):
         """Renomme la version sélectionnée."""
         selected_items = self.version_table.selection()
@@ -557,13 +1528,13 @@ class AppWindow:
             messagebox.showerror("Error", "Please select a version to rename.")
             return
 
-        # Récupérer le nom du dossier de la version sélectionnée
-        selected_version = self.version_table.item(selected_items[0], "values")[0]
+        # L'identifiant de la ligne est le nom du dossier de la version sélectionnée
+        selected_version = selected_items[0]
 
         # Fenêtre pour saisir le nouveau nom
         rename_window = tk.Toplevel(self.root)
         rename_window.title("Rename Build")
-        rename_window.geometry("500x150")
+        rename_window.geometry("500x210")
         rename_window.resizable(False, False)  # Empêche le redimensionnement
 
         tk.Label(rename_window, text=f"Renaming: {selected_version}").pack(pady=10)
@@ -572,27 +1543,41 @@ class AppWindow:
         new_name_entry = tk.Entry(rename_window, width=30)
         new_name_entry.pack(fill=tk.X, padx=10, pady=5)
 
+        # Reprise optionnelle des données d'une autre build une fois la build renommée
+        migrate_combobox = None
+        if not self._is_archived(selected_version):
+            tk.Label(rename_window, text="Migrate Data From:").pack(pady=5)
+            migrate_combobox = self._data_source_combobox(rename_window, exclude=selected_version)
+            migrate_combobox.pack(fill=tk.X, padx=10, pady=5)
+
         def confirm_rename():
             new_name = new_name_entry.get().strip()
             if not new_name:
                 messagebox.showerror("Error", "New name cannot be empty.")
                 return
 
-            # Chemin actuel et nouveau chemin
-            current_path = os.path.join("builds", selected_version)
+            # Nouveau chemin
             new_path = os.path.join("builds", new_name)
 
-            if os.path.exists(new_path):
+            if os.path.exists(new_path) or new_name in self.builds:
                 messagebox.showerror("Error", f"A version with the name '{new_name}' already exists.")
                 return
 
             try:
-                os.rename(current_path, new_path)
+                if self._is_archived(selected_version):
+                    BuildArchive("builds").rename(selected_version, new_name)
+                else:
+                    # Renommage journalisé : l'index des builds suit le dossier même en cas de coupure
+                    self.trash.rename(selected_version, new_name)
                 messagebox.showinfo("Success", f"Build '{selected_version}' has been renamed to '{new_name}'.")
                 self.refresh_versions()  # Rafraîchir la liste des builds
+                source_name = self._data_source(migrate_combobox) if migrate_combobox is not None else None
                 rename_window.destroy()  # Fermer la fenêtre
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to rename version.\n{e}")
+                return
+            if source_name is not None:
+                self._start_migration(source_name, new_name)
 
         tk.Button(rename_window, text="Rename", command=confirm_rename).pack(pady=10)
 
@@ -603,8 +1588,8 @@ class AppWindow:
             messagebox.showerror("Error", "Please select a version to open its folder.")
             return
 
-        # Récupérer le nom du dossier de la version sélectionnée
-        selected_version = self.version_table.item(selected_items[0], "values")[0]
+        # L'identifiant de la ligne est le nom du dossier de la version sélectionnée
+        selected_version = selected_items[0]
 
         # Chemin du dossier de la version
         version_path = os.path.join("builds", selected_version)
@@ -618,40 +1603,68 @@ class AppWindow:
             messagebox.showerror("Error", f"Folder not found for version '{selected_version}'.")
 
     def load_changelog(self):
-        """Charge le changelog de la dernière version disponible sur GitHub et applique les styles directement dans les balises HTML."""
-        try:
-            # URL de la dernière release
-            url = "https://api.github.com/repos/coop-deluxe/sm64coopdx/releases/latest"
-            
-            # Effectuer une requête GET pour récupérer les données de la dernière release
-            response = requests.get(url)
-            response.raise_for_status()  # Vérifie si la requête a réussi
-            
-            # Extraire le contenu JSON de la réponse
-            latest_release = response.json()
-            changelog_markdown = latest_release.get("body", "No changelog available.")
-            
-            # Convertir le Markdown en HTML
-            changelog_html = markdown.markdown(changelog_markdown)
-            
-            # Injecter les styles directement dans les balises HTML
-            styled_html = changelog_html.replace(
-                "<h1>", '<h1 style="font-size: 150%; font-family: Arial, sans-serif;">'
-            ).replace(
-                "<h2>", '<h2 style="font-size: 125%; font-family: Arial, sans-serif;">'
-            ).replace(
-                "<h3>", '<h3 style="font-size: 110%; font-family: Arial, sans-serif;">'
-            ).replace(
-                "<p>", '<p style="font-size: 70%; font-family: Arial, sans-serif;">'
-            ).replace(
-                "<li>", '<li style="font-size: 70%; font-family: Arial, sans-serif;">'
-            )
-            
-            # Afficher le changelog dans le widget HTMLLabel
-            self.changelog_text.set_html(styled_html)
-        except Exception as e:
-            # Afficher un message d'erreur si le changelog ne peut pas être chargé
-            self.changelog_text.set_html(f"<p>Failed to load changelog.<br>Error: {e}</p>")
+        """Lance le chargement du changelog en arrière-plan ; "Loading..." reste affiché en attendant."""
+        self.tasks.submit(
+            self._fetch_changelog_html,
+            on_success=self._show_changelog,
+            on_error=lambda e: self._show_changelog(f"<p>Failed to load changelog.<br>Error: {e}</p>")
+        )
+
+    @traced("changelog.render")
+    def _show_changelog(self, html):
+        """Affiche le changelog ; au premier appel, remplace le texte provisoire par un widget HTML."""
+        if self._changelog_is_html:
+            self.changelog_text.set_html(html)
+            return
+
+        from tkhtmlview import HTMLLabel
+
+        self.changelog_text.destroy()
+        self.changelog_text = HTMLLabel(self.changelog_container, html=html)
+        self.changelog_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._changelog_is_html = True
+
+        # Configurer la scrollbar pour qu'elle défile avec le contenu
+        self.changelog_text.configure(yscrollcommand=self.changelog_scrollbar.set)
+        self.changelog_scrollbar.config(command=self.changelog_text.yview)
+
+        # Lier la molette de la souris au défilement
+        self.changelog_text.bind("<MouseWheel>", self._on_mousewheel)  # Windows
+
+    @staticmethod
+    @traced("changelog.fetch")
+    def _fetch_changelog_html():
+        """Télécharge le changelog de la dernière version disponible sur GitHub et applique les styles directement dans les balises HTML.
+
+        Exécutée dans un thread de fond : ne doit toucher à aucun widget.
+        """
+        import markdown
+        from utils.github_manager import GitHubManager
+
+        # Pré-charger tkhtmlview (et Pillow) ici plutôt que dans le thread Tk
+        import tkhtmlview  # noqa: F401
+
+        # Récupérer la dernière release (depuis le cache si elle est encore fraîche)
+        latest_release = GitHubManager.get_latest_release()
+        if latest_release is None:
+            raise RuntimeError("GitHub is unreachable and no cached release is available.")
+        changelog_markdown = latest_release.get("body", "No changelog available.")
+
+        # Convertir le Markdown en HTML
+        changelog_html = markdown.markdown(changelog_markdown)
+
+        # Injecter les styles directement dans les balises HTML
+        return changelog_html.replace(
+            "<h1>", '<h1 style="font-size: 150%; font-family: Arial, sans-serif;">'
+        ).replace(
+            "<h2>", '<h2 style="font-size: 125%; font-family: Arial, sans-serif;">'
+        ).replace(
+            "<h3>", '<h3 style="font-size: 110%; font-family: Arial, sans-serif;">'
+        ).replace(
+            "<p>", '<p style="font-size: 70%; font-family: Arial, sans-serif;">'
+        ).replace(
+            "<li>", '<li style="font-size: 70%; font-family: Arial, sans-serif;">'
+        )
 
     def _on_mousewheel(self, event):
         """Gère le défilement de la molette de la souris pour le widget changelog."""
@@ -660,5 +1673,31 @@ class AppWindow:
         elif event.num == 4 or event.delta == 120:
             self.changelog_text.yview_scroll(-1, "units")
 
+    def _report_first_paint(self):
+        """Affiche le temps écoulé entre la création de la fenêtre et son premier affichage."""
+        elapsed_ms = (time.perf_counter() - self._startup_time) * 1000
+        print(f"Time to first paint: {elapsed_ms:.0f} ms")
+
+        # En mode --profile-startup, la fenêtre se ferme dès qu'elle est affichée
+        if self.profiler is not None:
+            self.profiler.mark_first_paint()
+            self.close()
+
+    def close(self):
+        """Arrête les tâches de fond et ferme la fenêtre."""
+        self.builds_watcher.stop()
+        self.install_queue.stop()
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.trash.stop()
+        if self.mirror_server is not None:
+            self.mirror_server.stop()
+        if self.supervisor is not None:
+            self.supervisor.stop()
+        self.tasks.shutdown()
+        tracer.close()
+        self.root.destroy()
+
     def run(self):
+        self.root.after_idle(self._report_first_paint)
         self.root.mainloop()
\ No newline at end of file
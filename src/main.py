@@ -1,18 +1,43 @@
 import sys
 import os
+import argparse
+import contextlib
 
 # Ajouter le dossier racine au chemin Python
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from gui.app_window import AppWindow
-
 def main():
+    parser = argparse.ArgumentParser(description="sm64coopdx Launcher")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Open the window, report import and construction times, then exit (status 1 if over budget)."
+    )
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile_startup:
+        from utils.startup_profiler import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    # Importé ici pour que le profiler mesure aussi le chargement de l'interface
+    with profiler.phase("Import gui.app_window") if profiler else contextlib.nullcontext():
+        from gui.app_window import AppWindow
+
     # Ensure the 'versions' directory exists
     if not os.path.exists("versions"):
         os.makedirs("versions")
 
-    app = AppWindow()
+    app = AppWindow(profiler=profiler)
     app.run()
 
+    if profiler is not None:
+        from config import STARTUP_BUDGET_MS
+        profiler.uninstall()
+        report, within_budget = profiler.report(budget_ms=STARTUP_BUDGET_MS)
+        print(report)
+        sys.exit(0 if within_budget else 1)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
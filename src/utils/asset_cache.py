@@ -0,0 +1,132 @@
+import hashlib
+import os
+import threading
+
+from config import CACHE_DIRECTORY, ASSET_CACHE_MAX_BYTES
+from utils.integrity import check_digest, parse_digest
+
+
+class AssetCache:
+    """Staging cache of downloaded release assets (``cache/assets``) with size-based LRU eviction.
+
+    Each asset is stored as ``<key>_<file name>`` next to a ``.sha256`` sidecar written once
+    the download is complete; ``<key>`` is derived from the download URL. Reading an entry
+    refreshes its mtime, and ``evict`` removes the least recently used entries (partial
+    downloads included) until the cache fits in max_bytes.
+    """
+
+    KEY_LENGTH = 16
+    _lock = threading.Lock()
+    _active = set()
+
+    def __init__(self, directory=None, max_bytes=ASSET_CACHE_MAX_BYTES):
+        self.directory = directory or os.path.join(CACHE_DIRECTORY, "assets")
+        self.max_bytes = max_bytes
+
+    def path_for(self, download_url):
+        key = hashlib.sha1(download_url.encode("utf-8")).hexdigest()[:self.KEY_LENGTH]
+        file_name = os.path.basename(download_url.split("?")[0]) or "asset"
+        return os.path.join(self.directory, f"{key}_{file_name}")
+
+    def contains(self, download_url):
+        """True if the asset is fully downloaded; does not count as a use."""
+        return os.path.exists(self.path_for(download_url) + ".sha256")
+
+    def get(self, download_url, expected_digest=None):
+        """Return the cached file of download_url, or None.
+
+        An entry whose hash does not match expected_digest is discarded.
+        """
+        path = self.path_for(download_url)
+        digest = self.digest(download_url)
+        if digest is None:
+            return None
+
+        expected_sha256 = parse_digest(expected_digest)
+        if expected_sha256 is not None and digest != expected_sha256:
+            print(f"Discarding cached {os.path.basename(path)}: it does not match the release digest.")
+            self.discard(download_url)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def digest(self, download_url):
+        """SHA-256 of a fully downloaded asset, or None."""
+        try:
+            with open(self.path_for(download_url) + ".sha256", "r") as digest_file:
+                return digest_file.read().strip()
+        except OSError:
+            return None
+
+    def fetch(self, download_url, chunk_hook=None, expected_digest=None):
+        """Download the asset into the cache (resuming a partial download) and return its path."""
+        # Import local : le cache peut être consulté sans charger la pile réseau
+        from utils.downloader import Downloader
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(download_url)
+        key = os.path.basename(path)[:self.KEY_LENGTH]
+        with self._lock:
+            self._active.add(key)
+        try:
+            digest = Downloader(chunk_hook=chunk_hook).download(download_url, path)
+            try:
+                check_digest(digest, expected_digest, os.path.basename(path))
+            except Exception:
+                os.remove(path)
+                raise
+            with open(path + ".sha256", "w") as digest_file:
+                digest_file.write(digest)
+        finally:
+            with self._lock:
+                self._active.discard(key)
+        self.evict(keep=(key,))
+        return path
+
+    def discard(self, download_url):
+        path = self.path_for(download_url)
+        for suffix in (".sha256", "", ".part", ".part.json"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def total_size(self):
+        return sum(size for size, _, _ in self._entries().values())
+
+    def evict(self, keep=()):
+        """Remove least recently used entries until the cache fits in max_bytes. Returns the bytes freed."""
+        entries = self._entries()
+        total = sum(size for size, _, _ in entries.values())
+        freed = 0
+        with self._lock:
+            protected = set(keep) | self._active
+        for key, (size, _, paths) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if key in protected:
+                continue
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            freed += size
+        return freed
+
+    def _entries(self):
+        """Group the cache files by key: {key: (total_size, last_used, paths)}."""
+        entries = {}
+        if not os.path.isdir(self.directory):
+            return entries
+        with os.scandir(self.directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if not directory_entry.is_file():
+                    continue
+                stat = directory_entry.stat()
+                key = directory_entry.name[:self.KEY_LENGTH]
+                size, last_used, paths = entries.get(key, (0, 0, []))
+                entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime), paths + [directory_entry.path])
+        return entries
@@ -0,0 +1,334 @@
+import importlib.util
+import json
+import lzma
+import os
+import shutil
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ARCHIVE_CODEC, ARCHIVE_LEVEL, ARCHIVE_FRAME_SIZE, DEDUPLICATE_BUILDS
+from utils.build_claim import claim_staging
+from utils.build_index import BuildIndex
+from utils.build_store import BuildStore
+from utils.build_trash import BuildTrash
+from utils.integrity import BuildManifest
+from utils.tracing import tracer
+
+
+class PackCodec:
+    """Block compressor of a pack: zstd when the zstandard module is installed, else lzma or zlib."""
+
+    DEFAULT_LEVELS = {"zstd": 10, "lzma": 6, "zlib": 9}
+
+    def __init__(self, name, level=None):
+        self.name = name
+        self.level = self.DEFAULT_LEVELS[name] if level is None else level
+        if name == "zstd":
+            import zstandard
+            self._zstandard = zstandard
+
+    @staticmethod
+    def choose(name=ARCHIVE_CODEC, level=ARCHIVE_LEVEL):
+        if name == "auto":
+            name = "zstd" if importlib.util.find_spec("zstandard") is not None else "lzma"
+        return PackCodec(name, level)
+
+    def compress(self, data):
+        # Chaque codec vérifie l'intégrité du bloc à la décompression (checksum zstd, CRC64 xz, Adler-32 zlib)
+        if self.name == "zstd":
+            return self._zstandard.ZstdCompressor(level=self.level, write_checksum=True).compress(data)
+        if self.name == "lzma":
+            return lzma.compress(data, preset=self.level)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data):
+        if self.name == "zstd":
+            return self._zstandard.ZstdDecompressor().decompress(data)
+        if self.name == "lzma":
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+
+
+class BuildArchive:
+    """Cold storage of inactive builds as single compressed packs in ``builds/.archive/<name>.pack``.
+
+    Layout of a pack::
+
+        MAGIC | header length (u32) | header JSON | frame 0 | frame 1 | ... | index JSON
+              | index offset (u64) | MAGIC
+
+    The header holds the build's game_version, renderer and sizes, so archived builds are
+    listed without decompressing anything. Files are cut into frames of frame_size bytes,
+    each compressed on its own: packing and rehydration spread the frames over a thread
+    pool (zstd, lzma and zlib release the GIL). The index at the end maps every frame to
+    the file ranges it holds, and also carries the build's BuildManifest so the restored
+    build can be audited as before.
+    """
+
+    MAGIC = b"SM64PACK"
+    FORMAT = 1
+    DIRECTORY_NAME = ".archive"
+
+    def __init__(self, directory="builds", codec=None, frame_size=ARCHIVE_FRAME_SIZE, workers=None):
+        self.directory = directory
+        self.path = os.path.join(directory, self.DIRECTORY_NAME)
+        self.codec = codec
+        self.frame_size = frame_size
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def path_for(self, name):
+        return os.path.join(self.path, f"{name}.pack")
+
+    def exists(self, name):
+        return os.path.isfile(self.path_for(name))
+
+    def list(self):
+        """Return the headers of every archived build, sorted by name (nothing is decompressed)."""
+        if not os.path.isdir(self.path):
+            return []
+        headers = []
+        with os.scandir(self.path) as pack_entries:
+            for pack_entry in pack_entries:
+                if not pack_entry.name.endswith(".pack") or not pack_entry.is_file():
+                    continue
+                try:
+                    header = self.read_header(pack_entry.path)
+                except (OSError, ValueError) as e:
+                    print(f"Error reading archived build {pack_entry.name}: {e}")
+                    continue
+                # Le nom du fichier fait foi : un pack renommé garde son ancien nom dans l'en-tête
+                header["name"] = pack_entry.name[:-len(".pack")]
+                header["packed_size"] = pack_entry.stat().st_size
+                headers.append(header)
+        return sorted(headers, key=lambda header: header["name"])
+
+    @staticmethod
+    def read_header(pack_path):
+        with open(pack_path, "rb") as pack_file:
+            if pack_file.read(len(BuildArchive.MAGIC)) != BuildArchive.MAGIC:
+                raise ValueError("not a build pack")
+            (header_length,) = struct.unpack("<I", pack_file.read(4))
+            return json.loads(pack_file.read(header_length).decode("utf-8"))
+
+    def archive(self, name):
+        """Pack builds/<name> and remove the folder.
+
+        Returns {"name", "original_size", "packed_size", "freed_bytes", "saved_bytes", "seconds"};
+        freed_bytes is what the folder really occupied (files shared with other builds through
+        the BuildStore are not counted) and saved_bytes is freed_bytes minus the pack.
+        """
+        build_path = os.path.join(self.directory, name)
+        if not os.path.isdir(build_path):
+            raise FileNotFoundError(f"Build '{name}' not found.")
+        if self.exists(name):
+            raise FileExistsError(f"Build '{name}' is already archived.")
+
+        start = time.perf_counter()
+        with tracer.span("archive.pack", build=name) as span:
+            entry = BuildIndex(self.directory).get(name)
+            manifest = BuildManifest.load(build_path) or BuildManifest.write(build_path)
+            directories, files, frames, unshared_size = self._plan(build_path)
+            codec = self.codec or PackCodec.choose()
+            header = {
+                "format": self.FORMAT,
+                "name": name,
+                "game_version": entry["game_version"],
+                "renderer": entry["renderer"],
+                "codec": codec.name,
+                "archived_at": time.time(),
+                "original_size": sum(file["size"] for file in files.values()),
+                "files": len(files)
+            }
+
+            os.makedirs(self.path, exist_ok=True)
+            temp_path = self.path_for(name) + ".tmp"
+            trash = BuildTrash(self.directory)
+            trash_id = None
+            try:
+                self._write_pack(temp_path, build_path, header, codec, directories, files, frames, manifest)
+                # Le dossier quitte la liste avant que le pack n'y entre : une build verrouillée
+                # (jeu lancé sous Windows) fait échouer l'archivage sans jamais apparaître deux fois
+                trash_id = trash.delete(name)
+                os.replace(temp_path, self.path_for(name))
+            except BaseException:
+                if trash_id is not None:
+                    trash.restore(trash_id)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            # Le pack est en place : le dossier est effacé tout de suite plutôt qu'au délai de grâce
+            freed_bytes = unshared_size + trash.purge(trash_id)
+            packed_size = os.path.getsize(self.path_for(name))
+            span.set(original_size=header["original_size"], packed_size=packed_size, codec=codec.name)
+            span.add_bytes(header["original_size"])
+
+        return {
+            "name": name,
+            "original_size": header["original_size"],
+            "packed_size": packed_size,
+            "freed_bytes": freed_bytes,
+            "saved_bytes": freed_bytes - packed_size,
+            "seconds": time.perf_counter() - start
+        }
+
+    def rehydrate(self, name, deduplicate=DEDUPLICATE_BUILDS):
+        """Unpack an archived build back into builds/<name> and delete its pack.
+
+        Frames are decompressed in parallel straight into their files, then file modes and
+        mtimes are restored. With deduplicate, the files go back into the BuildStore like a
+        fresh install, sharing their blobs with the other builds again, and the BuildManifest
+        is refreshed for the linked files. Returns {"name", "files", "bytes", "seconds"}.
+        """
+        pack_path = self.path_for(name)
+        build_path = os.path.join(self.directory, name)
+        start = time.perf_counter()
+        # Même principe que les installations : assemblage dans un dossier caché, réservé au nom, puis renommage
+        with claim_staging(self.directory, name) as staging_path, \
+                tracer.span("archive.rehydrate", build=name) as span:
+            # Vérifié une fois le nom réservé : une autre restauration a pu se terminer entre-temps
+            if not os.path.isfile(pack_path):
+                raise FileNotFoundError(f"Archived build '{name}' not found.")
+            if os.path.exists(build_path):
+                raise FileExistsError(f"A build named '{name}' already exists.")
+
+            header = self.read_header(pack_path)
+            index = self._read_index(pack_path)
+            codec = PackCodec(header["codec"])
+
+            try:
+                for relative_path in index["directories"]:
+                    os.makedirs(os.path.join(staging_path, *relative_path.split("/")), exist_ok=True)
+                for relative_path, file in index["files"].items():
+                    target_path = os.path.join(staging_path, *relative_path.split("/"))
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    with open(target_path, "wb") as target:
+                        target.truncate(file["size"])
+
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    list(executor.map(lambda frame: self._unpack_frame(pack_path, staging_path, codec, frame),
+                                      index["frames"]))
+
+                for relative_path, file in index["files"].items():
+                    target_path = os.path.join(staging_path, *relative_path.split("/"))
+                    os.chmod(target_path, file["mode"])
+                    os.utime(target_path, ns=(file["mtime_ns"], file["mtime_ns"]))
+
+                if deduplicate:
+                    # Les fichiers du launcher restent propres à la build, comme après une installation
+                    own_files = [os.path.join(staging_path, file_name) for file_name in BuildManifest.IGNORED]
+                    digests = {}
+                    BuildStore(os.path.join(self.directory, ".store")).import_tree(
+                        staging_path, skip=own_files, digests=digests)
+                    # Un fichier lié à un blob existant prend son mtime : le manifeste suit, sans rien relire
+                    BuildManifest.write(staging_path, known=digests)
+                os.rename(staging_path, build_path)
+            except BaseException:
+                shutil.rmtree(staging_path, ignore_errors=True)
+                raise
+            os.remove(pack_path)
+            span.set(files=len(index["files"]), codec=codec.name)
+            span.add_bytes(header["original_size"])
+
+        return {
+            "name": name,
+            "files": len(index["files"]),
+            "bytes": header["original_size"],
+            "seconds": time.perf_counter() - start
+        }
+
+    def delete(self, name):
+        os.remove(self.path_for(name))
+
+    def rename(self, name, new_name):
+        if os.path.exists(os.path.join(self.directory, new_name)) or self.exists(new_name):
+            raise FileExistsError(f"A build named '{new_name}' already exists.")
+        os.rename(self.path_for(name), self.path_for(new_name))
+
+    def _plan(self, build_path):
+        """List directories and files and cut the files into frames of [path, offset, length] ranges.
+
+        Also returns the size of the files no other build shares (their only link is this build).
+        """
+        directories = []
+        files = {}
+        frames = [[]]
+        frame_fill = 0
+        unshared_size = 0
+        for current_directory, directory_names, file_names in os.walk(build_path):
+            relative_directory = os.path.relpath(current_directory, build_path).replace(os.sep, "/")
+            if relative_directory != ".":
+                directories.append(relative_directory)
+            for file_name in sorted(file_names):
+                path = os.path.join(current_directory, file_name)
+                relative_path = os.path.relpath(path, build_path).replace(os.sep, "/")
+                stat = os.stat(path)
+                files[relative_path] = {"size": stat.st_size, "mode": stat.st_mode & 0o777,
+                                        "mtime_ns": stat.st_mtime_ns}
+                if stat.st_nlink <= 1:
+                    unshared_size += stat.st_size
+
+                offset = 0
+                while offset < stat.st_size:
+                    length = min(stat.st_size - offset, self.frame_size - frame_fill)
+                    frames[-1].append([relative_path, offset, length])
+                    offset += length
+                    frame_fill += length
+                    if frame_fill >= self.frame_size:
+                        frames.append([])
+                        frame_fill = 0
+        return directories, files, [frame for frame in frames if frame], unshared_size
+
+    def _write_pack(self, pack_path, build_path, header, codec, directories, files, frames, manifest):
+        def compress_frame(ranges):
+            data = bytearray()
+            for relative_path, offset, length in ranges:
+                with open(os.path.join(build_path, *relative_path.split("/")), "rb") as source:
+                    source.seek(offset)
+                    data += source.read(length)
+            return codec.compress(bytes(data))
+
+        header_data = json.dumps(header).encode("utf-8")
+        index_frames = []
+        with open(pack_path, "wb") as pack_file, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pack_file.write(self.MAGIC + struct.pack("<I", len(header_data)) + header_data)
+            # Par lots : au plus deux blocs compressés par worker en mémoire à la fois
+            batch_size = self.workers * 2
+            for batch_start in range(0, len(frames), batch_size):
+                batch = frames[batch_start:batch_start + batch_size]
+                for ranges, compressed in zip(batch, executor.map(compress_frame, batch)):
+                    index_frames.append({"offset": pack_file.tell(), "length": len(compressed), "ranges": ranges})
+                    pack_file.write(compressed)
+
+            index = {"directories": directories, "files": files, "frames": index_frames, "manifest": manifest}
+            index_offset = pack_file.tell()
+            pack_file.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+            pack_file.write(struct.pack("<Q", index_offset) + self.MAGIC)
+            pack_file.flush()
+            os.fsync(pack_file.fileno())
+
+    def _read_index(self, pack_path):
+        trailer_size = 8 + len(self.MAGIC)
+        with open(pack_path, "rb") as pack_file:
+            pack_file.seek(-trailer_size, os.SEEK_END)
+            trailer = pack_file.read(trailer_size)
+            if trailer[8:] != self.MAGIC:
+                raise ValueError(f"{os.path.basename(pack_path)} is truncated.")
+            (index_offset,) = struct.unpack("<Q", trailer[:8])
+            index_end = pack_file.seek(-trailer_size, os.SEEK_END)
+            pack_file.seek(index_offset)
+            return json.loads(pack_file.read(index_end - index_offset).decode("utf-8"))
+
+    @staticmethod
+    def _unpack_frame(pack_path, staging_path, codec, frame):
+        with open(pack_path, "rb") as pack_file:
+            pack_file.seek(frame["offset"])
+            data = memoryview(codec.decompress(pack_file.read(frame["length"])))
+        position = 0
+        for relative_path, offset, length in frame["ranges"]:
+            with open(os.path.join(staging_path, *relative_path.split("/")), "r+b") as target:
+                target.seek(offset)
+                target.write(data[position:position + length])
+            position += length
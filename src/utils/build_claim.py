@@ -0,0 +1,56 @@
+import contextlib
+import os
+import shutil
+import sys
+
+
+@contextlib.contextmanager
+def claim_staging(directory, name):
+    """Claim the build name for an install or a restore and clear its staging folder.
+
+    Yields builds/.installing-<name>. The claim is a lock on builds/.installing-<name>.lock,
+    held until the block exits: a second install or restore of the same name, from this
+    process or another launcher, fails with FileExistsError instead of wiping the first
+    one's staging folder. The operating system releases the lock of a launcher that was
+    killed, so its leftover staging folder is cleared by the next claim.
+    """
+    os.makedirs(directory, exist_ok=True)
+    staging_directory = os.path.join(directory, f".installing-{name}")
+    lock_path = staging_directory + ".lock"
+    lock_file = _lock(lock_path)
+    if lock_file is None:
+        raise FileExistsError(f"'{name}' is already being installed or restored.")
+    try:
+        # Reste éventuel d'une opération interrompue (fermeture du launcher, coupure...)
+        shutil.rmtree(staging_directory, ignore_errors=True)
+        yield staging_directory
+    finally:
+        # Supprimé avant d'être déverrouillé (Windows refuse : il l'est alors juste après)
+        with contextlib.suppress(OSError):
+            os.remove(lock_path)
+        lock_file.close()
+        with contextlib.suppress(OSError):
+            os.remove(lock_path)
+
+
+def _lock(lock_path):
+    """Open lock_path and take an exclusive, non-blocking lock on it. Returns the file, or None if held."""
+    while True:
+        lock_file = open(lock_path, "a+b")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        # Le fichier a pu être supprimé par son propriétaire précédent entre open() et le verrou
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                return lock_file
+        except FileNotFoundError:
+            pass
+        lock_file.close()
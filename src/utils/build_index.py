@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+
+from utils.tracing import tracer
+
+
+class BuildIndex:
+    """Manifest of installed builds stored in ``builds/.index.json``.
+
+    Each entry records the build's game_version, renderer, size, install time and
+    executable path along with the folder's mtime. A scan lists builds/ once and only
+    re-reads the folders whose mtime changed since the last scan (a folder's mtime moves
+    whenever a file is added, removed or renamed directly inside it).
+    """
+
+    EXECUTABLE_NAMES = ("sm64coopdx.exe", "sm64coopdx")
+    _lock = threading.Lock()
+
+    def __init__(self, directory="builds"):
+        self.directory = directory
+        self.path = os.path.join(directory, ".index.json")
+
+    def scan(self):
+        """Return the index entries of every build folder, sorted by name."""
+        with self._lock, tracer.span("build_index.scan") as span:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+
+            entries = self._load()
+            reread = 0
+            current = {}
+            with os.scandir(self.directory) as directory_entries:
+                for directory_entry in directory_entries:
+                    # Les dossiers cachés (".store", ...) appartiennent au launcher, pas aux builds
+                    if directory_entry.name.startswith(".") or not directory_entry.is_dir():
+                        continue
+                    mtime_ns = directory_entry.stat().st_mtime_ns
+                    entry = entries.get(directory_entry.name)
+                    if entry is None or entry["mtime_ns"] != mtime_ns:
+                        entry = self._read_build(directory_entry.name, mtime_ns, entry)
+                        reread += 1
+                    current[directory_entry.name] = entry
+
+            span.set(builds=len(current), reread=reread)
+            if reread or len(current) != len(entries):
+                self._save(current)
+            return [current[name] for name in sorted(current)]
+
+    def get(self, name):
+        """Return the up-to-date entry of one build, or None if its folder is gone."""
+        with self._lock:
+            entries = self._load()
+            build_path = os.path.join(self.directory, name)
+            if not os.path.isdir(build_path):
+                if entries.pop(name, None) is not None:
+                    self._save(entries)
+                return None
+            mtime_ns = os.stat(build_path).st_mtime_ns
+            entry = entries.get(name)
+            if entry is None or entry["mtime_ns"] != mtime_ns:
+                entry = self._read_build(name, mtime_ns, entry)
+                entries[name] = entry
+                self._save(entries)
+            return entry
+
+    def forget(self, name):
+        """Drop a build from the index (after it has been deleted or renamed)."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(name, None) is not None:
+                self._save(entries)
+
+    def rename(self, name, new_name):
+        """Move a build's entry to its new folder name, keeping its install time."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(name, None)
+            if entry is not None:
+                entry["name"] = new_name
+                entries[new_name] = entry
+                self._save(entries)
+
+    def _read_build(self, name, mtime_ns, previous):
+        # Import local : file_manager dépend lui-même de ce module
+        from utils.file_manager import FileManager
+
+        build_path = os.path.join(self.directory, name)
+        variables = FileManager.read_build_variables(build_path)
+
+        size = 0
+        for current_directory, _, file_names in os.walk(build_path):
+            for file_name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(current_directory, file_name))
+                except OSError:
+                    pass
+
+        exe_path = None
+        for exe_name in self.EXECUTABLE_NAMES:
+            if os.path.isfile(os.path.join(build_path, exe_name)):
+                exe_path = os.path.join(build_path, exe_name)
+                break
+
+        return {
+            "name": name,
+            "game_version": variables["game_version"],
+            "renderer": variables["renderer"],
+            "size": size,
+            "installed_at": previous["installed_at"] if previous else mtime_ns / 1e9,
+            "exe_path": exe_path,
+            "mtime_ns": mtime_ns
+        }
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as index_file:
+                json.dump(entries, index_file, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error writing build index: {e}")
@@ -0,0 +1,255 @@
+import contextlib
+import hashlib
+import os
+import shutil
+import time
+
+import requests
+
+from config import STREAMING_INSTALL, DEDUPLICATE_BUILDS, MIRROR_SERVER_ENABLED
+from utils.asset_cache import AssetCache
+from utils.build_archive import BuildArchive
+from utils.build_claim import claim_staging
+from utils.build_store import BuildStore
+from utils.downloader import Downloader
+from utils.integrity import BuildManifest, check_digest
+from utils.tracing import tracer, traced, current_span
+from utils.zip_extractor import ParallelZipExtractor
+from utils.zip_stream import StreamingZipExtractor, UnsupportedZipError
+
+
+class BuildInstaller:
+    @staticmethod
+    def parse_asset_name(file_name):
+        """Extract (game_version, renderer) from an asset name such as sm64coopdx_v1.0.3_Windows_OpenGL.zip."""
+        game_version = "Unknown"
+        renderer = "Unknown"
+        if "_v" in file_name:
+            try:
+                version_part = file_name.split("_v")[1]
+                game_version = version_part.split("_")[0]
+                renderer = file_name.split("_")[-1].split(".")[0]
+            except IndexError:
+                pass
+        return game_version, renderer
+
+    @staticmethod
+    def write_variables(extract_directory, game_version, renderer):
+        """Write the launcher_variables file read back by FileManager.read_build_variables."""
+        variables_file_path = os.path.join(extract_directory, "launcher_variables")
+        with open(variables_file_path, "w") as variables_file:
+            variables_file.write(f"game_version={game_version}\n")
+            variables_file.write(f"renderer={renderer}\n")
+
+    @staticmethod
+    def install(download_url, file_name, custom_name, directory="builds", progress_callback=None,
+                streaming=STREAMING_INSTALL, deduplicate=DEDUPLICATE_BUILDS, chunk_hook=None, expected_digest=None):
+        """Download an asset and install it as builds/<custom_name>. Returns the build folder.
+
+        progress_callback(done, total, stage) is called from the calling thread, with stage
+        "download" (done/total in bytes) or "extract" (done/total in archive members).
+        chunk_hook is handed to the Downloader (see Downloader.__init__). The build is
+        assembled in a hidden builds/.installing-<custom_name> folder and renamed into place
+        once complete, so an interrupted install never shows up as a broken build.
+        An asset already fetched into the AssetCache (by the Prefetcher) is only extracted.
+
+        The asset is hashed while it downloads and checked against expected_digest (GitHub's
+        "sha256:<hex>" asset digest), falling back to the digest in the cached release catalog;
+        a mismatch raises IntegrityError. The hash of every installed file is recorded in the
+        build's BuildManifest for later audits.
+        """
+        with BuildInstaller._prepare(directory, custom_name) as (extract_directory, staging_directory):
+            if expected_digest is None:
+                # Import local : inutile de charger le client GitHub quand l'appelant fournit le digest
+                from utils.github_manager import GitHubManager
+                expected_digest = GitHubManager.get_asset_digest(download_url)
+
+            with tracer.span("install", build=custom_name):
+                BuildInstaller._assemble(
+                    file_name, staging_directory, extract_directory,
+                    lambda: BuildInstaller._install(download_url, directory, staging_directory,
+                                                    progress_callback, streaming, deduplicate, chunk_hook,
+                                                    expected_digest)
+                )
+        return extract_directory
+
+    @staticmethod
+    def update(download_url, file_name, base_name, custom_name, directory="builds", progress_callback=None,
+               deduplicate=DEDUPLICATE_BUILDS, chunk_hook=None, expected_digest=None):
+        """Install an asset as builds/<custom_name> from the installed build base_name. Returns a report.
+
+        Only the zip's central directory and the members whose CRC32 or size differ from the
+        files of base_name are downloaded, through range requests (see DeltaUpdater); the
+        other files are hardlinked from base_name, or copied when deduplicate is off. Each
+        downloaded member is checked against its CRC32: the SHA-256 of the whole asset cannot
+        be, since the asset is never downloaded whole.
+
+        Falls back to install() when the server does not accept range requests or when too
+        much of the asset changed. The report holds "delta" (False after a fallback),
+        "bytes_downloaded" and "full_bytes", "seconds" and "full_download_seconds", the time
+        a full download would have taken at the measured speed.
+        """
+        # Import local : le client de mise à jour différentielle ne sert qu'aux mises à jour
+        from utils.delta_update import DeltaUpdater, DeltaUnavailable
+
+        base_path = os.path.join(directory, base_name)
+        if not os.path.isdir(base_path):
+            raise FileNotFoundError(f"Build '{base_name}' not found.")
+        start = time.perf_counter()
+        # Le dossier temporaire est libéré avant un éventuel repli sur install(), qui le reprend
+        with BuildInstaller._prepare(directory, custom_name) as (extract_directory, staging_directory):
+            updater = DeltaUpdater(download_url, base_path, chunk_hook=chunk_hook)
+            with tracer.span("install.delta", build=custom_name, base=base_name) as span:
+                try:
+                    updater.plan()
+                except DeltaUnavailable as e:
+                    print(f"Delta update not possible, installing the whole build: {e}")
+                    span.set(fallback=str(e))
+                    fallback = e
+                else:
+                    fallback = None
+                    span.set(members=len(updater.reused) + len(updater.changed), changed=len(updater.changed))
+
+                    def populate():
+                        file_digests = updater.apply(staging_directory, deduplicate, progress_callback)
+                        if deduplicate:
+                            # Les fichiers liés depuis la build de base sont déjà dans le store
+                            BuildStore(os.path.join(directory, ".store")).import_tree(
+                                staging_directory, skip=file_digests, digests=file_digests)
+                        return file_digests
+
+                    BuildInstaller._assemble(file_name, staging_directory, extract_directory, populate)
+                    span.add_bytes(updater.remote.bytes_fetched)
+
+        if fallback is not None:
+            BuildInstaller.install(download_url, file_name, custom_name, directory, progress_callback,
+                                   deduplicate=deduplicate, chunk_hook=chunk_hook, expected_digest=expected_digest)
+            return {"delta": False, "reason": str(fallback), "seconds": time.perf_counter() - start}
+        return updater.report()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _prepare(directory, custom_name):
+        """Claim custom_name for an install (see claim_staging). Yields (build path, staging path)."""
+        extract_directory = os.path.join(directory, custom_name)
+        with claim_staging(directory, custom_name) as staging_directory:
+            if os.path.exists(extract_directory) or BuildArchive(directory).exists(custom_name):
+                raise FileExistsError(f"A build named '{custom_name}' already exists.")
+            yield extract_directory, staging_directory
+
+    @staticmethod
+    def _assemble(file_name, staging_directory, extract_directory, populate):
+        """Fill the staging folder with populate(), add the launcher's files and move it into place.
+
+        populate() returns the SHA-256 of the files it already hashed, keyed by normalized path.
+        """
+        game_version, renderer = BuildInstaller.parse_asset_name(file_name)
+        try:
+            file_digests = populate()
+            BuildInstaller.write_variables(staging_directory, game_version, renderer)
+            with tracer.span("install.manifest", files=len(file_digests)):
+                BuildManifest.write(staging_directory, file_digests)
+            os.rename(staging_directory, extract_directory)
+        except BaseException:
+            shutil.rmtree(staging_directory, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _install(download_url, directory, extract_directory, progress_callback, streaming,
+                 deduplicate, chunk_hook, expected_digest):
+        """Extract the asset into extract_directory, streaming when possible, and deduplicate it.
+
+        Returns the SHA-256 of the files hashed along the way, keyed by normalized path.
+        """
+        # Les fichiers déjà présents dans le store sont liés au lieu d'être décompressés
+        store = BuildStore(os.path.join(directory, ".store")) if deduplicate else None
+        reused = {}
+
+        def reuse(target_path, crc, size, member_digest):
+            digest = store.reuse(target_path, crc, size, member_digest)
+            if digest:
+                reused[os.path.normpath(target_path)] = digest
+            return digest
+
+        # Asset déjà pré-téléchargé : installation sans aucun téléchargement
+        asset_cache = AssetCache()
+        cached_path = asset_cache.get(download_url, expected_digest)
+        installed = False
+        if cached_path is not None:
+            with tracer.span("install.cached"):
+                ParallelZipExtractor().extract(cached_path, extract_directory,
+                                               BuildInstaller._stage_callback(progress_callback, "extract"),
+                                               reuse if store else None)
+            installed = True
+        elif streaming:
+            try:
+                BuildInstaller._install_streaming(download_url, extract_directory, progress_callback,
+                                                  reuse if store else None, chunk_hook, expected_digest)
+                installed = True
+            except (UnsupportedZipError, requests.RequestException, ConnectionError) as e:
+                # Le téléchargement par plages reprend ensuite là où il s'arrête, même après un redémarrage
+                print(f"Streaming install not possible, falling back to a full download: {e}")
+                shutil.rmtree(extract_directory, ignore_errors=True)
+                reused.clear()
+        if not installed:
+            # L'archive est téléchargée à côté du dossier temporaire, que protège le verrou de _prepare
+            BuildInstaller._install_downloaded(download_url, extract_directory + ".zip",
+                                               extract_directory, progress_callback, reuse if store else None,
+                                               chunk_hook, expected_digest)
+
+        file_digests = dict(reused)
+        if store:
+            store.import_tree(extract_directory, skip=reused, digests=file_digests)
+            print(f"Reused {len(reused)} files already in the build store.")
+        if cached_path is not None and not MIRROR_SERVER_ENABLED:
+            # La build est installée : l'archive pré-téléchargée n'a plus d'utilité (sauf pour les miroirs LAN)
+            asset_cache.discard(download_url)
+        return file_digests
+
+    @staticmethod
+    def _stage_callback(progress_callback, stage):
+        """Adapt progress_callback(done, total, stage) to the (done, total) callbacks of the workers."""
+        if progress_callback is None:
+            return None
+        return lambda done, total: progress_callback(done, total, stage)
+
+    @staticmethod
+    @traced("install.streaming")
+    def _install_streaming(download_url, extract_directory, progress_callback, reuse=None, chunk_hook=None,
+                           expected_digest=None):
+        """Inflate each member as soon as its bytes arrive: download and extraction overlap."""
+        span = current_span()
+        total_size, chunks = Downloader().stream(download_url)
+        sha256 = hashlib.sha256()
+
+        def counted_chunks():
+            downloaded_size = 0
+            for chunk in chunks:
+                downloaded_size += len(chunk)
+                sha256.update(chunk)
+                span.add_bytes(len(chunk))
+                if chunk_hook:
+                    chunk_hook(len(chunk))
+                if progress_callback:
+                    progress_callback(downloaded_size, total_size, "download")
+                yield chunk
+
+        # L'extracteur consomme le flux jusqu'au bout : le hash couvre toute l'archive
+        members = StreamingZipExtractor().extract(counted_chunks(), extract_directory, reuse)
+        span.set(members=len(members))
+        check_digest(sha256.hexdigest(), expected_digest, os.path.basename(download_url))
+
+    @staticmethod
+    def _install_downloaded(download_url, file_path, extract_directory, progress_callback, reuse=None,
+                            chunk_hook=None, expected_digest=None):
+        """Download the whole zip, extract it on several cores, then delete it."""
+        digest = Downloader(chunk_hook=chunk_hook).download(download_url, file_path,
+                                                            BuildInstaller._stage_callback(progress_callback, "download"))
+        try:
+            check_digest(digest, expected_digest, os.path.basename(file_path))
+        except Exception:
+            os.remove(file_path)
+            raise
+        ParallelZipExtractor().extract(file_path, extract_directory,
+                                       BuildInstaller._stage_callback(progress_callback, "extract"), reuse)
+        os.remove(file_path)
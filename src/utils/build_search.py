@@ -0,0 +1,63 @@
+class BuildSearchIndex:
+    """In-memory trigram index over build names, game versions and renderers.
+
+    A query is split into whitespace-separated terms that must all appear (as
+    case-insensitive substrings) in one of the build's fields. Terms of three characters
+    or more are answered from the trigram posting lists, then confirmed on the few
+    remaining candidates; shorter terms fall back to a scan.
+    """
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = {}
+
+    def add(self, name, fields):
+        """Index (or re-index) a build under name with the given field values."""
+        text = "\n".join(str(field) for field in fields).lower()
+        if self._texts.get(name) == text:
+            return
+        self.remove(name)
+        self._texts[name] = text
+        for trigram in self._trigrams(text):
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def remove(self, name):
+        text = self._texts.pop(name, None)
+        if text is None:
+            return
+        for trigram in self._trigrams(text):
+            names = self._postings.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._postings[trigram]
+
+    def names(self):
+        return set(self._texts)
+
+    def search(self, query):
+        """Return the set of build names matching every term of the query."""
+        terms = query.lower().split()
+        if not terms:
+            return set(self._texts)
+
+        postings = [
+            self._postings.get(trigram, set())
+            for term in terms if len(term) >= 3
+            for trigram in self._trigrams(term)
+        ]
+        if postings:
+            # Intersecter en partant de la liste la plus courte
+            postings.sort(key=len)
+            candidates = postings[0]
+            for names in postings[1:]:
+                if not candidates:
+                    return set()
+                candidates = candidates & names
+        else:
+            candidates = self._texts.keys()
+        return set(name for name in candidates if all(term in self._texts[name] for term in terms))
+
+    @staticmethod
+    def _trigrams(text):
+        return set(text[index:index + 3] for index in range(len(text) - 2))
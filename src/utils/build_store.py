@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import zlib
+
+
+class BuildStore:
+    """Content-addressed store of build files, shared between build folders through hardlinks.
+
+    Every file of an installed build is a hardlink to ``objects/<sha256[:2]>/<sha256>``.
+    Identical files in different builds therefore use the disk once, and a blob whose
+    link count drops back to 1 is referenced by no build and can be collected.
+    An index from (CRC32, size) to SHA-256 points installs at the blob a zip member probably
+    matches; the member is hashed in memory to confirm it, so repeat installs mostly skip
+    the disk write without trusting a CRC32.
+
+    As with any hardlink, editing a shared file in place changes it in every build
+    that uses it; tools that save through a temporary file and rename are unaffected.
+
+    Blobs that must outlive the builds linking them (the shared mods of ModStore) are
+    pinned: ``pins/<name>.json`` lists their digests and collect_garbage keeps them.
+
+    Each instance caches the index but only writes back its own changes, merged under the
+    lock into what index.json holds then, so stores opened side by side (concurrent
+    installs, a collection) never drop each other's entries.
+    """
+
+    READ_SIZE = 1024 * 1024
+    _lock = threading.Lock()
+
+    def __init__(self, root=os.path.join("builds", ".store")):
+        self.root = root
+        self.objects_directory = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self.pins_directory = os.path.join(root, "pins")
+        self._index = None
+        # Changements pas encore écrits dans index.json : clés ajoutées, blobs supprimés
+        self._added = {}
+        self._removed = set()
+
+    def reuse(self, target_path, crc, size, member_digest):
+        """Materialize target_path from the store if it has a blob with this member's contents.
+
+        Matches the ``reuse`` hook of the zip extractors: a blob with the same CRC32 and size
+        is only a candidate, linked once member_digest() (the SHA-256 of the member, computed
+        without writing it) confirms it. Returns the blob's SHA-256 (truthy) if the file was
+        linked, None otherwise.
+        """
+        with self._lock:
+            digest = self._load_index().get(self._index_key(crc, size))
+        if digest is None or not os.path.exists(self._blob_path(digest)):
+            return None
+        # Un CRC32 se falsifie facilement : seul le SHA-256 du membre autorise le lien
+        if member_digest() != digest:
+            return None
+        return digest if self.link(digest, target_path) else None
+
+    def import_tree(self, directory, skip=(), digests=None):
+        """Move every file of directory into the store and replace it with a link to its blob.
+
+        Paths in skip are already links to the store. If digests is a dict, it receives the
+        SHA-256 of every imported file keyed by normalized path. Returns the number of bytes
+        that turned out to be duplicates of existing blobs.
+        """
+        skip = set(os.path.normpath(path) for path in skip)
+        deduplicated = 0
+        for current_directory, _, file_names in os.walk(directory):
+            for file_name in file_names:
+                path = os.path.join(current_directory, file_name)
+                if os.path.normpath(path) in skip or os.path.islink(path):
+                    continue
+                duplicate_size, digest = self._import_file(path)
+                deduplicated += duplicate_size
+                if digests is not None:
+                    digests[os.path.normpath(path)] = digest
+
+        with self._lock:
+            self._save_index()
+        return deduplicated
+
+    def import_file(self, path):
+        """Move one file into the store and replace it with a link to its blob. Returns its SHA-256."""
+        _, digest = self._import_file(path)
+        with self._lock:
+            self._save_index()
+        return digest
+
+    def link(self, digest, target_path):
+        """Materialize target_path from the blob of digest. Returns False if the store does not have it."""
+        blob_path = self._blob_path(digest)
+        # Sous le verrou : collect_garbage ne peut pas supprimer le blob entre le test et le lien
+        with self._lock:
+            if not os.path.exists(blob_path):
+                return False
+            self._link(blob_path, target_path)
+        return True
+
+    def pin(self, name, digests):
+        """Keep the blobs of digests even when no build links to them, until unpin(name)."""
+        os.makedirs(self.pins_directory, exist_ok=True)
+        pin_path = self._pin_path(name)
+        with open(pin_path + ".tmp", "w") as pin_file:
+            json.dump(sorted(set(digests)), pin_file)
+        os.replace(pin_path + ".tmp", pin_path)
+
+    def unpin(self, name):
+        """Drop a pin; its blobs are collected once no build links to them."""
+        try:
+            os.remove(self._pin_path(name))
+        except FileNotFoundError:
+            pass
+
+    def collect_garbage(self, digests=None):
+        """Delete unpinned blobs no build links to anymore. Returns the number of bytes freed.
+
+        digests, if given, restricts the collection to these blobs.
+        """
+        pinned = self._pinned()
+        freed = 0
+        removed = set()
+        for blob_path, digest, stat in self._blobs():
+            if digests is not None and digest not in digests:
+                continue
+            if stat.st_nlink > 1 or digest in pinned:
+                continue
+            with self._lock:
+                # Relu sous le verrou : une installation a pu lier le blob depuis le parcours
+                stat = os.stat(blob_path)
+                if stat.st_nlink > 1:
+                    continue
+                os.remove(blob_path)
+            freed += stat.st_size
+            removed.add(digest)
+
+        if removed:
+            with self._lock:
+                self._removed.update(removed)
+                self._added = {key: digest for key, digest in self._added.items() if digest not in removed}
+                self._save_index()
+        return freed
+
+    def stats(self):
+        """Return {"blobs", "stored_bytes", "saved_bytes"} for the whole store."""
+        blobs = stored_bytes = saved_bytes = 0
+        for _, _, stat in self._blobs():
+            blobs += 1
+            stored_bytes += stat.st_size
+            # Un blob lié à n builds compte n + 1 liens ; sans déduplication il occuperait n copies
+            saved_bytes += max(0, stat.st_nlink - 2) * stat.st_size
+        return {"blobs": blobs, "stored_bytes": stored_bytes, "saved_bytes": saved_bytes}
+
+    def _import_file(self, path):
+        sha256 = hashlib.sha256()
+        crc = 0
+        with open(path, "rb") as file:
+            for data in iter(lambda: file.read(self.READ_SIZE), b""):
+                sha256.update(data)
+                crc = zlib.crc32(data, crc)
+        digest = sha256.hexdigest()
+        size = os.path.getsize(path)
+        blob_path = self._blob_path(digest)
+
+        with self._lock:
+            key = self._index_key(crc, size)
+            self._load_index()[key] = digest
+            self._added[key] = digest
+            if os.path.exists(blob_path):
+                self._link(blob_path, path)
+                return size, digest
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            try:
+                os.link(path, blob_path)
+            except OSError:
+                # Système de fichiers sans liens physiques : garder une copie dans le store
+                shutil.copy2(path, blob_path)
+        return 0, digest
+
+    def _blobs(self):
+        if not os.path.exists(self.objects_directory):
+            return
+        for prefix in os.listdir(self.objects_directory):
+            prefix_directory = os.path.join(self.objects_directory, prefix)
+            for digest in os.listdir(prefix_directory):
+                blob_path = os.path.join(prefix_directory, digest)
+                yield blob_path, digest, os.stat(blob_path)
+
+    @staticmethod
+    def _link(blob_path, target_path):
+        """Point target_path at blob_path: hardlink, else reflink, else a plain copy."""
+        temp_path = target_path + ".link"
+        try:
+            os.link(blob_path, temp_path)
+        except OSError:
+            if not BuildStore._reflink(blob_path, temp_path):
+                shutil.copy2(blob_path, temp_path)
+        os.replace(temp_path, target_path)
+
+    @staticmethod
+    def _reflink(source_path, target_path):
+        """Copy-on-write clone (Btrfs, XFS, ...) via the Linux FICLONE ioctl."""
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        FICLONE = 0x40049409
+        try:
+            with open(source_path, "rb") as source, open(target_path, "wb") as target:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return True
+        except OSError:
+            if os.path.exists(target_path):
+                os.remove(target_path)
+            return False
+
+    def _pinned(self):
+        pinned = set()
+        if os.path.isdir(self.pins_directory):
+            for file_name in os.listdir(self.pins_directory):
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.pins_directory, file_name), "r") as pin_file:
+                        pinned.update(json.load(pin_file))
+                except (OSError, ValueError) as e:
+                    # Dans le doute, ne rien collecter plutôt que de supprimer un blob épinglé
+                    raise OSError(f"Cannot read build store pin '{file_name}': {e}") from e
+        return pinned
+
+    def _pin_path(self, name):
+        return os.path.join(self.pins_directory, f"{name}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.objects_directory, digest[:2], digest)
+
+    @staticmethod
+    def _index_key(crc, size):
+        return f"{crc:08x}:{size}"
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Merge this instance's changes into index.json; the caller holds the lock."""
+        if not self._added and not self._removed:
+            return
+        # Relire le fichier : d'autres instances ont pu l'écrire depuis le chargement
+        index = self._read_index()
+        for key in [key for key, digest in index.items() if digest in self._removed]:
+            del index[key]
+        index.update(self._added)
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as index_file:
+            json.dump(index, index_file)
+        os.replace(temp_path, self.index_path)
+        self._index = index
+        self._added = {}
+        self._removed = set()
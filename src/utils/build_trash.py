@@ -0,0 +1,240 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from config import TRASH_GRACE_PERIOD
+from utils.build_index import BuildIndex
+from utils.build_store import BuildStore
+from utils.tracing import tracer
+
+
+class BuildTrash:
+    """Journaled delete and rename of build folders through ``builds/.trash``.
+
+    Deleting a build is a single rename into the trash, so it returns at once whatever
+    the size of the build; the files are removed later by reclaim(), once grace_period
+    seconds have passed, and restore() can bring the build back until then.
+
+    Every operation first writes a ``.trash/<id>.json`` record, then renames, then updates
+    the BuildIndex. recover() replays the records left behind by a crash: renames that
+    happened are committed to the index, the others are dropped, and half-purged trash
+    entries are finished off by the next reclaim.
+    """
+
+    TRASH_NAME = ".trash"
+    _lock = threading.Lock()
+
+    def __init__(self, directory="builds", grace_period=TRASH_GRACE_PERIOD):
+        self.directory = directory
+        self.path = os.path.join(directory, self.TRASH_NAME)
+        self.grace_period = grace_period
+        self.index = BuildIndex(directory)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def delete(self, name):
+        """Move a build into the trash and return the trash id used to restore it."""
+        build_path = os.path.join(self.directory, name)
+        if not os.path.isdir(build_path):
+            raise FileNotFoundError(f"Build '{name}' not found.")
+
+        trash_id = uuid.uuid4().hex
+        with self._lock:
+            record = {"op": "delete", "name": name, "state": "moving", "deleted_at": time.time()}
+            self._write_record(trash_id, record)
+            try:
+                os.rename(build_path, os.path.join(self.path, trash_id))
+            except OSError:
+                self._remove_record(trash_id)
+                raise
+            self.index.forget(name)
+            record["state"] = "trashed"
+            self._write_record(trash_id, record)
+        self._wake.set()
+        return trash_id
+
+    def restore(self, trash_id):
+        """Move a trashed build back to its folder. Returns its name.
+
+        Raises FileNotFoundError once the build has been reclaimed, and FileExistsError if
+        another build took its name in the meantime.
+        """
+        with self._lock:
+            record = self._read_record(trash_id)
+            if record is None or record.get("op") != "delete" or record["state"] != "trashed":
+                raise FileNotFoundError("This build has already been removed from the disk.")
+            build_path = os.path.join(self.directory, record["name"])
+            if os.path.exists(build_path):
+                raise FileExistsError(f"A build named '{record['name']}' already exists.")
+            os.rename(os.path.join(self.path, trash_id), build_path)
+            self._remove_record(trash_id)
+        return record["name"]
+
+    def rename(self, name, new_name):
+        """Rename a build folder and move its BuildIndex entry along with it."""
+        build_path = os.path.join(self.directory, name)
+        new_path = os.path.join(self.directory, new_name)
+        if not os.path.isdir(build_path):
+            raise FileNotFoundError(f"Build '{name}' not found.")
+        if os.path.exists(new_path):
+            raise FileExistsError(f"A build named '{new_name}' already exists.")
+
+        operation_id = uuid.uuid4().hex
+        with self._lock:
+            self._write_record(operation_id, {"op": "rename", "name": name, "new_name": new_name})
+            try:
+                os.rename(build_path, new_path)
+            except OSError:
+                self._remove_record(operation_id)
+                raise
+            self.index.rename(name, new_name)
+            self._remove_record(operation_id)
+
+    def entries(self):
+        """Return the trashed builds that can still be restored, oldest first."""
+        with self._lock:
+            records = self._records()
+        return sorted(
+            ({"id": trash_id, "name": record["name"], "deleted_at": record["deleted_at"]}
+             for trash_id, record in records.items()
+             if record.get("op") == "delete" and record["state"] == "trashed"),
+            key=lambda entry: entry["deleted_at"]
+        )
+
+    def recover(self):
+        """Finish or roll back the operations interrupted by a crash. Returns the records replayed."""
+        replayed = 0
+        with self._lock:
+            for operation_id, record in self._records().items():
+                if record.get("op") == "rename":
+                    # Le renommage a eu lieu si seul le nouveau dossier existe
+                    if os.path.isdir(os.path.join(self.directory, record["new_name"])) and \
+                            not os.path.exists(os.path.join(self.directory, record["name"])):
+                        self.index.rename(record["name"], record["new_name"])
+                    self._remove_record(operation_id)
+                    replayed += 1
+                elif record.get("op") == "delete" and record["state"] == "moving":
+                    if os.path.isdir(os.path.join(self.path, operation_id)):
+                        self.index.forget(record["name"])
+                        record["state"] = "trashed"
+                        self._write_record(operation_id, record)
+                    else:
+                        self._remove_record(operation_id)
+                    replayed += 1
+        return replayed
+
+    def reclaim(self, force=False):
+        """Remove from the disk the trashed builds whose grace period is over (all of them if force).
+
+        Also removes trash folders without a record and finishes purges interrupted by a
+        crash. Returns the number of builds removed.
+        """
+        now = time.time()
+        purged = []
+        with self._lock:
+            records = self._records()
+            for trash_id, record in records.items():
+                if record.get("op") != "delete" or record["state"] == "moving":
+                    continue
+                if record["state"] == "purging" or force or now - record["deleted_at"] >= self.grace_period:
+                    # Marqué avant la suppression : une build à moitié effacée ne peut plus être restaurée
+                    record["state"] = "purging"
+                    self._write_record(trash_id, record)
+                    purged.append(trash_id)
+            if os.path.isdir(self.path):
+                with os.scandir(self.path) as trash_entries:
+                    purged.extend(
+                        entry.name for entry in trash_entries
+                        if entry.is_dir() and entry.name not in records
+                    )
+        if not purged:
+            return 0
+
+        # Suppression hors du verrou : delete() et restore() restent instantanés pendant ce temps
+        with tracer.span("trash.reclaim", builds=len(purged)):
+            for trash_id in purged:
+                shutil.rmtree(os.path.join(self.path, trash_id), ignore_errors=True)
+                with self._lock:
+                    self._remove_record(trash_id)
+            freed = BuildStore(os.path.join(self.directory, ".store")).collect_garbage()
+        if freed:
+            print(f"Freed {freed} bytes of unreferenced build files.")
+        return len(purged)
+
+    def purge(self, trash_id):
+        """Remove one trashed build from the disk right away. Returns the bytes freed in the build store."""
+        with self._lock:
+            record = self._read_record(trash_id)
+            if record is None:
+                return 0
+            record["state"] = "purging"
+            self._write_record(trash_id, record)
+        shutil.rmtree(os.path.join(self.path, trash_id), ignore_errors=True)
+        with self._lock:
+            self._remove_record(trash_id)
+        return BuildStore(os.path.join(self.directory, ".store")).collect_garbage()
+
+    def start(self):
+        """Recover from a previous crash, then reclaim expired builds in the background."""
+        self._thread = threading.Thread(target=self._loop, name="trash-reclaimer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self):
+        try:
+            self.recover()
+        except Exception as e:
+            print(f"Error recovering interrupted build operations: {e}")
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.reclaim()
+            except Exception as e:
+                print(f"Error reclaiming deleted builds: {e}")
+            entries = self.entries()
+            # Dormir jusqu'à l'expiration de la plus ancienne build de la corbeille, ou jusqu'à la prochaine suppression
+            timeout = None
+            if entries:
+                timeout = max(0.0, entries[0]["deleted_at"] + self.grace_period - time.time()) + 0.1
+            self._wake.wait(timeout)
+
+    def _records(self):
+        records = {}
+        if not os.path.isdir(self.path):
+            return records
+        with os.scandir(self.path) as trash_entries:
+            for entry in trash_entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    record = self._read_record(entry.name[:-len(".json")])
+                    if record is not None:
+                        records[entry.name[:-len(".json")]] = record
+        return records
+
+    def _read_record(self, operation_id):
+        try:
+            with open(os.path.join(self.path, f"{operation_id}.json"), "r", encoding="utf-8") as record_file:
+                return json.load(record_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_record(self, operation_id, record):
+        os.makedirs(self.path, exist_ok=True)
+        record_path = os.path.join(self.path, f"{operation_id}.json")
+        with open(record_path + ".tmp", "w", encoding="utf-8") as record_file:
+            json.dump(record, record_file)
+            record_file.flush()
+            os.fsync(record_file.fileno())
+        os.replace(record_path + ".tmp", record_path)
+
+    def _remove_record(self, operation_id):
+        try:
+            os.remove(os.path.join(self.path, f"{operation_id}.json"))
+        except FileNotFoundError:
+            pass
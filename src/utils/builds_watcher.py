@@ -0,0 +1,165 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+
+class BuildsWatcher:
+    """Watch the builds directory and report folders that are added, removed, renamed or changed.
+
+    Uses inotify on Linux and falls back to polling the directory elsewhere. Events are
+    coalesced for ``DEBOUNCE`` seconds and delivered as one list to ``callback`` from the
+    watcher thread; each event is ("added", name), ("removed", name), ("changed", name)
+    or ("renamed", old_name, new_name). Hidden entries (".store", ...) are ignored.
+
+    "changed" means the attributes of the build folder itself changed (chmod, touch: inotify
+    IN_ATTRIB); files added or edited inside a build are not reported. Polling cannot tell
+    these apart from the mtime updates that any change inside the folder causes, so it only
+    reports "added", "removed" and "renamed".
+    """
+
+    POLL_INTERVAL = 2.0
+    DEBOUNCE = 0.3
+
+    # Constantes de <sys/inotify.h>
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory, callback):
+        self.directory = directory
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        inotify_fd = self._open_inotify()
+        target = self._run_inotify if inotify_fd is not None else self._run_polling
+        args = (inotify_fd,) if inotify_fd is not None else ()
+        self._thread = threading.Thread(target=target, args=args, name="builds-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, events):
+        if events:
+            try:
+                self.callback(events)
+            except Exception as e:
+                print(f"Error handling builds directory events: {e}")
+
+    # --- inotify (Linux) ---
+
+    def _open_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init()
+            if fd < 0:
+                return None
+            mask = self.IN_CREATE | self.IN_DELETE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_ATTRIB
+            if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _run_inotify(self, fd):
+        try:
+            pending = []
+            moved_from = {}
+            while not self._stop.is_set():
+                timeout = self.DEBOUNCE if pending or moved_from else 1.0
+                readable, _, _ = select.select([fd], [], [], timeout)
+                if not readable:
+                    # Un déplacement sans destination correspond à un dossier sorti de builds/
+                    pending.extend(("removed", name) for name in moved_from.values())
+                    moved_from.clear()
+                    self._emit(self._coalesce(pending))
+                    pending = []
+                    continue
+                data = os.read(fd, 64 * 1024)
+                offset = 0
+                while offset < len(data):
+                    _, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += self.EVENT_HEADER.size
+                    name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                    offset += length
+                    if not name or name.startswith("."):
+                        continue
+                    if mask & self.IN_MOVED_FROM and mask & self.IN_ISDIR:
+                        moved_from[cookie] = name
+                    elif mask & self.IN_MOVED_TO and mask & self.IN_ISDIR:
+                        old_name = moved_from.pop(cookie, None)
+                        pending.append(("renamed", old_name, name) if old_name else ("added", name))
+                    elif mask & self.IN_CREATE and mask & self.IN_ISDIR:
+                        pending.append(("added", name))
+                    elif mask & self.IN_DELETE and mask & self.IN_ISDIR:
+                        pending.append(("removed", name))
+                    elif mask & self.IN_ATTRIB and mask & self.IN_ISDIR:
+                        pending.append(("changed", name))
+        finally:
+            os.close(fd)
+
+    # --- Polling (Windows, macOS, inotify indisponible) ---
+
+    def _snapshot(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(".") and entry.is_dir():
+                        snapshot[entry.name] = entry.inode()
+        except OSError:
+            pass
+        return snapshot
+
+    def _run_polling(self):
+        previous = self._snapshot()
+        while not self._stop.wait(self.POLL_INTERVAL):
+            current = self._snapshot()
+            if current == previous:
+                continue
+            removed = {name: previous[name] for name in previous if name not in current}
+            added = {name: current[name] for name in current if name not in previous}
+            events = []
+            # Un dossier disparu dont l'inode réapparaît sous un autre nom a été renommé
+            removed_by_inode = {inode: name for name, inode in removed.items() if inode}
+            for name, inode in added.items():
+                old_name = removed_by_inode.pop(inode, None)
+                if old_name is not None:
+                    events.append(("renamed", old_name, name))
+                    del removed[old_name]
+                else:
+                    events.append(("added", name))
+            events.extend(("removed", name) for name in removed)
+            # Dossier remplacé sous le même nom entre deux parcours : comme inotify, supprimé puis ajouté
+            for name in current:
+                if name in previous and current[name] != previous[name]:
+                    events.extend((("removed", name), ("added", name)))
+            previous = current
+            self._emit(events)
+
+    @staticmethod
+    def _coalesce(events):
+        """Drop events made redundant by later ones (e.g. added then removed)."""
+        result = []
+        for event in events:
+            if event[0] == "removed" and ("added", event[1]) in result:
+                result.remove(("added", event[1]))
+                continue
+            if event not in result:
+                result.append(event)
+        return result
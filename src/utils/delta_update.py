@@ -0,0 +1,358 @@
+import bisect
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, as_completed, wait
+
+import requests
+
+from config import DELTA_MAX_RATIO, DELTA_MERGE_GAP
+from utils.downloader import Downloader
+from utils.http_client import get_session
+from utils.integrity import BuildManifest
+from utils.mirrors import get_mirrors
+from utils.zip_stream import safe_member_path
+
+
+class DeltaUnavailable(Exception):
+    """Raised when a release cannot be installed as a delta and needs a full install."""
+
+
+class RemoteZip:
+    """Seekable, read-only file over a zip served by an HTTP server that honours byte ranges.
+
+    Bytes are fetched on demand, and fetch() loads several ranges in parallel ahead of the
+    reads. Every range is streamed into a temporary spool file as it arrives, so memory
+    stays flat however much of the asset is fetched; a sorted index of the ranges maps
+    each read to its place in the spool. zipfile.ZipFile opens it like a local file:
+    reading the central directory costs one request for the end of the archive (two if it
+    is large). close() deletes the spool.
+    """
+
+    TAIL_SIZE = 64 * 1024
+    MIN_READ = 16 * 1024
+
+    def __init__(self, url, session, size, chunk_hook=None):
+        self.url = url
+        self.session = session
+        self.size = size
+        self.chunk_hook = chunk_hook
+        self.bytes_fetched = 0
+        self.requests = 0
+        self.transfer_seconds = 0.0
+        # Plages chargées, triées par début : (début, fin, position dans le spool)
+        self._segments = []
+        self._spool = tempfile.TemporaryFile()
+        self._spool_size = 0
+        self._position = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, url, session, chunk_hook=None):
+        probe = session.head(url, headers=Downloader.HEADERS, allow_redirects=True)
+        probe.raise_for_status()
+        size = int(probe.headers.get("content-length", 0))
+        if probe.headers.get("accept-ranges", "").lower() != "bytes" or not size:
+            raise DeltaUnavailable("The server does not accept range requests.")
+        remote = cls(probe.url, session, size, chunk_hook)
+        try:
+            # Le répertoire central est à la fin de l'archive
+            remote.fetch([(max(0, size - cls.TAIL_SIZE), size)])
+        except BaseException:
+            remote.close()
+            raise
+        return remote
+
+    def fetch(self, ranges, connections=1, progress_callback=None):
+        """Load the [start, end) ranges, over up to connections parallel requests.
+
+        progress_callback(fetched_bytes, total_bytes) is called from the calling thread.
+        """
+        total = sum(end - start for start, end in ranges)
+        fetched_before = self.bytes_fetched
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, connections)) as executor:
+            futures = [executor.submit(self._get, start, end) for start, end in ranges]
+            while True:
+                done, not_done = wait(futures, timeout=0.1, return_when=FIRST_EXCEPTION)
+                if progress_callback:
+                    progress_callback(self.bytes_fetched - fetched_before, total)
+                failed = [future for future in done if future.exception() is not None]
+                if failed:
+                    for future in not_done:
+                        future.cancel()
+                    raise failed[0].exception()
+                if not not_done:
+                    break
+        self.transfer_seconds += time.perf_counter() - start_time
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self._position = max(0, offset)
+        return self._position
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self.size, self._position + size)
+        if end <= self._position:
+            return b""
+        data = self._read_range(self._position, end)
+        self._position = end
+        return data
+
+    def close(self):
+        self._spool.close()
+
+    def _read_range(self, start, end):
+        with self._lock:
+            # Plages commençant au plus tard à start, de la plus proche à la plus lointaine : la
+            # première suffit presque toujours (seule la fin de l'archive chevauche d'autres plages)
+            index = bisect.bisect_right(self._segments, (start, float("inf"))) - 1
+            for segment_start, segment_end, spool_offset in (self._segments[i] for i in range(index, -1, -1)):
+                if end <= segment_end:
+                    self._spool.seek(spool_offset + start - segment_start)
+                    return self._spool.read(end - start)
+        # Lecture hors des plages préchargées (répertoire central volumineux...) : une requête de plus
+        start_time = time.perf_counter()
+        self._get(start, min(self.size, max(end, start + self.MIN_READ)))
+        self.transfer_seconds += time.perf_counter() - start_time
+        return self._read_range(start, end)
+
+    def _get(self, start, end):
+        response = self.session.get(self.url, headers=dict(Downloader.HEADERS, Range=f"bytes={start}-{end - 1}"),
+                                    stream=True)
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise DeltaUnavailable(f"Server ignored range request (HTTP {response.status_code}).")
+        # Place réservée dans le spool : les plages parallèles y sont écrites au fil de l'eau
+        with self._lock:
+            spool_offset = self._spool_size
+            self._spool_size += end - start
+        received = 0
+        for chunk in response.iter_content(chunk_size=Downloader.CHUNK_SIZE):
+            if received + len(chunk) > end - start:
+                raise requests.RequestException(f"Range {start}-{end - 1} is longer than requested.")
+            with self._lock:
+                self._spool.seek(spool_offset + received)
+                self._spool.write(chunk)
+                self.bytes_fetched += len(chunk)
+            received += len(chunk)
+            if self.chunk_hook:
+                self.chunk_hook(len(chunk))
+        if received != end - start:
+            raise requests.RequestException(f"Incomplete range {start}-{end - 1}: got {received} bytes.")
+        with self._lock:
+            self.requests += 1
+            bisect.insort(self._segments, (start, end, spool_offset))
+
+
+class DeltaUpdater:
+    """Assemble a new release from an installed build and the zip members that changed.
+
+    plan() reads the asset's central directory with range requests and compares the CRC32
+    and size of every member with the files of the base build. apply() then links (or
+    copies) the unchanged files from the base build and downloads only the local headers
+    and data of the changed members, merging members closer than merge_gap bytes into one
+    request. Each downloaded member is checked against the CRC32 of the central directory.
+
+    When more than max_ratio of the asset would have to be downloaded, plan() raises
+    DeltaUnavailable: a full install is then about as fast and streams to disk instead.
+    """
+
+    def __init__(self, download_url, base_path, connections=4, session=None, chunk_hook=None,
+                 max_ratio=DELTA_MAX_RATIO, merge_gap=DELTA_MERGE_GAP, workers=None):
+        self.download_url = download_url
+        self.base_path = base_path
+        self.connections = connections
+        self.session = session or get_session()
+        self.chunk_hook = chunk_hook
+        self.max_ratio = max_ratio
+        self.merge_gap = merge_gap
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.remote = None
+        self.members = []
+        self.reused = {}
+        self.changed = []
+        self.ranges = []
+        self._started_at = None
+
+    def plan(self):
+        """Read the remote central directory and sort the members into reused and changed."""
+        self._started_at = time.perf_counter()
+        self.remote = self._open()
+        try:
+            self._plan()
+        except BaseException:
+            self.remote.close()
+            raise
+
+    def _plan(self):
+        with zipfile.ZipFile(self.remote) as zip_ref:
+            self.members = zip_ref.infolist()
+            directory_offset = zip_ref.start_dir
+        files = [member for member in self.members if not member.is_dir()]
+        if any(member.flag_bits & 0x1 for member in files):
+            raise DeltaUnavailable("The archive has encrypted members.")
+
+        by_name, by_key = self._local_index({member.file_size for member in files})
+        for member in files:
+            key = (member.CRC, member.file_size)
+            # Même chemin de préférence, sinon n'importe quel fichier identique (déplacé ou renommé)
+            if by_name.get(member.filename) == key:
+                self.reused[member.filename] = os.path.join(self.base_path, *member.filename.split("/"))
+            elif key in by_key:
+                self.reused[member.filename] = by_key[key]
+            else:
+                self.changed.append(member)
+
+        # Plage d'un membre : de son en-tête local jusqu'à l'en-tête suivant (descripteur de données compris)
+        offsets = sorted(member.header_offset for member in self.members) + [directory_offset]
+        next_offset = dict(zip(offsets, offsets[1:]))
+        spans = sorted((member.header_offset, next_offset[member.header_offset]) for member in self.changed)
+        for start, end in spans:
+            if self.ranges and start - self.ranges[-1][1] <= self.merge_gap:
+                self.ranges[-1] = (self.ranges[-1][0], max(end, self.ranges[-1][1]))
+            else:
+                self.ranges.append((start, end))
+
+        changed_bytes = sum(end - start for start, end in self.ranges)
+        if changed_bytes > self.max_ratio * self.remote.size:
+            raise DeltaUnavailable(f"{changed_bytes * 100 // self.remote.size}% of the archive changed.")
+
+    def apply(self, destination, link=True, progress_callback=None):
+        """Write the new build into destination. Returns the SHA-256 already known for reused files.
+
+        Reused files are hardlinked from the base build when link is true (falling back to a
+        copy across filesystems), copied otherwise. progress_callback(done, total, stage) is
+        called from the calling thread with stage "download" (bytes) or "extract" (members).
+        The downloaded ranges are deleted once the build is written.
+        """
+        try:
+            return self._apply(destination, link, progress_callback)
+        finally:
+            self.remote.close()
+
+    def _apply(self, destination, link, progress_callback):
+        for member in self.members:
+            if member.is_dir():
+                os.makedirs(safe_member_path(destination, member.filename), exist_ok=True)
+
+        known = self._known_digests()
+        digests = {}
+        for name, source_path in self.reused.items():
+            target_path = safe_member_path(destination, name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            if link:
+                try:
+                    os.link(source_path, target_path)
+                except OSError:
+                    shutil.copy2(source_path, target_path)
+            else:
+                shutil.copy2(source_path, target_path)
+            digest = known.get(os.path.normpath(source_path))
+            if digest is not None:
+                digests[os.path.normpath(target_path)] = digest
+
+        self.remote.fetch(self.ranges, self.connections,
+                          (lambda done, total: progress_callback(done, total, "download")) if progress_callback else None)
+
+        def extract(zip_ref, member):
+            target_path = safe_member_path(destination, member.filename)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            # ZipExtFile vérifie le CRC32 du membre en fin de lecture (BadZipFile s'il diffère)
+            with zip_ref.open(member) as source, open(target_path, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+
+        with zipfile.ZipFile(self.remote) as zip_ref, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(extract, zip_ref, member) for member in self.changed]
+            for extracted, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if progress_callback:
+                    progress_callback(extracted, len(futures), "extract")
+        return digests
+
+    def report(self):
+        """Bytes and time of the update, against a full download of the asset."""
+        seconds = time.perf_counter() - self._started_at
+        throughput = self.remote.bytes_fetched / self.remote.transfer_seconds if self.remote.transfer_seconds else 0
+        return {
+            "delta": True,
+            "files": len(self.reused) + len(self.changed),
+            "reused_files": len(self.reused),
+            "downloaded_files": len(self.changed),
+            "bytes_downloaded": self.remote.bytes_fetched,
+            "full_bytes": self.remote.size,
+            "requests": self.remote.requests,
+            "seconds": seconds,
+            # Durée du seul téléchargement complet au débit mesuré pendant la mise à jour
+            "full_download_seconds": self.remote.size / throughput if throughput else None
+        }
+
+    def _open(self):
+        """Open the asset on the first mirror that serves it, else on GitHub."""
+        mirrors = get_mirrors()
+        for mirror, mirror_url in mirrors.asset_candidates(self.download_url):
+            try:
+                return RemoteZip.open(mirror_url, mirrors.session, self.chunk_hook)
+            except (requests.RequestException, DeltaUnavailable) as e:
+                if isinstance(e, requests.ConnectionError):
+                    mirrors.mark_failed(mirror)
+                print(f"Mirror {mirror} unavailable, falling back: {e}")
+        return RemoteZip.open(self.download_url, self.session, self.chunk_hook)
+
+    def _local_index(self, sizes):
+        """Return ({relative path: (crc, size)}, {(crc, size): path}) for the base files of a wanted size.
+
+        Only files whose size matches a remote member are read, on several threads.
+        """
+        paths = []
+        for current_directory, _, file_names in os.walk(self.base_path):
+            for file_name in file_names:
+                path = os.path.join(current_directory, file_name)
+                relative_path = os.path.relpath(path, self.base_path).replace(os.sep, "/")
+                if relative_path not in BuildManifest.IGNORED and os.path.getsize(path) in sizes:
+                    paths.append((relative_path, path))
+
+        def crc_of(item):
+            crc = 0
+            with open(item[1], "rb") as file:
+                for data in iter(lambda: file.read(1024 * 1024), b""):
+                    crc = zlib.crc32(data, crc)
+            return item, (crc, os.path.getsize(item[1]))
+
+        by_name = {}
+        by_key = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for (relative_path, path), key in executor.map(crc_of, paths):
+                by_name[relative_path] = key
+                by_key.setdefault(key, path)
+        return by_name, by_key
+
+    def _known_digests(self):
+        """SHA-256 of the base files from its BuildManifest, for the files unchanged since it was written."""
+        files = BuildManifest.load(self.base_path) or {}
+        known = {}
+        for relative_path, entry in files.items():
+            path = os.path.join(self.base_path, *relative_path.split("/"))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                known[os.path.normpath(path)] = entry["sha256"]
+        return known
@@ -0,0 +1,368 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+
+import requests
+
+from utils.http_client import get_session
+from utils.mirrors import get_mirrors
+from utils.tracing import tracer
+
+
+class Downloader:
+    """Download large files over several parallel HTTP range requests.
+
+    Data is written to ``<destination>.part`` and progress is journaled in
+    ``<destination>.part.json`` so an interrupted download resumes where it stopped.
+    Servers that do not advertise ``Accept-Ranges: bytes`` get a plain single stream.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    # Pas de gzip sur les archives : les tailles et les plages d'octets doivent correspondre au fichier
+    HEADERS = {"Accept-Encoding": "identity"}
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+    JOURNAL_INTERVAL = 1.0
+    SEGMENT_RETRIES = 3
+
+    def __init__(self, connections=4, session=None, chunk_hook=None):
+        """chunk_hook(byte_count), if given, is called from the transfer threads after every
+        chunk; it may block (pause, bandwidth cap) or raise to abort the download."""
+        self.connections = max(1, connections)
+        self.chunk_hook = chunk_hook
+        self.session = session or get_session()
+
+    def download(self, url, destination, progress_callback=None):
+        """Download url to destination and return the file's SHA-256 hex digest.
+
+        progress_callback(downloaded_bytes, total_bytes) is always called from the calling
+        thread; total_bytes is 0 when the server does not send a length.
+        Mirrors of the MirrorList are tried first, fastest first; GitHub is the last resort.
+        """
+        mirrors = get_mirrors()
+        with tracer.span("download", file=os.path.basename(destination)) as span:
+            for mirror, mirror_url in mirrors.asset_candidates(url):
+                try:
+                    digest = self._download(mirror_url, destination, progress_callback, mirrors.session, span)
+                    span.set(mirror=mirror)
+                    return digest
+                except requests.RequestException as e:
+                    # Un 503 signifie seulement que le miroir n'a pas encore l'asset (il le récupère)
+                    if not isinstance(e, requests.HTTPError):
+                        mirrors.mark_failed(mirror)
+                    print(f"Mirror {mirror} unavailable, falling back: {e}")
+            return self._download(url, destination, progress_callback, self.session, span)
+
+    def open_stream(self, url):
+        """Start a streamed GET of url, from the first mirror that has it or else from GitHub."""
+        mirrors = get_mirrors()
+        for mirror, mirror_url in mirrors.asset_candidates(url):
+            try:
+                response = mirrors.session.get(mirror_url, headers=self.HEADERS, stream=True)
+                response.raise_for_status()
+                return response
+            except requests.RequestException as e:
+                if not isinstance(e, requests.HTTPError):
+                    mirrors.mark_failed(mirror)
+                print(f"Mirror {mirror} unavailable, falling back: {e}")
+        response = self.session.get(url, headers=self.HEADERS, stream=True)
+        response.raise_for_status()
+        return response
+
+    def stream(self, url):
+        """Start a streamed GET of url (see open_stream). Returns (total_bytes, chunks).
+
+        chunks yields the body. When the connection drops, the transfer goes on from the
+        bytes already yielded with a range request, up to SEGMENT_RETRIES times in a row;
+        a server that does not accept ranges, or whose file changed in the meantime (the
+        ETag or Last-Modified is sent as If-Range), makes it raise ConnectionError instead.
+        """
+        response = self.open_stream(url)
+        total_size = int(response.headers.get("content-length", 0))
+        accepts_ranges = response.headers.get("accept-ranges", "").lower() == "bytes"
+        validator = response.headers.get("etag") or response.headers.get("last-modified")
+        # Les redirections sont suivies une fois pour toutes (miroir, URL signée de GitHub)
+        stream_url = response.url
+
+        def chunks():
+            current = response
+            position = 0
+            failures = 0
+            while True:
+                try:
+                    if current is None:
+                        headers = dict(self.HEADERS, Range=f"bytes={position}-")
+                        if validator:
+                            headers["If-Range"] = validator
+                        current = self.session.get(stream_url, headers=headers, stream=True)
+                        current.raise_for_status()
+                        if current.status_code != 206:
+                            current.close()
+                            raise ConnectionError(f"The download of {os.path.basename(url)} was interrupted "
+                                                  f"and cannot resume (HTTP {current.status_code}).")
+                    for chunk in current.iter_content(chunk_size=self.CHUNK_SIZE):
+                        position += len(chunk)
+                        failures = 0
+                        yield chunk
+                    if total_size and position < total_size:
+                        raise requests.ConnectionError(f"Connection closed after {position} of {total_size} bytes.")
+                    return
+                except requests.RequestException as e:
+                    current = None
+                    failures += 1
+                    if not accepts_ranges or failures > self.SEGMENT_RETRIES:
+                        raise
+                    print(f"Download interrupted after {position} bytes, resuming: {e}")
+                    time.sleep(2 ** (failures - 1))
+
+        return total_size, chunks()
+
+    def _download(self, url, destination, progress_callback, session, span):
+        url, total_size, accepts_ranges, validator = self._probe(url, session)
+
+        if not accepts_ranges or total_size < self.MIN_SEGMENT_SIZE or self.connections == 1:
+            span.set(ranged=False)
+            digest = self._download_single(url, destination, progress_callback, session)
+        else:
+            span.set(ranged=True)
+            digest = self._download_ranged(url, destination, total_size, validator, progress_callback, session)
+        span.add_bytes(os.path.getsize(destination))
+        return digest
+
+    def _probe(self, url, session):
+        """Return (final url, size, accepts ranges, ETag or Last-Modified) of url.
+
+        Asks with HEAD, or, when the server rejects HEAD (some CDNs answer 403 or 405), with
+        a GET of the first byte: a 206 answer gives the size in Content-Range and proves
+        that ranges work, a 200 answer means a plain single stream.
+        """
+        try:
+            probe = session.head(url, headers=self.HEADERS, allow_redirects=True)
+            probe.raise_for_status()
+            return (probe.url, int(probe.headers.get("content-length", 0)),
+                    probe.headers.get("accept-ranges", "").lower() == "bytes",
+                    probe.headers.get("etag") or probe.headers.get("last-modified"))
+        except requests.HTTPError as e:
+            print(f"HEAD request rejected, probing with a ranged GET: {e}")
+
+        probe = session.get(url, headers=dict(self.HEADERS, Range="bytes=0-0"), stream=True)
+        try:
+            probe.raise_for_status()
+            validator = probe.headers.get("etag") or probe.headers.get("last-modified")
+            if probe.status_code == 206:
+                # Content-Range: bytes 0-0/<taille>
+                total = probe.headers.get("content-range", "").rpartition("/")[2]
+                return probe.url, int(total) if total.isdigit() else 0, total.isdigit(), validator
+            return probe.url, int(probe.headers.get("content-length", 0)), False, validator
+        finally:
+            probe.close()
+
+    def _download_single(self, url, destination, progress_callback, session):
+        part_path = destination + ".part"
+        response = session.get(url, headers=self.HEADERS, stream=True)
+        response.raise_for_status()
+        total_size = int(response.headers.get("content-length", 0))
+        downloaded_size = 0
+        sha256 = hashlib.sha256()
+
+        with open(part_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                file.write(chunk)
+                sha256.update(chunk)
+                downloaded_size += len(chunk)
+                if self.chunk_hook:
+                    self.chunk_hook(len(chunk))
+                if progress_callback:
+                    progress_callback(downloaded_size, total_size)
+
+        os.replace(part_path, destination)
+        self._remove_journal(destination)
+        return sha256.hexdigest()
+
+    def _download_ranged(self, url, destination, total_size, validator, progress_callback, session):
+        """Download url in parallel segments and return the file's SHA-256 hex digest.
+
+        The digest follows the contiguous prefix of the file: bytes are hashed as soon as
+        every byte before them has arrived, read back from the page cache right after
+        their segment wrote them, so the finished file is never read a second time.
+        """
+        part_path = destination + ".part"
+        journal = self._load_journal(destination)
+        if (journal is None or journal.get("size") != total_size or journal.get("validator") != validator
+                or not os.path.exists(part_path)):
+            journal = {
+                "url": url,
+                "size": total_size,
+                "validator": validator,
+                "segments": self._split(total_size)
+            }
+            # Préallouer le fichier pour que chaque segment puisse écrire à sa place
+            with open(part_path, "wb") as file:
+                file.truncate(total_size)
+            self._save_journal(destination, journal)
+
+        lock = threading.Lock()
+        # Levé à la première erreur : les segments encore en cours s'arrêtent au morceau suivant
+        abort = threading.Event()
+        pending = [segment for segment in journal["segments"] if segment[0] + segment[2] <= segment[1]]
+        sha256 = hashlib.sha256()
+        hashed = 0
+
+        def hash_prefix(hash_file):
+            nonlocal hashed
+            with lock:
+                prefix_end = 0
+                for start, end, downloaded in journal["segments"]:
+                    prefix_end = start + downloaded
+                    if prefix_end <= end:
+                        break
+            hash_file.seek(hashed)
+            while hashed < prefix_end:
+                data = hash_file.read(min(self.CHUNK_SIZE * 16, prefix_end - hashed))
+                if not data:
+                    raise OSError(f"{part_path} is shorter than its journal.")
+                sha256.update(data)
+                hashed += len(data)
+
+        def fetch_segment(segment):
+            for attempt in range(self.SEGMENT_RETRIES):
+                try:
+                    self._fetch_range(url, part_path, segment, total_size, validator, lock, session, abort)
+                    return
+                except requests.RequestException:
+                    if attempt == self.SEGMENT_RETRIES - 1 or abort.is_set():
+                        raise
+                    if abort.wait(2 ** attempt):
+                        return
+
+        executor = ThreadPoolExecutor(max_workers=self.connections)
+        futures = []
+        # Sans tampon : une lecture anticipée garderait les zéros d'une zone pas encore écrite
+        hash_file = open(part_path, "rb", buffering=0)
+        try:
+            futures = [executor.submit(fetch_segment, segment) for segment in pending]
+            last_journal_save = time.monotonic()
+            while True:
+                done, not_done = wait(futures, timeout=0.1, return_when=FIRST_EXCEPTION)
+                with lock:
+                    downloaded_size = sum(segment[2] for segment in journal["segments"])
+                    if time.monotonic() - last_journal_save >= self.JOURNAL_INTERVAL:
+                        self._save_journal(destination, journal)
+                        last_journal_save = time.monotonic()
+                if progress_callback:
+                    progress_callback(downloaded_size, total_size)
+                hash_prefix(hash_file)
+
+                failed = [future for future in done if future.exception() is not None]
+                if failed:
+                    raise failed[0].exception()
+                if not not_done:
+                    break
+        except BaseException:
+            abort.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            hash_file.close()
+            # Les octets reçus avant l'arrêt sont journalisés : la reprise repart de là
+            with lock:
+                self._save_journal(destination, journal)
+            raise
+        executor.shutdown(wait=True)
+        with hash_file:
+            hash_prefix(hash_file)
+
+        # Un trou resté à zéro dans le fichier préalloué ne doit jamais devenir l'asset final
+        incomplete = [segment for segment in journal["segments"] if segment[0] + segment[2] != segment[1] + 1]
+        if incomplete:
+            self._save_journal(destination, journal)
+            raise requests.RequestException(f"Download of {os.path.basename(destination)} is incomplete: "
+                                            f"{len(incomplete)} segment(s) short.")
+        os.replace(part_path, destination)
+        self._remove_journal(destination)
+        return sha256.hexdigest()
+
+    def _fetch_range(self, url, part_path, segment, total_size, validator, lock, session, abort):
+        start, end, _ = segment
+        # Écriture non bufferisée : les octets comptés dans le journal sont déjà transmis au système
+        with open(part_path, "r+b", buffering=0) as file:
+            # Une réponse 206 peut contenir moins d'octets que demandé : le reste est redemandé
+            while start + segment[2] <= end:
+                position = start + segment[2]
+                headers = dict(self.HEADERS, Range=f"bytes={position}-{end}")
+                if validator:
+                    # Un asset remplacé depuis _probe répond 200 : jamais de fichier fait de deux versions
+                    headers["If-Range"] = validator
+                response = session.get(url, headers=headers, stream=True)
+                with response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise requests.RequestException(f"Server ignored range request or the file changed "
+                                                        f"(HTTP {response.status_code}).")
+                    first, last = self._content_range(response, total_size)
+                    if first != position or last > end:
+                        raise requests.RequestException(f"Server sent bytes {first}-{last} "
+                                                        f"for range {position}-{end}.")
+                    file.seek(position)
+                    expected = last - first + 1
+                    received = 0
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        if abort.is_set():
+                            return
+                        chunk = chunk[:expected - received]
+                        file.write(chunk)
+                        received += len(chunk)
+                        with lock:
+                            segment[2] += len(chunk)
+                        if self.chunk_hook:
+                            self.chunk_hook(len(chunk))
+                        if received == expected:
+                            break
+                    if received < expected:
+                        raise requests.ConnectionError(f"Connection closed after {received} of {expected} bytes.")
+
+    @staticmethod
+    def _content_range(response, total_size):
+        """Return (first, last) of the 'Content-Range: bytes first-last/total' header of response."""
+        unit, _, byte_range = response.headers.get("content-range", "").partition(" ")
+        span, _, total = byte_range.partition("/")
+        first, _, last = span.partition("-")
+        if unit != "bytes" or not first.isdigit() or not last.isdigit() or int(last) < int(first):
+            raise requests.RequestException(f"Invalid Content-Range: {response.headers.get('content-range')!r}")
+        if total != "*" and total != str(total_size):
+            raise requests.RequestException(f"File size changed on the server ({total} instead of {total_size} bytes).")
+        return int(first), int(last)
+
+    def _split(self, total_size):
+        """Cut [0, total_size) into [start, end, downloaded] segments, end inclusive."""
+        count = min(self.connections, max(1, total_size // self.MIN_SEGMENT_SIZE))
+        segment_size = total_size // count
+        segments = []
+        for index in range(count):
+            start = index * segment_size
+            end = total_size - 1 if index == count - 1 else start + segment_size - 1
+            segments.append([start, end, 0])
+        return segments
+
+    @staticmethod
+    def _journal_path(destination):
+        return destination + ".part.json"
+
+    def _load_journal(self, destination):
+        try:
+            with open(self._journal_path(destination), "r") as journal_file:
+                return json.load(journal_file)
+        except (OSError, ValueError):
+            return None
+
+    def _save_journal(self, destination, journal):
+        temp_path = self._journal_path(destination) + ".tmp"
+        with open(temp_path, "w") as journal_file:
+            json.dump(journal, journal_file)
+        os.replace(temp_path, self._journal_path(destination))
+
+    def _remove_journal(self, destination):
+        if os.path.exists(self._journal_path(destination)):
+            os.remove(self._journal_path(destination))
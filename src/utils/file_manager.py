@@ -1,5 +1,10 @@
-import requests
 import os
+from config import USER_DATA_PATHS, USER_DATA_LINKED_PATHS
+from utils.build_archive import BuildArchive
+from utils.build_index import BuildIndex
+from utils.build_trash import BuildTrash
+from utils.integrity import BuildManifest
+from utils.tree_sync import TreeSync
 
 class FileManager:
     @staticmethod
@@ -7,31 +12,105 @@ class FileManager:
         """List all versions in the given directory."""
         if not os.path.exists(directory):
             return []
-        return [f for f in os.listdir(directory) if os.path.isdir(os.path.join(directory, f))]
+        return [entry["name"] for entry in BuildIndex(directory).scan()]
+
+    @staticmethod
+    def read_build_variables(version_path):
+        """Read game_version and renderer from a build's launcher_variables file."""
+        variables = {"game_version": "Unknown", "renderer": "Unknown"}
+        variables_file_path = os.path.join(version_path, "launcher_variables")
+        if os.path.exists(variables_file_path):
+            with open(variables_file_path, "r") as variables_file:
+                for line in variables_file:
+                    key, value = line.strip().split("=", 1)
+                    if key in variables:
+                        variables[key] = value
+        return variables
+
+    @staticmethod
+    def scan_builds(directory="builds"):
+        """Return (folder_name, game_version, renderer) for every build folder in the directory.
+
+        Backed by the BuildIndex manifest, so only folders changed since the last scan are
+        read. Only touches the disk, so it is safe to call from a worker thread.
+        """
+        return [
+            (entry["name"], entry["game_version"], entry["renderer"])
+            for entry in BuildIndex(directory).scan()
+        ]
+
+    @staticmethod
+    def scan_archived(directory="builds"):
+        """Return (name, game_version, renderer) for every archived build, read from the pack headers."""
+        return [
+            (header["name"], header["game_version"], header["renderer"])
+            for header in BuildArchive(directory).list()
+        ]
 
     @staticmethod
     def delete_version(directory="versions", version_name=""):
-        """Delete a specific version."""
-        version_path = os.path.join(directory, version_name)
-        if os.path.exists(version_path):
-            os.rmdir(version_path)
-            return True
-        return False
+        """Delete a specific version right away, then drop the store blobs no other version links to.
+
+        Goes through the BuildTrash journal so an interrupted delete is finished at the next start.
+        """
+        if not os.path.isdir(os.path.join(directory, version_name)):
+            archive = BuildArchive(directory)
+            if archive.exists(version_name):
+                archive.delete(version_name)
+                return True
+            return False
+        trash = BuildTrash(directory)
+        freed = trash.purge(trash.delete(version_name))
+        if freed:
+            print(f"Freed {freed} bytes of unreferenced build files.")
+        return True
+
+    @staticmethod
+    def rename_version(directory="versions", version_name="", new_name=""):
+        """Rename a version folder, keeping its BuildIndex entry consistent."""
+        BuildTrash(directory).rename(version_name, new_name)
+
+    @staticmethod
+    def migrate_user_data(directory="builds", source_name="", target_name=""):
+        """Bring the user data (USER_DATA_PATHS) of one build over to another. Returns the TreeSync statistics.
+
+        Files that came with either build's release (listed in its BuildManifest) are left
+        out, so the target keeps its own game files and built-in mods. Only new or changed
+        files are transferred, by reflink when the filesystem supports it; files under
+        USER_DATA_LINKED_PATHS may be hardlinked instead of copied.
+        """
+        source_path = os.path.join(directory, source_name)
+        target_path = os.path.join(directory, target_name)
+        for name, path in ((source_name, source_path), (target_name, target_path)):
+            if not os.path.isdir(path):
+                raise FileNotFoundError(f"Build '{name}' not found.")
+
+        shipped = set(BuildManifest.load(source_path) or {}) | set(BuildManifest.load(target_path) or {})
+        stats = TreeSync().sync(
+            source_path, target_path, USER_DATA_PATHS,
+            exclude=lambda relative_path: relative_path in shipped,
+            link=lambda relative_path: relative_path.split("/")[0] in USER_DATA_LINKED_PATHS,
+            label="migrate"
+        )
+        print(f"Migrated user data from '{source_name}' to '{target_name}' in {stats['seconds']:.2f} s: "
+              f"{stats['files']} files, {stats['bytes_copied']} bytes copied, {stats['bytes_shared']} bytes shared, "
+              f"{stats['unchanged']} files already up to date.")
+        return stats
 
     @staticmethod
     def download_version(download_url, version_name, directory="versions"):
         """Download a version from the given URL and save it in the directory."""
+        # Imported here so listing builds does not pull in requests
+        import requests
+        from utils.downloader import Downloader
+
         try:
             if not os.path.exists(directory):
                 os.makedirs(directory)
 
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()  # Raise an error for HTTP issues
-
+            # Parallel ranged download, resumed from the .part journal if a previous attempt was interrupted
             version_path = os.path.join(directory, version_name)
-            with open(version_path, "wb") as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
+            Downloader().download(download_url, version_path)
 
             return True
         except requests.RequestException as e:
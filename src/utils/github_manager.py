@@ -1,22 +1,79 @@
 import requests
+from utils.http_client import get_session
+from utils.mirrors import get_mirrors
+from utils.release_cache import ReleaseCache
 
 class GitHubManager:
     REPO_URL = "https://api.github.com/repos/coop-deluxe/sm64coopdx/releases"
+    LATEST_URL = REPO_URL + "/latest"
+
+    cache = ReleaseCache()
 
     @staticmethod
-    def get_releases():
-        """Fetch the list of releases from the GitHub repository."""
+    def fetch_json(url, max_age=None):
+        """Fetch a GitHub API URL through the release cache.
+
+        Fresh cache entries are returned without touching the network, stale ones are
+        revalidated with a conditional request, and the cached copy is served when
+        GitHub cannot be reached. Raises requests.RequestException if nothing is cached.
+        LAN mirrors, when configured, are asked before GitHub.
+        """
+        cache = GitHubManager.cache
+        entry = cache.get(url)
+        if entry is not None and cache.is_fresh(entry, max_age):
+            return entry["data"]
+
+        data = GitHubManager._fetch_from_mirrors(url)
+        if data is not None:
+            # Sans validateurs : un ETag de miroir ne vaut rien pour une requête conditionnelle à GitHub
+            cache.store(url, data)
+            return data
+
+        headers = cache.conditional_headers(entry) if entry is not None else {}
         try:
-            response = requests.get(GitHubManager.REPO_URL)
+            response = get_session().get(url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                cache.touch(url)
+                return entry["data"]
             response.raise_for_status()  # Raise an error for HTTP issues
-            releases = response.json()
+            data = response.json()
+            cache.store(url, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return data
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            print(f"Using cached data for {url}: {e}")
+            return entry["data"]
+
+    @staticmethod
+    def _fetch_from_mirrors(url):
+        """Return the response of the first LAN mirror that serves url, or None."""
+        mirrors = get_mirrors()
+        for mirror, mirror_url in mirrors.catalog_candidates(url):
+            try:
+                response = mirrors.session.get(mirror_url)
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError) as e:
+                if not isinstance(e, requests.HTTPError):
+                    mirrors.mark_failed(mirror)
+                print(f"Mirror {mirror} unavailable, falling back: {e}")
+        return None
+
+    @staticmethod
+    def get_releases(max_age=None):
+        """Fetch the list of releases from the GitHub repository."""
+        try:
+            releases = GitHubManager.fetch_json(GitHubManager.REPO_URL, max_age)
             return [
                 {
                     "name": release["name"],
                     "assets": [
                         {
                             "name": asset["name"],
-                            "browser_download_url": asset["browser_download_url"]
+                            "browser_download_url": asset["browser_download_url"],
+                            # "sha256:<hex>", absent pour les assets publiés avant que GitHub ne le calcule
+                            "digest": asset.get("digest")
                         }
                         for asset in release["assets"]
                     ]
@@ -25,4 +82,36 @@ class GitHubManager:
             ]
         except requests.RequestException as e:
             print(f"Error fetching releases: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def get_asset_digest(download_url):
+        """Return the digest of an asset as recorded in the cached release catalog, or None.
+
+        Only looks at the cache, so it never waits on the network.
+        """
+        asset = GitHubManager.find_asset(download_url)
+        return asset.get("digest") if asset is not None else None
+
+    @staticmethod
+    def find_asset(download_url):
+        """Return the asset of the cached release catalog downloaded from download_url, or None."""
+        for url in (GitHubManager.REPO_URL, GitHubManager.LATEST_URL):
+            entry = GitHubManager.cache.get(url)
+            if entry is None:
+                continue
+            releases = entry["data"] if isinstance(entry["data"], list) else [entry["data"]]
+            for release in releases:
+                for asset in release.get("assets", []):
+                    if asset.get("browser_download_url") == download_url:
+                        return asset
+        return None
+
+    @staticmethod
+    def get_latest_release(max_age=None):
+        """Fetch the latest release, or None if it cannot be retrieved."""
+        try:
+            return GitHubManager.fetch_json(GitHubManager.LATEST_URL, max_age)
+        except requests.RequestException as e:
+            print(f"Error fetching latest release: {e}")
+            return None
@@ -0,0 +1,228 @@
+import collections
+import email.utils
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.tracing import tracer
+from config import (HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_MAX_RETRY_WAIT,
+                    HTTP_GZIP)
+
+
+class HttpMetrics:
+    """Latency and connection reuse of the requests made through an HttpSession.
+
+    Latencies are kept per endpoint (host and path, without the query string) in a
+    bounded window, and measured up to the response headers, so streamed downloads
+    count their time to first byte.
+    """
+
+    WINDOW = 200
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = collections.defaultdict(lambda: collections.deque(maxlen=self.WINDOW))
+        self._counts = collections.Counter()
+        self._errors = collections.Counter()
+        self.requests = 0
+        self.new_connections = 0
+        self.retries = 0
+
+    def record(self, endpoint, latency, error=False):
+        with self._lock:
+            self.requests += 1
+            self._counts[endpoint] += 1
+            if error:
+                self._errors[endpoint] += 1
+            else:
+                self._latencies[endpoint].append(latency)
+
+    def record_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    @property
+    def reuse_rate(self):
+        """Share of requests served on an already open (keep-alive) connection."""
+        with self._lock:
+            if not self.requests:
+                return 0.0
+            return max(0.0, 1 - self.new_connections / self.requests)
+
+    def snapshot(self):
+        """Return {"requests", "new_connections", "reuse_rate", "retries", "endpoints": {endpoint: stats}}."""
+        reuse_rate = self.reuse_rate
+        with self._lock:
+            endpoints = {}
+            for endpoint, count in self._counts.items():
+                latencies = sorted(self._latencies[endpoint])
+                endpoints[endpoint] = {
+                    "count": count,
+                    "errors": self._errors[endpoint],
+                    "p50_ms": self._percentile(latencies, 0.50) * 1000,
+                    "p95_ms": self._percentile(latencies, 0.95) * 1000
+                }
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reuse_rate": reuse_rate,
+                "retries": self.retries,
+                "endpoints": endpoints
+            }
+
+    def summary(self):
+        """Human-readable version of snapshot()."""
+        snapshot = self.snapshot()
+        lines = [
+            f"HTTP requests: {snapshot['requests']}, new connections: {snapshot['new_connections']}, "
+            f"reuse rate: {snapshot['reuse_rate']:.0%}, retries: {snapshot['retries']}"
+        ]
+        for endpoint, stats in sorted(snapshot["endpoints"].items()):
+            lines.append(f"  {endpoint}: {stats['count']} calls, {stats['errors']} errors, "
+                         f"p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _percentile(values, fraction):
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection to HttpMetrics."""
+
+    def __init__(self, metrics, **kwargs):
+        self._metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        metrics = self._metrics
+
+        def counting(pool_class):
+            class CountingPool(pool_class):
+                def _new_conn(self):
+                    metrics.record_connection()
+                    return super()._new_conn()
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting(pool_class) for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class HttpSession(requests.Session):
+    """requests.Session shared by every network call of the launcher.
+
+    - keep-alive connections pooled per host (pool_size connections each);
+    - a default (connect, read) timeout on every request;
+    - GET/HEAD retried with exponential backoff on connection errors, 429 and 5xx, waiting
+      as long as GitHub's Retry-After or X-RateLimit-Reset asks (up to max_retry_wait);
+    - gzip negotiated for API responses unless disabled (downloads ask for identity);
+    - latency and connection reuse recorded in ``metrics``.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    RETRY_METHODS = ("GET", "HEAD")
+    BACKOFF_BASE = 0.5
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+                 retries=HTTP_RETRIES, max_retry_wait=HTTP_MAX_RETRY_WAIT, gzip=HTTP_GZIP):
+        super().__init__()
+        self.timeout = timeout
+        self.retries = retries
+        self.max_retry_wait = max_retry_wait
+        self.metrics = HttpMetrics()
+        self.headers["Accept-Encoding"] = "gzip, deflate" if gzip else "identity"
+        self.headers["User-Agent"] = "sm64coopdx-launcher"
+
+        adapter = _CountingAdapter(self.metrics, pool_connections=4, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        parts = urlsplit(url)
+        endpoint = f"{method.upper()} {parts.netloc}{parts.path}"
+        retries = self.retries if method.upper() in self.RETRY_METHODS else 0
+
+        with tracer.span("http.request", endpoint=endpoint) as span:
+            attempt = 0
+            while True:
+                start = time.perf_counter()
+                try:
+                    response = super().request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    self.metrics.record(endpoint, time.perf_counter() - start, error=True)
+                    if attempt >= retries:
+                        raise
+                    wait = self._backoff(attempt)
+                else:
+                    self.metrics.record(endpoint, time.perf_counter() - start)
+                    wait = self._retry_wait(response, attempt) if attempt < retries else None
+                    if wait is None:
+                        span.set(status=response.status_code, retries=attempt)
+                        return response
+                    # Libérer la connexion avant de réessayer (réponses lues en flux)
+                    response.close()
+
+                self.metrics.record_retry()
+                time.sleep(wait)
+                attempt += 1
+
+    def _backoff(self, attempt):
+        return min(self.max_retry_wait, self.BACKOFF_BASE * 2 ** attempt)
+
+    def _retry_wait(self, response, attempt):
+        """Seconds to wait before retrying response, or None if it should be returned as is."""
+        rate_limited = (response.status_code in (403, 429)
+                        and response.headers.get("X-RateLimit-Remaining") == "0")
+        if response.status_code not in self.RETRY_STATUSES and not rate_limited:
+            if not (response.status_code == 403 and "Retry-After" in response.headers):
+                return None
+
+        wait = self._parse_retry_after(response.headers.get("Retry-After"))
+        if wait is None and rate_limited:
+            try:
+                # X-RateLimit-Reset est arrondi à la seconde : une seconde de marge évite un essai trop tôt
+                wait = max(0.0, float(response.headers.get("X-RateLimit-Reset")) - time.time()) + 1
+            except (TypeError, ValueError):
+                wait = None
+        if wait is None:
+            wait = self._backoff(attempt)
+        # Une limite levée dans une heure ne vaut pas d'être attendue : rendre la réponse à l'appelant
+        return wait if wait <= self.max_retry_wait else None
+
+    @staticmethod
+    def _parse_retry_after(value):
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide HttpSession, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
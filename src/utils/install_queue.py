@@ -0,0 +1,272 @@
+import itertools
+import json
+import os
+import threading
+import time
+
+from config import CACHE_DIRECTORY, MAX_CONCURRENT_INSTALLS, INSTALL_BANDWIDTH_LIMIT
+from utils.progress import ProgressTracker
+
+
+class InstallCancelled(Exception):
+    """Raised inside a transfer when its job is cancelled."""
+
+
+class TokenBucket:
+    """Bandwidth limiter shared by every transfer thread.
+
+    ``consume(n)`` blocks until n bytes worth of tokens are available. A rate of 0 (or
+    None) disables the limit. The bucket holds at most one second of traffic, which
+    smooths bursts without letting an idle period turn into a long full-speed spike.
+    """
+
+    def __init__(self, rate=0):
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        self.rate = rate
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate):
+        with self._lock:
+            self._rate = rate or 0
+            self._tokens = min(self._tokens, self._rate)
+
+    def consume(self, amount):
+        while True:
+            with self._lock:
+                if not self._rate:
+                    return
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                # Les gros morceaux sont débités à crédit pour ne jamais bloquer indéfiniment
+                if self._tokens >= min(amount, self._rate):
+                    self._tokens -= amount
+                    return
+                wait = (min(amount, self._rate) - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class InstallJob:
+    """One queued build install and its controls."""
+
+    def __init__(self, job_id, download_url, file_name, custom_name, priority=0, state="queued", digest=None,
+                 base_name=None, migrate_from=None):
+        self.id = job_id
+        self.download_url = download_url
+        self.file_name = file_name
+        self.custom_name = custom_name
+        self.digest = digest
+        # Build installée servant de base à une mise à jour différentielle (None : installation complète)
+        self.base_name = base_name
+        self.report = None
+        # Build dont la configuration, les sauvegardes et les mods sont repris une fois l'installation finie
+        self.migrate_from = migrate_from
+        self.migration = None
+        self.priority = priority
+        self.state = state
+        self.started = False
+        self.error = None
+        self.tracker = ProgressTracker()
+        self.cancel_event = threading.Event()
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "download_url": self.download_url,
+            "file_name": self.file_name,
+            "custom_name": self.custom_name,
+            "digest": self.digest,
+            "base_name": self.base_name,
+            "migrate_from": self.migrate_from,
+            "priority": self.priority,
+            # Une installation interrompue par la fermeture du launcher repart de la file
+            "state": "queued" if self.state == "running" else self.state
+        }
+
+
+class InstallQueue:
+    """Persistent priority queue of build installs run by a bounded pool of workers.
+
+    Jobs with a higher priority start first (ties in submission order). Running jobs
+    can be paused, resumed or cancelled, and every transfer draws from one TokenBucket
+    so the total bandwidth stays under the configured cap. Queued and paused jobs are
+    saved to ``cache/install_queue.json`` and restored on the next start.
+
+    ``on_change(job)`` is called from worker threads whenever a job changes state.
+    """
+
+    ACTIVE_STATES = ("queued", "running", "paused")
+
+    def __init__(self, directory="builds", max_concurrent=MAX_CONCURRENT_INSTALLS,
+                 bandwidth_limit=INSTALL_BANDWIDTH_LIMIT, path=None, on_change=None):
+        self.directory = directory
+        self.path = path or os.path.join(CACHE_DIRECTORY, "install_queue.json")
+        self.bucket = TokenBucket(bandwidth_limit)
+        self.on_change = on_change
+        self.jobs = []
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._stopped = False
+
+        self._load()
+        for index in range(max(1, max_concurrent)):
+            threading.Thread(target=self._worker_loop, name=f"install-worker-{index}", daemon=True).start()
+
+    def submit(self, download_url, file_name, custom_name, priority=0, digest=None, base_name=None, migrate_from=None):
+        """Queue an install. Raises FileExistsError if a queued, running or paused job already installs custom_name."""
+        with self._condition:
+            if any(job.custom_name == custom_name and job.state in self.ACTIVE_STATES for job in self.jobs):
+                raise FileExistsError(f"'{custom_name}' is already in the install queue.")
+            job = InstallJob(next(self._ids), download_url, file_name, custom_name, priority, digest=digest,
+                             base_name=base_name, migrate_from=migrate_from)
+            self.jobs.append(job)
+            self._save()
+            self._condition.notify()
+        self._notify(job)
+        return job
+
+    def set_priority(self, job, priority):
+        with self._condition:
+            job.priority = priority
+            self._save()
+            self._condition.notify()
+        self._notify(job)
+
+    def pause(self, job):
+        with self._condition:
+            if job.state in ("queued", "running"):
+                job.state = "paused"
+                job.resume_event.clear()
+                self._save()
+        self._notify(job)
+
+    def resume(self, job):
+        with self._condition:
+            if job.state == "paused":
+                # Un job mis en pause avant de démarrer retourne dans la file
+                job.state = "running" if job.started else "queued"
+                job.resume_event.set()
+                self._save()
+                self._condition.notify()
+        self._notify(job)
+
+    def cancel(self, job):
+        with self._condition:
+            if job.state in self.ACTIVE_STATES:
+                job.cancel_event.set()
+                job.resume_event.set()
+                if not job.started:
+                    job.state = "cancelled"
+                self._save()
+        self._notify(job)
+
+    def clear_finished(self):
+        with self._condition:
+            self.jobs = [job for job in self.jobs if job.state in self.ACTIVE_STATES]
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _next_job(self):
+        queued = [job for job in self.jobs if job.state == "queued"]
+        if not queued:
+            return None
+        return max(queued, key=lambda job: (job.priority, -job.id))
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None and not self._stopped:
+                    self._condition.wait()
+                    job = self._next_job()
+                if self._stopped:
+                    return
+                job.state = "running"
+                job.started = True
+                self._save()
+            self._notify(job)
+            self._run(job)
+
+    def _run(self, job):
+        # Import local : build_installer tire requests, inutile tant qu'aucune installation ne démarre
+        from utils.build_installer import BuildInstaller
+        from utils.file_manager import FileManager
+
+        def on_chunk(byte_count):
+            if not job.resume_event.is_set():
+                job.resume_event.wait()
+            if job.cancel_event.is_set():
+                raise InstallCancelled(f"Install of '{job.custom_name}' was cancelled.")
+            self.bucket.consume(byte_count)
+
+        try:
+            if job.base_name:
+                job.report = BuildInstaller.update(job.download_url, job.file_name, job.base_name, job.custom_name,
+                                                   self.directory, job.tracker.update, chunk_hook=on_chunk,
+                                                   expected_digest=job.digest)
+            else:
+                BuildInstaller.install(job.download_url, job.file_name, job.custom_name, self.directory,
+                                       job.tracker.update, chunk_hook=on_chunk, expected_digest=job.digest)
+            if job.migrate_from:
+                try:
+                    job.migration = FileManager.migrate_user_data(self.directory, job.migrate_from, job.custom_name)
+                except Exception as e:
+                    raise RuntimeError(f"The build was installed, but migrating data from "
+                                       f"'{job.migrate_from}' failed: {e}") from e
+            state, error = "done", None
+        except InstallCancelled:
+            state, error = "cancelled", None
+        except Exception as e:
+            state, error = "failed", str(e)
+
+        with self._condition:
+            job.state = state
+            job.error = error
+            self._save()
+        self._notify(job)
+
+    def _notify(self, job):
+        if self.on_change is not None:
+            try:
+                self.on_change(job)
+            except Exception as e:
+                print(f"Error in install queue callback: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as queue_file:
+                saved_jobs = json.load(queue_file)
+        except (OSError, ValueError):
+            return
+        for saved in saved_jobs:
+            job = InstallJob(saved["id"], saved["download_url"], saved["file_name"], saved["custom_name"],
+                             saved.get("priority", 0), saved.get("state", "queued"), saved.get("digest"),
+                             saved.get("base_name"), saved.get("migrate_from"))
+            if job.state == "paused":
+                job.resume_event.clear()
+            self.jobs.append(job)
+        self._ids = itertools.count(max([job.id for job in self.jobs], default=0) + 1)
+
+    def _save(self):
+        """Write the active jobs to disk; the caller holds the condition lock."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as queue_file:
+                json.dump([job.to_dict() for job in self.jobs if job.state in self.ACTIVE_STATES], queue_file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving install queue: {e}")
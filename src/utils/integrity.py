@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.tracing import traced
+
+READ_SIZE = 1024 * 1024
+
+
+class IntegrityError(Exception):
+    """Raised when downloaded data does not match the digest published for it."""
+
+
+def parse_digest(digest):
+    """Return the hex SHA-256 of a GitHub asset digest ("sha256:<hex>"), or None."""
+    if not digest or not digest.startswith("sha256:"):
+        return None
+    return digest.split(":", 1)[1].lower()
+
+
+def check_digest(actual_sha256, expected_digest, label):
+    """Raise IntegrityError if expected_digest is known and differs from actual_sha256."""
+    expected_sha256 = parse_digest(expected_digest)
+    if expected_sha256 is not None and actual_sha256 != expected_sha256:
+        raise IntegrityError(f"{label} is corrupt: SHA-256 {actual_sha256} does not match {expected_sha256}.")
+
+
+def sha256_file(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for data in iter(lambda: file.read(READ_SIZE), b""):
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+class BuildManifest:
+    """Per-file SHA-256 hashes of a build, stored in ``<build>/launcher_files.json``.
+
+    Each file is recorded with its size and mtime next to its hash, so an audit only has
+    to re-read the files whose size or mtime moved since the manifest was written.
+    """
+
+    FILE_NAME = "launcher_files.json"
+    # Fichiers écrits par le launcher lui-même, pas par l'archive du build
+    IGNORED = ("launcher_variables", FILE_NAME)
+
+    @staticmethod
+    def write(build_path, known=None, workers=None):
+        """Hash every file of build_path and save the manifest.
+
+        known maps absolute paths to SHA-256 digests already computed during the install
+        (e.g. by BuildStore); only the remaining files are read back.
+        """
+        known = known or {}
+        paths = []
+        for current_directory, _, file_names in os.walk(build_path):
+            for file_name in file_names:
+                path = os.path.join(current_directory, file_name)
+                relative_path = os.path.relpath(path, build_path).replace(os.sep, "/")
+                if relative_path not in BuildManifest.IGNORED:
+                    paths.append((relative_path, path))
+
+        def describe(item):
+            relative_path, path = item
+            stat = os.stat(path)
+            digest = known.get(os.path.normpath(path)) or sha256_file(path)
+            return relative_path, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+        with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as executor:
+            files = dict(executor.map(describe, paths))
+        BuildManifest.save(build_path, files)
+        return files
+
+    @staticmethod
+    def load(build_path):
+        """Return the recorded files of a build, or None if it has no manifest."""
+        try:
+            with open(os.path.join(build_path, BuildManifest.FILE_NAME), "r", encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)["files"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def save(build_path, files):
+        manifest_path = os.path.join(build_path, BuildManifest.FILE_NAME)
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump({"files": files}, manifest_file, separators=(",", ":"))
+        os.replace(temp_path, manifest_path)
+
+
+class BuildAuditor:
+    """Check installed builds against their manifests on a shared thread pool.
+
+    Files whose size and mtime still match the manifest are trusted without being read;
+    the others are hashed again. hashlib releases the GIL on large buffers, so threads
+    hash several files at once.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+    @traced("audit")
+    def audit(self, directory="builds"):
+        """Audit every build folder of directory.
+
+        Returns one dict per build, sorted by name: {"name", "checked", "modified",
+        "missing", "unverified"}; unverified builds were installed without a manifest.
+        """
+        if not os.path.exists(directory):
+            return []
+        names = sorted(
+            entry.name for entry in os.scandir(directory)
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            checks = {}
+            reports = []
+            for name in names:
+                build_path = os.path.join(directory, name)
+                files = BuildManifest.load(build_path)
+                report = {"name": name, "checked": 0, "modified": [], "missing": [], "unverified": files is None}
+                reports.append(report)
+                if files is not None:
+                    checks[name] = (build_path, files, [
+                        (relative_path, executor.submit(self._check_file, build_path, relative_path, recorded))
+                        for relative_path, recorded in files.items()
+                    ])
+
+            for report in reports:
+                if report["name"] not in checks:
+                    continue
+                build_path, files, results = checks[report["name"]]
+                refreshed = False
+                for relative_path, future in results:
+                    status, stat = future.result()
+                    report["checked"] += 1
+                    if status == "missing" or status == "modified":
+                        report[status].append(relative_path)
+                    elif status == "touched":
+                        # Contenu identique mais mtime changé : mémoriser le nouvel état pour le prochain audit
+                        files[relative_path]["mtime_ns"] = stat.st_mtime_ns
+                        refreshed = True
+                if refreshed:
+                    try:
+                        BuildManifest.save(build_path, files)
+                    except OSError as e:
+                        print(f"Error updating manifest of {report['name']}: {e}")
+        return reports
+
+    @staticmethod
+    def _check_file(build_path, relative_path, recorded):
+        path = os.path.join(build_path, *relative_path.split("/"))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing", None
+        if stat.st_size != recorded["size"]:
+            return "modified", stat
+        if stat.st_mtime_ns == recorded["mtime_ns"]:
+            return "ok", stat
+        try:
+            digest = sha256_file(path)
+        except OSError:
+            return "missing", None
+        return ("touched" if digest == recorded["sha256"] else "modified"), stat
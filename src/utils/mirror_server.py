@@ -0,0 +1,220 @@
+import hashlib
+import http.server
+import json
+import os
+import re
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+
+from config import MIRROR_SERVER_HOST, MIRROR_SERVER_PORT
+from utils.asset_cache import AssetCache
+from utils.github_manager import GitHubManager
+from utils.mirrors import set_mirrors
+from utils.tracing import tracer
+
+
+class MirrorServer:
+    """Serve this launcher's release catalog and asset cache to the other launchers of the LAN.
+
+    Routes (all GET/HEAD):
+    - ``/ping``: liveness, used by MirrorList to rank mirrors by latency;
+    - ``/catalog?url=<GitHub API URL>``: the release catalog, through the ReleaseCache;
+    - ``/asset?url=<download URL>``: a release asset from the AssetCache, with byte ranges
+      so Downloader can fetch it over several connections.
+
+    Only the releases API of GitHubManager and the assets listed in the cached catalog are
+    served, so the server never proxies arbitrary URLs. A process running a MirrorServer
+    stops using mirrors itself. An asset missing from the cache is
+    downloaded from GitHub once in the background; until then requests for it get 503 and
+    clients fall back to GitHub.
+    """
+
+    CHUNK_SIZE = 256 * 1024
+    RETRY_AFTER = 10
+
+    def __init__(self, host=MIRROR_SERVER_HOST, port=MIRROR_SERVER_PORT, cache=None):
+        # Le serveur est la source du site : il parle directement à GitHub, jamais à un miroir (lui-même compris)
+        set_mirrors([])
+        self.cache = cache or AssetCache()
+        self.server = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+        self._fetching = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Serve from a background thread."""
+        threading.Thread(target=self.server.serve_forever, name="mirror-server", daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def catalog(self, url):
+        """Return the JSON body of a catalog URL, or None if it is not one this server mirrors."""
+        if url not in (GitHubManager.REPO_URL, GitHubManager.LATEST_URL):
+            return None
+        return json.dumps(GitHubManager.fetch_json(url), separators=(",", ":")).encode("utf-8")
+
+    def asset(self, download_url):
+        """Return (path, sha256) of a cached asset, None if not cached yet, or raise LookupError if unknown.
+
+        A missing asset starts downloading in the background.
+        """
+        asset = GitHubManager.find_asset(download_url)
+        if asset is None:
+            # Le client a peut-être un catalogue plus récent : relire celui-ci (revalidé s'il est périmé)
+            GitHubManager.get_releases()
+            asset = GitHubManager.find_asset(download_url)
+        if asset is None:
+            raise LookupError(download_url)
+        path = self.cache.get(download_url, asset.get("digest"))
+        if path is not None:
+            digest = self.cache.digest(download_url)
+            if digest is not None:
+                return path, digest
+
+        with self._lock:
+            if download_url in self._fetching:
+                return None
+            self._fetching.add(download_url)
+        threading.Thread(target=self._fetch, args=(download_url, asset.get("digest")),
+                         name="mirror-fetch", daemon=True).start()
+        return None
+
+    def _fetch(self, download_url, digest):
+        try:
+            with tracer.span("mirror.fetch", asset=os.path.basename(download_url)):
+                self.cache.fetch(download_url, expected_digest=digest)
+        except Exception as e:
+            print(f"Error fetching {download_url} for the LAN mirror: {e}")
+        finally:
+            with self._lock:
+                self._fetching.discard(download_url)
+
+    def _handler_class(self):
+        mirror = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_HEAD(self):
+                self._handle(send_body=False)
+
+            def do_GET(self):
+                self._handle(send_body=True)
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self, send_body):
+                parts = urlsplit(self.path)
+                url = parse_qs(parts.query).get("url", [""])[0]
+                try:
+                    if parts.path == "/ping":
+                        self._send_bytes(b"ok", "text/plain", None, send_body)
+                    elif parts.path == "/catalog":
+                        self._send_catalog(url, send_body)
+                    elif parts.path == "/asset":
+                        self._send_asset(url, send_body)
+                    else:
+                        self._send_error(404)
+                except requests.RequestException as e:
+                    self._send_error(502, str(e))
+                except (ConnectionError, TimeoutError):
+                    # Client parti en cours de transfert
+                    pass
+
+            def _send_catalog(self, url, send_body):
+                body = mirror.catalog(url)
+                if body is None:
+                    self._send_error(404)
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._send_bytes(body, "application/json", etag, send_body)
+
+            def _send_asset(self, url, send_body):
+                try:
+                    cached = mirror.asset(url)
+                except LookupError:
+                    self._send_error(404)
+                    return
+                if cached is None:
+                    self.send_response(503)
+                    self.send_header("Retry-After", str(mirror.RETRY_AFTER))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                path, digest = cached
+                size = os.path.getsize(path)
+                start, end = 0, size - 1
+                status = 200
+                match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+                if match and (match.group(1) or match.group(2)):
+                    if match.group(1):
+                        start = int(match.group(1))
+                        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                    else:
+                        start = max(0, size - int(match.group(2)))
+                    if start > end:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    status = 206
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", f'"{digest}"')
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                self.end_headers()
+                if not send_body:
+                    return
+                with tracer.span("mirror.serve", asset=os.path.basename(path)) as span, open(path, "rb") as file:
+                    file.seek(start)
+                    remaining = end - start + 1
+                    while remaining > 0:
+                        data = file.read(min(mirror.CHUNK_SIZE, remaining))
+                        if not data:
+                            break
+                        self.wfile.write(data)
+                        remaining -= len(data)
+                        span.add_bytes(len(data))
+
+            def _send_bytes(self, body, content_type, etag, send_body):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def _send_error(self, status, message=""):
+                body = message.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+
+from config import MIRRORS, MIRROR_PROBE_TIMEOUT, MIRROR_PROBE_TTL, HTTP_READ_TIMEOUT
+from utils.http_client import HttpSession
+
+
+class MirrorList:
+    """LAN mirrors (launchers running a MirrorServer) tried before GitHub.
+
+    Mirrors are ranked by the latency of a ``/ping`` request, measured concurrently and
+    kept for probe_ttl seconds; unreachable mirrors are skipped until the next probe.
+    Requests to mirrors are never retried: a mirror that does not answer at once is
+    passed over for the next one, and GitHub is always the last resort.
+    """
+
+    def __init__(self, mirrors=MIRRORS, probe_timeout=MIRROR_PROBE_TIMEOUT, probe_ttl=MIRROR_PROBE_TTL):
+        self.mirrors = [mirror.rstrip("/") for mirror in mirrors]
+        self.probe_timeout = probe_timeout
+        self.probe_ttl = probe_ttl
+        self.session = HttpSession(timeout=(probe_timeout, HTTP_READ_TIMEOUT), retries=0)
+        self._latencies = {}
+        self._probed_at = None
+        self._lock = threading.Lock()
+
+    def ordered(self):
+        """Return the reachable mirrors, lowest latency first."""
+        if not self.mirrors:
+            return []
+        with self._lock:
+            if self._probed_at is None or time.monotonic() - self._probed_at > self.probe_ttl:
+                self._latencies = self.probe()
+                self._probed_at = time.monotonic()
+            latencies = dict(self._latencies)
+        reachable = [mirror for mirror in self.mirrors if latencies.get(mirror) is not None]
+        return sorted(reachable, key=lambda mirror: latencies[mirror])
+
+    def probe(self):
+        """Measure every mirror once. Returns {mirror: latency in seconds, or None if unreachable}."""
+        def measure(mirror):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(f"{mirror}/ping", timeout=self.probe_timeout)
+                response.raise_for_status()
+            except requests.RequestException:
+                return None
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=len(self.mirrors)) as executor:
+            return dict(zip(self.mirrors, executor.map(measure, self.mirrors)))
+
+    def latencies(self):
+        """Last measured latencies, as returned by probe()."""
+        with self._lock:
+            return dict(self._latencies)
+
+    def mark_failed(self, mirror):
+        """Skip a mirror that failed mid-request until the next probe."""
+        with self._lock:
+            self._latencies[mirror] = None
+
+    def catalog_candidates(self, api_url):
+        """(mirror, URL) pairs serving the GitHub API response api_url, best mirror first."""
+        return [(mirror, f"{mirror}/catalog?url={quote(api_url, safe='')}") for mirror in self.ordered()]
+
+    def asset_candidates(self, download_url):
+        """(mirror, URL) pairs serving the release asset download_url, best mirror first."""
+        return [(mirror, f"{mirror}/asset?url={quote(download_url, safe='')}") for mirror in self.ordered()]
+
+
+_mirrors = None
+_mirrors_lock = threading.Lock()
+
+
+def get_mirrors():
+    """Return the MirrorList configured in config.MIRRORS, created on first use."""
+    global _mirrors
+    with _mirrors_lock:
+        if _mirrors is None:
+            _mirrors = MirrorList()
+        return _mirrors
+
+
+def set_mirrors(mirrors):
+    """Replace the configured mirrors (e.g. from the command line)."""
+    global _mirrors
+    with _mirrors_lock:
+        _mirrors = MirrorList(mirrors)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.integrity import sha256_file
+from utils.tracing import tracer
+
+
+def mod_digest(file_digests):
+    """SHA-256 identifying a mod's contents, from {relative path: file SHA-256}."""
+    sha256 = hashlib.sha256()
+    for relative_path in sorted(file_digests):
+        sha256.update(f"{relative_path}\0{file_digests[relative_path]}\n".encode("utf-8"))
+    return sha256.hexdigest()
+
+
+class ModIndex:
+    """Index of the mods of every build, cached in ``builds/.mods_index.json``.
+
+    A mod is either a folder of ``<build>/mods`` (its header is read from ``main.lua``) or a
+    single ``.lua`` file there. Each entry records the mod's name and description from the
+    ``-- name:`` / ``-- description:`` header comments, its size, file count and SHA-256.
+    The size and mtime of every file are cached next to its hash, so a scan only stats the
+    files and re-reads the ones that changed; mods are scanned on a thread pool.
+    """
+
+    MODS_DIRECTORY = "mods"
+    HEADER_FILE = "main.lua"
+    HEADER_SIZE = 4096
+    # Codes couleur du jeu dans les noms de mods, ex. "\#ff0000\"
+    COLOR_CODE = re.compile(r"\\#[0-9a-fA-F]{6,8}\\")
+    HEADER_FIELD = re.compile(r"--\s*(name|description)\s*:\s*(.*)", re.IGNORECASE)
+    _lock = threading.Lock()
+
+    def __init__(self, directory="builds", workers=None):
+        self.directory = directory
+        self.path = os.path.join(directory, ".mods_index.json")
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def scan(self, build_name):
+        """Return the entries of a build's mods, sorted by name."""
+        mods_path = os.path.join(self.directory, build_name, self.MODS_DIRECTORY)
+        with self._lock, tracer.span("mods.scan", build=build_name) as span:
+            index = self._load()
+            # Les builds supprimées ou renommées depuis le dernier scan sont oubliées
+            stale = [name for name in index if not os.path.isdir(os.path.join(self.directory, name))]
+            for name in stale:
+                del index[name]
+            cached = index.get(build_name, {})
+            mods = []
+            if os.path.isdir(mods_path):
+                with os.scandir(mods_path) as directory_entries:
+                    for directory_entry in directory_entries:
+                        if directory_entry.name.startswith("."):
+                            continue
+                        if directory_entry.is_dir() or directory_entry.name.lower().endswith(".lua"):
+                            mods.append(directory_entry.name)
+
+            def scan_mod(mod_id):
+                return mod_id, self._scan_mod(os.path.join(mods_path, mod_id), mod_id, cached.get(mod_id))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                current = dict(executor.map(scan_mod, mods))
+
+            rehashed = sum(1 for mod_id, mod in current.items() if mod is not cached.get(mod_id))
+            span.set(mods=len(current), rehashed=rehashed)
+            if rehashed or stale or len(current) != len(cached):
+                index[build_name] = current
+                self._save(index)
+            return sorted((mod["entry"] for mod in current.values()), key=lambda entry: entry["name"].lower())
+
+    def _scan_mod(self, mod_path, mod_id, cached):
+        """Return the cached mod if none of its files changed, else the re-read mod."""
+        if os.path.isdir(mod_path):
+            paths = []
+            for current_directory, _, file_names in os.walk(mod_path):
+                for file_name in file_names:
+                    path = os.path.join(current_directory, file_name)
+                    paths.append((os.path.relpath(path, mod_path).replace(os.sep, "/"), path))
+            header_path = os.path.join(mod_path, self.HEADER_FILE)
+        else:
+            paths = [(mod_id, mod_path)]
+            header_path = mod_path
+
+        cached_files = cached["files"] if cached else {}
+        files = {}
+        changed = len(paths) != len(cached_files)
+        for relative_path, path in paths:
+            stat = os.stat(path)
+            previous = cached_files.get(relative_path)
+            if previous is not None and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+                files[relative_path] = previous
+            else:
+                files[relative_path] = [stat.st_size, stat.st_mtime_ns, sha256_file(path)]
+                changed = True
+        if not changed:
+            return cached
+
+        name, description = self.read_header(header_path)
+        return {
+            "files": files,
+            "entry": {
+                "id": mod_id,
+                "name": name or os.path.splitext(mod_id)[0],
+                "description": description,
+                "size": sum(file[0] for file in files.values()),
+                "files": len(files),
+                "sha256": mod_digest({relative_path: file[2] for relative_path, file in files.items()}),
+                "mtime_ns": max((file[1] for file in files.values()), default=0)
+            }
+        }
+
+    @staticmethod
+    def read_header(path):
+        """Return (name, description) from the header comments of a mod's Lua file ("" if absent)."""
+        fields = {"name": "", "description": ""}
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as header_file:
+                text = header_file.read(ModIndex.HEADER_SIZE)
+        except OSError:
+            return "", ""
+        for line in text.splitlines():
+            match = ModIndex.HEADER_FIELD.match(line.strip())
+            if match and not fields[match.group(1).lower()]:
+                value = ModIndex.COLOR_CODE.sub("", match.group(2)).replace("\\n", " ")
+                fields[match.group(1).lower()] = " ".join(value.split())
+        return fields["name"], fields["description"]
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, index):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as index_file:
+                json.dump(index, index_file, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error writing mods index: {e}")
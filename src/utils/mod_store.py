@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+
+from utils.build_store import BuildStore
+from utils.mod_index import ModIndex, mod_digest
+
+
+class ModStore:
+    """Mods shared between builds, stored once in the build store (``builds/.store``).
+
+    share() moves the files of a build's mod into the BuildStore, pins their blobs so they
+    outlive the build, and records the mod in ``builds/.mods/<sha256>.json``; enable() then
+    materializes it in any other build as hardlinks to the same blobs, so a mod enabled in
+    ten builds uses the disk once. disable() only removes the mod from one build: it stays
+    in the store until remove().
+
+    As with the build store, editing a shared file in place changes it in every build
+    that enabled the mod.
+    """
+
+    def __init__(self, directory="builds"):
+        self.directory = directory
+        self.records_path = os.path.join(directory, ".mods")
+        self.store = BuildStore(os.path.join(directory, ".store"))
+
+    def share(self, build_name, mod_id):
+        """Add a build's mod to the store and return its record."""
+        mod_path = self._mod_path(build_name, mod_id)
+        if os.path.isdir(mod_path):
+            digests = {}
+            self.store.import_tree(mod_path, digests=digests)
+            files = {
+                os.path.relpath(path, mod_path).replace(os.sep, "/"): digest
+                for path, digest in digests.items()
+            }
+            size = sum(os.path.getsize(path) for path in digests)
+            header_path = os.path.join(mod_path, ModIndex.HEADER_FILE)
+        elif os.path.isfile(mod_path):
+            # Mod d'un seul fichier ".lua" : son unique fichier porte le nom du mod
+            files = {mod_id: self.store.import_file(mod_path)}
+            size = os.path.getsize(mod_path)
+            header_path = mod_path
+        else:
+            raise FileNotFoundError(f"Mod '{mod_id}' not found in build '{build_name}'.")
+
+        name, description = ModIndex.read_header(header_path)
+        record = {
+            "id": mod_id,
+            "name": name or os.path.splitext(mod_id)[0],
+            "description": description,
+            "sha256": mod_digest(files),
+            "size": size,
+            "single_file": not os.path.isdir(mod_path),
+            "files": files
+        }
+        # Épinglés avant l'écriture de la fiche : une fiche ne désigne jamais de blobs collectables
+        self.store.pin(self._pin_name(record["sha256"]), files.values())
+        os.makedirs(self.records_path, exist_ok=True)
+        record_path = self._record_path(record["sha256"])
+        with open(record_path + ".tmp", "w", encoding="utf-8") as record_file:
+            json.dump(record, record_file)
+        os.replace(record_path + ".tmp", record_path)
+        return record
+
+    def list(self):
+        """Return the records of the shared mods, sorted by name."""
+        records = []
+        if os.path.isdir(self.records_path):
+            for file_name in os.listdir(self.records_path):
+                if file_name.endswith(".json"):
+                    record = self._read_record(file_name[:-len(".json")])
+                    if record is not None:
+                        records.append(record)
+        return sorted(records, key=lambda record: record["name"].lower())
+
+    def enable(self, digest, build_name):
+        """Materialize a shared mod in a build's mods folder. Returns its mod id."""
+        record = self._read_record(digest)
+        if record is None:
+            raise FileNotFoundError("This mod is not in the shared mod store.")
+        mod_path = self._mod_path(build_name, record["id"])
+        if os.path.exists(mod_path):
+            raise FileExistsError(f"Build '{build_name}' already has a mod named '{record['id']}'.")
+
+        staging_path = os.path.join(os.path.dirname(mod_path), f".installing-{record['id']}")
+        if os.path.isfile(staging_path):
+            os.remove(staging_path)
+        shutil.rmtree(staging_path, ignore_errors=True)
+        try:
+            for relative_path, file_digest in record["files"].items():
+                if record["single_file"]:
+                    target_path = staging_path
+                else:
+                    target_path = os.path.join(staging_path, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                if not self.store.link(file_digest, target_path):
+                    raise FileNotFoundError(f"File '{relative_path}' of mod '{record['id']}' is missing from the store.")
+            os.rename(staging_path, mod_path)
+        except BaseException:
+            if os.path.isdir(staging_path):
+                shutil.rmtree(staging_path, ignore_errors=True)
+            elif os.path.exists(staging_path):
+                os.remove(staging_path)
+            raise
+        return record["id"]
+
+    def disable(self, build_name, mod_id):
+        """Remove a mod from one build (shared copies and other builds are kept)."""
+        mod_path = self._mod_path(build_name, mod_id)
+        if os.path.isdir(mod_path):
+            shutil.rmtree(mod_path)
+        elif os.path.isfile(mod_path):
+            os.remove(mod_path)
+        else:
+            raise FileNotFoundError(f"Mod '{mod_id}' not found in build '{build_name}'.")
+
+    def remove(self, digest):
+        """Drop a mod from the store. Returns the bytes freed (files still enabled in a build are kept)."""
+        record = self._read_record(digest)
+        if record is None:
+            return 0
+        os.remove(self._record_path(digest))
+        self.store.unpin(self._pin_name(digest))
+        # Les fichiers épinglés par un autre mod partagé gardent leur blob
+        return self.store.collect_garbage(set(record["files"].values()))
+
+    def _mod_path(self, build_name, mod_id):
+        return os.path.join(self.directory, build_name, ModIndex.MODS_DIRECTORY, mod_id)
+
+    @staticmethod
+    def _pin_name(digest):
+        return f"mod-{digest}"
+
+    def _record_path(self, digest):
+        return os.path.join(self.records_path, f"{digest}.json")
+
+    def _read_record(self, digest):
+        try:
+            with open(self._record_path(digest), "r", encoding="utf-8") as record_file:
+                return json.load(record_file)
+        except (OSError, ValueError):
+            return None
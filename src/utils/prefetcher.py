@@ -0,0 +1,113 @@
+import sys
+import threading
+
+from config import PREFETCH_INTERVAL, PREFETCH_BANDWIDTH_LIMIT, PREFETCH_RENDERER
+from utils.asset_cache import AssetCache
+from utils.install_queue import TokenBucket
+from utils.tracing import tracer
+
+
+class PrefetchPaused(Exception):
+    """Raised inside a prefetch transfer when the prefetcher is stopped."""
+
+
+class Prefetcher:
+    """Download the newest release asset into the AssetCache while the launcher is idle.
+
+    Every interval seconds the release catalog is read (served from the ReleaseCache when
+    fresh) and the newest asset for this platform is fetched if that version is not
+    installed yet. The renderer is PREFETCH_RENDERER, or else the one of the most recently
+    installed build. The transfer is capped to bandwidth_limit bytes/s and stalls whenever
+    is_idle() returns False (e.g. while installs are running); an interrupted prefetch
+    resumes from its partial download next time.
+
+    on_ready(asset), if given, is called from the prefetch thread once an asset is cached.
+    """
+
+    PLATFORM_KEYWORDS = {"win32": "windows", "linux": "linux", "darwin": "mac"}
+    IDLE_POLL = 1.0
+
+    def __init__(self, directory="builds", cache=None, is_idle=None, interval=PREFETCH_INTERVAL,
+                 bandwidth_limit=PREFETCH_BANDWIDTH_LIMIT, renderer=PREFETCH_RENDERER, on_ready=None,
+                 platform=sys.platform):
+        self.directory = directory
+        self.cache = cache or AssetCache()
+        self.is_idle = is_idle or (lambda: True)
+        self.interval = interval
+        self.bucket = TokenBucket(bandwidth_limit)
+        self.renderer = renderer
+        self.platform = platform
+        self.on_ready = on_ready
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, delay=0):
+        """Start checking in the background after delay seconds."""
+        self._thread = threading.Thread(target=self._loop, args=(delay,), name="prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        """Check the catalog and prefetch the newest asset if needed. Returns the asset, or None."""
+        from utils.build_index import BuildIndex
+        from utils.github_manager import GitHubManager
+
+        releases = GitHubManager.get_releases()
+        installed = BuildIndex(self.directory).scan()
+        asset = self.choose_asset(releases, installed, self.renderer, self.platform)
+        if asset is None or self.cache.contains(asset["browser_download_url"]):
+            return None
+
+        with tracer.span("prefetch", asset=asset["name"]):
+            self.cache.fetch(asset["browser_download_url"], self._on_chunk, asset.get("digest"))
+        if self.on_ready is not None:
+            self.on_ready(asset)
+        return asset
+
+    @staticmethod
+    def choose_asset(releases, installed, renderer=None, platform=sys.platform):
+        """Pick the asset of the newest release to prefetch, or None if it is already installed."""
+        # Import local : build_installer tire la pile réseau, inutile pour ce simple calcul
+        from utils.build_installer import BuildInstaller
+
+        if not releases:
+            return None
+        keyword = Prefetcher.PLATFORM_KEYWORDS.get(platform, platform)
+        assets = [asset for asset in releases[0]["assets"] if keyword in asset["name"].lower()]
+        if not assets:
+            return None
+
+        if renderer is None and installed:
+            renderer = max(installed, key=lambda entry: entry["installed_at"])["renderer"]
+        preferred = [asset for asset in assets if BuildInstaller.parse_asset_name(asset["name"])[1] == renderer]
+        asset = (preferred or assets)[0]
+
+        game_version, asset_renderer = BuildInstaller.parse_asset_name(asset["name"])
+        if any(entry["game_version"] == game_version and entry["renderer"] == asset_renderer for entry in installed):
+            return None
+        return asset
+
+    def _on_chunk(self, byte_count):
+        # Priorité basse : la récupération attend tant que le launcher est occupé
+        while not self.is_idle():
+            if self._stop.wait(self.IDLE_POLL):
+                break
+        if self._stop.is_set():
+            raise PrefetchPaused("Prefetch stopped.")
+        self.bucket.consume(byte_count)
+
+    def _loop(self, delay):
+        if self._stop.wait(delay):
+            return
+        while True:
+            if self.is_idle():
+                try:
+                    self.run_once()
+                except PrefetchPaused:
+                    return
+                except Exception as e:
+                    print(f"Prefetch failed: {e}")
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,501 @@
+import collections
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from config import (CACHE_DIRECTORY, PROCESS_SAMPLE_INTERVAL, PROCESS_OUTPUT_LINES, PROCESS_READY_TIMEOUT,
+                    PROCESS_LOG_KEEP)
+from utils.tracing import tracer
+
+
+class GameInstance:
+    """One launched game process and what the supervisor measured about it."""
+
+    MAX_SAMPLES = 600
+
+    def __init__(self, instance_id, build, exe_path, args, game_version="Unknown", renderer="Unknown",
+                 ready_port=None, output_lines=PROCESS_OUTPUT_LINES):
+        self.id = instance_id
+        self.build = build
+        self.exe_path = exe_path
+        self.args = list(args)
+        self.game_version = game_version
+        self.renderer = renderer
+        self.ready_port = ready_port
+        self.process = None
+        self.pid = None
+        self.state = "starting"
+        self.error = None
+        self.started_at = None
+        self.spawned = None
+        self.ready_after = None
+        self.ready_via = None
+        self.exit_code = None
+        self.log_paths = None
+        self.stdout = collections.deque(maxlen=output_lines)
+        self.stderr = collections.deque(maxlen=output_lines)
+        # (secondes depuis le lancement, CPU %, RSS en octets)
+        self.samples = collections.deque(maxlen=self.MAX_SAMPLES)
+        self.peak_rss = 0
+        self._cpu_time = None
+
+    def uptime(self):
+        if self.spawned is None:
+            return 0.0
+        return time.perf_counter() - self.spawned
+
+    def latest_sample(self):
+        return self.samples[-1] if self.samples else None
+
+    def average_cpu(self):
+        if not self.samples:
+            return None
+        return sum(cpu for _, cpu, _ in self.samples) / len(self.samples)
+
+    def to_dict(self):
+        sample = self.latest_sample()
+        return {
+            "id": self.id,
+            "build": self.build,
+            "game_version": self.game_version,
+            "renderer": self.renderer,
+            "pid": self.pid,
+            "state": self.state,
+            "error": self.error,
+            "started_at": self.started_at,
+            "ready_ms": None if self.ready_after is None else round(self.ready_after * 1000, 1),
+            "ready_via": self.ready_via,
+            "exit_code": self.exit_code,
+            "cpu_percent": None if sample is None else round(sample[1], 1),
+            "rss": None if sample is None else sample[2],
+            "peak_rss": self.peak_rss,
+            "average_cpu": None if not self.samples else round(self.average_cpu(), 1)
+        }
+
+
+class ProcessSupervisor:
+    """Launch game builds and keep track of every process until it exits.
+
+    For each instance the supervisor records the time from spawn to readiness, samples CPU
+    and resident memory every sample_interval seconds and keeps the last output_lines lines
+    of stdout and stderr. An instance is ready when its first visible window appears
+    (Windows), when its ready_port is bound, or, when neither can be observed, at its first
+    line of output; after ready_timeout seconds without any of these it is only "running".
+    The output of each game goes to files in log_directory and is read back from there, so
+    a game never writes into a pipe that would break when the launcher exits. psutil is used for the samples when installed; otherwise /proc (Linux)
+    or the Win32 API is read directly.
+
+    ``on_change(instance)`` is called from the supervisor threads whenever an instance
+    changes state.
+    """
+
+    ALIVE_STATES = ("starting", "ready", "running")
+    OUTPUT_POLL_INTERVAL = 0.2
+
+    def __init__(self, sample_interval=PROCESS_SAMPLE_INTERVAL, output_lines=PROCESS_OUTPUT_LINES,
+                 ready_timeout=PROCESS_READY_TIMEOUT, on_change=None,
+                 log_directory=os.path.join(CACHE_DIRECTORY, "games")):
+        self.sample_interval = sample_interval
+        self.log_directory = log_directory
+        self.output_lines = output_lines
+        self.ready_timeout = ready_timeout
+        self.on_change = on_change
+        self.instances = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._stop = threading.Event()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="process-supervisor", daemon=True)
+        self._monitor.start()
+
+    def launch(self, build, exe_path, args=(), game_version="Unknown", renderer="Unknown", ready_port=None):
+        """Start exe_path and return its GameInstance; spawn errors are raised."""
+        instance = GameInstance(next(self._ids), build, exe_path, args, game_version, renderer, ready_port,
+                                self.output_lines)
+        with self._lock:
+            self.instances.append(instance)
+        try:
+            self._spawn(instance)
+        except Exception as e:
+            instance.state = "failed"
+            instance.error = str(e)
+            self._notify(instance)
+            raise
+        self._notify(instance)
+        return instance
+
+    def launch_many(self, build, exe_path, count, stagger=0.0, args=(), game_version="Unknown",
+                    renderer="Unknown", ready_port=None):
+        """Start count instances, stagger seconds apart, from a background thread.
+
+        With a ready_port, instance n waits on ready_port + n so every instance can host.
+        Returns the thread; the instances appear in self.instances as they are started.
+        """
+        def run():
+            for index in range(count):
+                if index and self._stop.wait(stagger):
+                    return
+                port = None if ready_port is None else ready_port + index
+                try:
+                    self.launch(build, exe_path, args, game_version, renderer, port)
+                except Exception as e:
+                    print(f"Error launching instance {index + 1} of '{build}': {e}")
+
+        thread = threading.Thread(target=run, name=f"launch-{build}", daemon=True)
+        thread.start()
+        return thread
+
+    def terminate(self, instance):
+        if instance.process is not None and instance.process.poll() is None:
+            instance.process.terminate()
+
+    def running(self):
+        with self._lock:
+            return [instance for instance in self.instances if instance.state in self.ALIVE_STATES]
+
+    def clear_exited(self):
+        with self._lock:
+            self.instances = [instance for instance in self.instances if instance.state in self.ALIVE_STATES]
+
+    def compare(self):
+        """Startup and resource figures of every instance seen so far, grouped by (build, renderer).
+
+        Returns {(build, renderer): {"instances", "ready_median_ms", "ready_max_ms",
+        "peak_rss", "average_cpu"}}; figures are None when nothing was measured.
+        """
+        with self._lock:
+            instances = list(self.instances)
+        groups = collections.defaultdict(list)
+        for instance in instances:
+            if instance.pid is not None:
+                groups[(instance.build, instance.renderer)].append(instance)
+
+        comparison = {}
+        for key, group in sorted(groups.items()):
+            ready = [instance.ready_after * 1000 for instance in group if instance.ready_after is not None]
+            cpu = [instance.average_cpu() for instance in group if instance.samples]
+            comparison[key] = {
+                "instances": len(group),
+                "ready_median_ms": round(statistics.median(ready), 1) if ready else None,
+                "ready_max_ms": round(max(ready), 1) if ready else None,
+                "peak_rss": max(instance.peak_rss for instance in group) or None,
+                "average_cpu": round(sum(cpu) / len(cpu), 1) if cpu else None
+            }
+        return comparison
+
+    def stop(self):
+        """Stop supervising; the games themselves keep running."""
+        self._stop.set()
+
+    def _spawn(self, instance):
+        creation_flags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
+        instance.log_paths = self._log_paths(instance)
+        # Le jeu écrit dans des fichiers et non dans des tubes : il survit à la fermeture du launcher
+        with open(instance.log_paths[0], "wb") as stdout, open(instance.log_paths[1], "wb") as stderr:
+            with tracer.span("launch", build=instance.build, instance=instance.id):
+                instance.started_at = time.time()
+                instance.spawned = time.perf_counter()
+                instance.process = subprocess.Popen(
+                    [instance.exe_path] + instance.args,
+                    stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr,
+                    creationflags=creation_flags
+                )
+        instance.pid = instance.process.pid
+        for path, buffer in zip(instance.log_paths, (instance.stdout, instance.stderr)):
+            threading.Thread(target=self._tail_output, args=(instance, path, buffer),
+                             name=f"game-{instance.pid}-output", daemon=True).start()
+
+    def _log_paths(self, instance):
+        os.makedirs(self.log_directory, exist_ok=True)
+        self._prune_logs()
+        stem = f"{instance.build}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{instance.id}"
+        return tuple(os.path.join(self.log_directory, f"{stem}.{stream}.log") for stream in ("stdout", "stderr"))
+
+    def _prune_logs(self):
+        try:
+            with os.scandir(self.log_directory) as entries:
+                logs = sorted((entry for entry in entries if entry.name.endswith(".log")),
+                              key=lambda entry: entry.stat().st_mtime, reverse=True)
+        except OSError:
+            return
+        # Place pour les deux fichiers de l'instance qui démarre
+        for entry in logs[2 * max(PROCESS_LOG_KEEP - 1, 0):]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                # Journal encore ouvert par un jeu en cours (Windows)
+                pass
+
+    def _tail_output(self, instance, path, buffer):
+        # Tampon circulaire : seules les dernières lignes sont gardées, le jeu n'est jamais bloqué
+        partial = b""
+        with open(path, "rb") as stream:
+            while True:
+                # Fin du processus vérifiée avant la lecture : tout ce qu'il a écrit est alors lisible
+                exited = instance.process.poll() is not None
+                chunk = stream.readline()
+                if chunk:
+                    partial += chunk
+                    if partial.endswith(b"\n"):
+                        self._append_output(instance, buffer, partial)
+                        partial = b""
+                    continue
+                if exited or self._stop.wait(self.OUTPUT_POLL_INTERVAL):
+                    if partial:
+                        self._append_output(instance, buffer, partial)
+                    return
+
+    def _append_output(self, instance, buffer, raw_line):
+        buffer.append(raw_line.decode("utf-8", "replace").rstrip())
+        if instance.state == "starting" and not self._ready_probes(instance):
+            self._mark_ready(instance, "output")
+
+    def _monitor_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            for instance in self.running():
+                try:
+                    self._check(instance)
+                except Exception as e:
+                    print(f"Error monitoring PID {instance.pid}: {e}")
+
+    def _check(self, instance):
+        if instance.process is None:
+            return
+        exit_code = instance.process.poll()
+        if exit_code is not None:
+            instance.exit_code = exit_code
+            instance.state = "exited"
+            self._notify(instance)
+            return
+
+        if instance.state == "starting":
+            for probe, name in self._ready_probes(instance):
+                if probe(instance):
+                    self._mark_ready(instance, name)
+                    break
+            else:
+                if instance.uptime() > self.ready_timeout:
+                    self._mark_running(instance)
+
+        sample = ResourceProbe.sample(instance.pid)
+        if sample is not None:
+            cpu_time, rss = sample
+            now = instance.uptime()
+            if instance._cpu_time is not None:
+                previous_time, previous_now = instance._cpu_time
+                elapsed = now - previous_now
+                cpu_percent = (cpu_time - previous_time) / elapsed * 100 if elapsed > 0 else 0.0
+                instance.samples.append((now, cpu_percent, rss))
+                instance.peak_rss = max(instance.peak_rss, rss)
+            instance._cpu_time = (cpu_time, now)
+        self._notify(instance)
+
+    def _ready_probes(self, instance):
+        probes = []
+        if sys.platform == "win32":
+            probes.append((ResourceProbe.has_window, "window"))
+        if instance.ready_port is not None:
+            probes.append((lambda target: ResourceProbe.port_in_use(target.ready_port), "port"))
+        return probes
+
+    def _mark_ready(self, instance, ready_via):
+        with self._lock:
+            if instance.state != "starting":
+                return
+            instance.ready_after = instance.uptime()
+            instance.ready_via = ready_via
+            instance.state = "ready"
+        self._notify(instance)
+
+    def _mark_running(self, instance):
+        # Démarrage jamais observé : les sondes ne sont plus relancées à chaque mesure
+        with self._lock:
+            if instance.state != "starting":
+                return
+            instance.ready_via = "timeout"
+            instance.state = "running"
+
+    def _notify(self, instance):
+        if self.on_change is not None:
+            try:
+                self.on_change(instance)
+            except Exception as e:
+                print(f"Error in process supervisor callback: {e}")
+
+
+class ResourceProbe:
+    """Per-process CPU time, resident memory and readiness checks without a hard dependency."""
+
+    _psutil = None
+
+    @staticmethod
+    def sample(pid):
+        """Return (cpu_seconds, rss_bytes) of pid, or None if it cannot be read."""
+        psutil = ResourceProbe._load_psutil()
+        try:
+            if psutil:
+                process = psutil.Process(pid)
+                times = process.cpu_times()
+                return times.user + times.system, process.memory_info().rss
+            if sys.platform.startswith("linux"):
+                return ResourceProbe._sample_proc(pid)
+            if sys.platform == "win32":
+                return ResourceProbe._sample_win32(pid)
+        except Exception:
+            return None
+        return None
+
+    # États "TCP_LISTEN" et "UDP non connecté" des tables de /proc/net
+    PROC_NET_STATES = {"tcp": "0A", "tcp6": "0A", "udp": "07", "udp6": "07"}
+
+    @staticmethod
+    def port_in_use(port):
+        """True if something on this machine listens on port (UDP, or TCP in the listening state).
+
+        The port is never bound by the probe itself, so the game can always take it: the
+        socket tables are read through psutil, /proc/net (Linux) or the IP Helper API
+        (Windows); elsewhere only a TCP listener is seen, through a connection attempt.
+        """
+        psutil = ResourceProbe._load_psutil()
+        if psutil:
+            try:
+                return any(
+                    connection.laddr and connection.laddr.port == port
+                    and (connection.type == socket.SOCK_DGRAM or connection.status == psutil.CONN_LISTEN)
+                    for connection in psutil.net_connections(kind="inet")
+                )
+            except psutil.AccessDenied:
+                # macOS : la table des sockets des autres processus demande les droits root
+                pass
+        try:
+            if sys.platform.startswith("linux"):
+                return ResourceProbe._port_in_proc_net(port)
+            if sys.platform == "win32":
+                return ResourceProbe._port_in_win32_tables(port)
+        except OSError:
+            pass
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.settimeout(0.2)
+            return probe.connect_ex(("127.0.0.1", port)) == 0
+
+    @staticmethod
+    def _port_in_proc_net(port):
+        suffix = f":{port:04X}"
+        for table, listening_state in ResourceProbe.PROC_NET_STATES.items():
+            try:
+                with open(f"/proc/net/{table}", "r") as table_file:
+                    next(table_file, None)
+                    for line in table_file:
+                        # sl local_address rem_address st ...
+                        fields = line.split()
+                        if len(fields) > 3 and fields[1].endswith(suffix) and fields[3] == listening_state:
+                            return True
+            except FileNotFoundError:
+                # Noyau sans IPv6
+                continue
+        return False
+
+    @staticmethod
+    def _port_in_win32_tables(port):
+        import ctypes
+        from ctypes import wintypes
+
+        iphlpapi = ctypes.WinDLL("iphlpapi")
+        AF_INET = 2
+        UDP_TABLE_BASIC = 0
+        TCP_TABLE_BASIC_LISTENER = 0
+        # Table = nombre de lignes puis lignes de DWORD : MIB_UDPROW (adresse, port),
+        # MIB_TCPROW (état, adresse locale, port local, adresse distante, port distant)
+        for get_table, table_class, row_size, port_field in (
+            (iphlpapi.GetExtendedUdpTable, UDP_TABLE_BASIC, 2, 1),
+            (iphlpapi.GetExtendedTcpTable, TCP_TABLE_BASIC_LISTENER, 5, 2),
+        ):
+            size = wintypes.DWORD(0)
+            get_table(None, ctypes.byref(size), False, AF_INET, table_class, 0)
+            buffer = (wintypes.DWORD * (size.value // 4 + 1))()
+            if get_table(buffer, ctypes.byref(size), False, AF_INET, table_class, 0) != 0:
+                raise OSError("GetExtended*Table failed")
+            for row in range(buffer[0]):
+                local_port = buffer[1 + row * row_size + port_field] & 0xFFFF
+                # Le port est stocké dans l'ordre réseau
+                if socket.ntohs(local_port) == port:
+                    return True
+        return False
+
+    @staticmethod
+    def has_window(instance):
+        """True once the process owns a visible top-level window (Windows only)."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.WinDLL("user32")
+        found = []
+
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, _):
+            window_pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(window_pid))
+            if window_pid.value == instance.pid and user32.IsWindowVisible(hwnd):
+                found.append(hwnd)
+                return False
+            return True
+
+        user32.EnumWindows(callback, 0)
+        return bool(found)
+
+    @staticmethod
+    def _load_psutil():
+        if ResourceProbe._psutil is None:
+            try:
+                import psutil
+                ResourceProbe._psutil = psutil
+            except ImportError:
+                ResourceProbe._psutil = False
+        return ResourceProbe._psutil
+
+    @staticmethod
+    def _sample_proc(pid):
+        with open(f"/proc/{pid}/stat", "r") as stat_file:
+            # Le nom du processus peut contenir des espaces : lire après la dernière parenthèse
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm", "r") as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+        ticks = os.sysconf("SC_CLK_TCK")
+        return (int(fields[11]) + int(fields[12])) / ticks, resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+    @staticmethod
+    def _sample_win32(pid):
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage"
+                )
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32")
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            creation, exit_time, kernel, user = (ctypes.c_ulonglong() for _ in range(4))
+            if not kernel32.GetProcessTimes(wintypes.HANDLE(handle), ctypes.byref(creation), ctypes.byref(exit_time),
+                                            ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            if not kernel32.K32GetProcessMemoryInfo(wintypes.HANDLE(handle), ctypes.byref(counters), counters.cb):
+                return None
+            # FILETIME : unités de 100 ns
+            return (kernel.value + user.value) / 1e7, counters.WorkingSetSize
+        finally:
+            kernel32.CloseHandle(wintypes.HANDLE(handle))
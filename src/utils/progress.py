@@ -0,0 +1,70 @@
+import collections
+import threading
+import time
+
+ProgressEvent = collections.namedtuple("ProgressEvent", ["done", "total", "stage", "rate", "eta"])
+
+
+class ProgressTracker:
+    """Latest-value progress slot shared between a transfer worker and the UI.
+
+    Workers call ``update`` as often as they like: it only stores the newest values
+    under a lock, so thousands of chunk updates coalesce into one. The UI calls
+    ``sample`` at its own frame rate and gets the progress plus a smoothed rate and ETA.
+    """
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._done = 0
+        self._total = 0
+        self._stage = None
+        self._rate = 0.0
+        self._last_sample = None
+
+    def update(self, done, total, stage="download"):
+        """Record progress; safe to call from any thread. Matches BuildInstaller's progress_callback."""
+        with self._lock:
+            if stage != self._stage:
+                # Nouvelle étape (téléchargement -> extraction) : le débit repart de zéro
+                self._rate = 0.0
+                self._last_sample = None
+            self._done = done
+            self._total = total
+            self._stage = stage
+
+    def sample(self):
+        """Return a ProgressEvent for the current state; call from the UI thread."""
+        now = time.monotonic()
+        with self._lock:
+            done, total, stage = self._done, self._total, self._stage
+            if self._last_sample is not None:
+                last_time, last_done = self._last_sample
+                if now > last_time:
+                    instant_rate = max(0, done - last_done) / (now - last_time)
+                    if self._rate:
+                        self._rate += self.smoothing * (instant_rate - self._rate)
+                    else:
+                        self._rate = instant_rate
+            self._last_sample = (now, done)
+            rate = self._rate
+
+        eta = (total - done) / rate if rate > 0 and total > done else None
+        return ProgressEvent(done, total, stage, rate, eta)
+
+
+def format_progress(event):
+    """Human-readable one-line summary of a ProgressEvent."""
+    if event.stage == "extract":
+        return f"Extracting: {event.done}/{event.total} files"
+
+    if event.total:
+        text = f"Progress: {int(event.done * 100 / event.total)}%"
+    else:
+        text = f"Progress: {event.done / (1024 * 1024):.1f} MB"
+    if event.rate:
+        text += f" - {event.rate / (1024 * 1024):.1f} MB/s"
+    if event.eta is not None:
+        minutes, seconds = divmod(int(event.eta), 60)
+        text += f" - ETA {minutes}:{seconds:02d}"
+    return text
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+
+from config import CACHE_DIRECTORY, RELEASE_CACHE_TTL
+
+
+class ReleaseCache:
+    """On-disk cache of GitHub API responses keyed by URL.
+
+    Each entry keeps the decoded JSON body together with the ETag / Last-Modified
+    validators so that a stale entry can be revalidated with a conditional request.
+    """
+
+    def __init__(self, path=None, ttl=RELEASE_CACHE_TTL):
+        self.path = path or os.path.join(CACHE_DIRECTORY, "releases.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def get(self, url):
+        """Return the cached entry for the URL, or None."""
+        with self._lock:
+            return self._load().get(url)
+
+    def is_fresh(self, entry, max_age=None):
+        """True if the entry is younger than max_age (defaults to the cache TTL)."""
+        if max_age is None:
+            max_age = self.ttl
+        return time.time() - entry.get("fetched_at", 0) < max_age
+
+    def store(self, url, data, etag=None, last_modified=None):
+        """Save a freshly downloaded response."""
+        with self._lock:
+            self._load()[url] = {
+                "data": data,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time()
+            }
+            self._save()
+
+    def touch(self, url):
+        """Mark an entry as just revalidated (the server answered 304 Not Modified)."""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry is not None:
+                entry["fetched_at"] = time.time()
+                self._save()
+
+    def conditional_headers(self, entry):
+        """Build the If-None-Match / If-Modified-Since headers for revalidating an entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as cache_file:
+                    self._entries = json.load(cache_file)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Écriture atomique : un arrêt brutal ne doit pas laisser un cache corrompu
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self._entries, cache_file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error writing release cache: {e}")
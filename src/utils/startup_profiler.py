@@ -0,0 +1,121 @@
+import contextlib
+import importlib.abc
+import sys
+import threading
+import time
+
+
+class _TimingLoader:
+    """Wrap a module loader so exec_module is timed by the StartupProfiler."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._time_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # get_data, get_resource_reader, ... restent ceux du loader d'origine
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Record import times and window construction phases for ``main.py --profile-startup``.
+
+    Imports are timed like ``python -X importtime``: self time excludes the nested
+    imports a module triggers, cumulative time includes them. Each thread keeps its own
+    stack of imports in progress, so the lazy imports of the background loads are charged
+    to the right modules; they are listed with their thread and left out of the total.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.imports = []
+        self.phases = []
+        self.first_paint_ms = None
+        self._finder = _TimingFinder(self)
+        self._local = threading.local()
+
+    def install(self):
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time one step of the launcher's construction."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def mark_first_paint(self):
+        self.first_paint_ms = (time.perf_counter() - self.started_at) * 1000
+
+    @contextlib.contextmanager
+    def _time_import(self, name):
+        # Pile propre au thread : les imports paresseux des chargements en arrière-plan s'entrelacent
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            thread = threading.current_thread()
+            self.imports.append((name, (cumulative - children) * 1e6, cumulative * 1e6, len(stack),
+                                 None if thread is threading.main_thread() else thread.name))
+
+    def report(self, top=25, budget_ms=None):
+        """Return the profile as text and whether the first paint stayed within budget_ms."""
+        lines = ["Slowest imports (us):", f"{'self':>10} | {'cumulative':>10} | module"]
+        for name, self_us, cumulative_us, depth, thread in sorted(self.imports, key=lambda item: item[2],
+                                                                  reverse=True)[:top]:
+            suffix = f"  [{thread}]" if thread else ""
+            lines.append(f"{self_us:>10.0f} | {cumulative_us:>10.0f} | {'  ' * depth}{name}{suffix}")
+        main_imports = [item for item in self.imports if item[4] is None]
+        total_import_ms = sum(item[2] for item in main_imports if item[3] == 0) / 1000
+        lines.append(f"Total import time: {total_import_ms:.1f} ms ({len(main_imports)} modules on the main thread, "
+                     f"{len(self.imports) - len(main_imports)} in the background)")
+
+        lines.append("")
+        lines.append("Construction phases (ms):")
+        for name, elapsed_ms in self.phases:
+            lines.append(f"{elapsed_ms:>10.1f}   {name}")
+
+        within_budget = True
+        if self.first_paint_ms is not None:
+            lines.append("")
+            lines.append(f"Time to first paint: {self.first_paint_ms:.1f} ms")
+            if budget_ms is not None:
+                within_budget = self.first_paint_ms <= budget_ms
+                verdict = "OK" if within_budget else "OVER BUDGET"
+                lines.append(f"Startup budget: {budget_ms} ms -> {verdict}")
+        return "\n".join(lines), within_budget
@@ -0,0 +1,73 @@
+import queue
+import threading
+
+
+class TaskRunner:
+    """Run blocking work on background threads and hand results back to the Tk main thread.
+
+    Tk widgets must only be touched from the thread running ``mainloop``. Workers
+    therefore never call back directly: they push ``(callback, value)`` pairs into a
+    thread-safe queue which the main thread drains every ``POLL_INTERVAL_MS`` via ``after()``.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._closed = False
+
+        # Threads démons : une requête réseau bloquée ne doit pas empêcher la fermeture
+        self._workers = []
+        for index in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"launcher-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def submit(self, func, *args, on_success=None, on_error=None, **kwargs):
+        """Queue ``func(*args, **kwargs)`` on a worker; ``on_success``/``on_error`` run on the Tk thread."""
+        self._tasks.put((func, args, kwargs, on_success, on_error))
+
+    def post(self, callback, *args):
+        """Schedule ``callback(*args)`` on the Tk thread. Safe to call from any thread."""
+        self._results.put((callback, args))
+
+    def shutdown(self):
+        """Stop polling and let idle workers exit."""
+        self._closed = True
+        for _ in self._workers:
+            self._tasks.put(None)
+
+    def _worker_loop(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            func, args, kwargs, on_success, on_error = task
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if on_error is not None:
+                    self.post(on_error, e)
+                else:
+                    print(f"Background task {getattr(func, '__name__', func)} failed: {e}")
+            else:
+                if on_success is not None:
+                    self.post(on_success, result)
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in UI callback {getattr(callback, '__name__', callback)}: {e}")
+
+        if not self._closed:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
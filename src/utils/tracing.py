@@ -0,0 +1,203 @@
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+from config import CACHE_DIRECTORY, TRACE_LOG_ENABLED, TRACE_LOG_MAX_BYTES, TRACE_LOG_BACKUPS
+
+
+class Span:
+    """One timed operation. Attributes and byte counts can be added while it runs."""
+
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.bytes = 0
+        self.outcome = "ok"
+        self.error = None
+        self.thread = threading.current_thread().name
+        self.thread_id = threading.get_ident()
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add_bytes(self, count):
+        self.bytes += count
+
+    def to_dict(self):
+        record = {
+            "ts": round(self.wall_start, 6),
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "outcome": self.outcome,
+            "thread": self.thread
+        }
+        if self.parent is not None:
+            record["parent"] = self.parent.name
+        if self.bytes:
+            record["bytes"] = self.bytes
+        if self.error is not None:
+            record["error"] = self.error
+        record.update(self.attributes)
+        return record
+
+
+class Tracer:
+    """Record spans around launcher operations.
+
+    Finished spans are appended to a size-rotated JSONL log (``cache/trace.jsonl``), kept
+    in memory for per-operation p50/p95 and for a Chrome trace-event export
+    (chrome://tracing, Perfetto). Use ``span`` as a context manager or ``traced`` as a
+    decorator; ``current`` returns the innermost open span of the calling thread.
+    """
+
+    def __init__(self, log_path=None, log_enabled=TRACE_LOG_ENABLED, max_bytes=TRACE_LOG_MAX_BYTES,
+                 backups=TRACE_LOG_BACKUPS, window=500, max_events=10000):
+        self.log_path = log_path or os.path.join(CACHE_DIRECTORY, "trace.jsonl")
+        self.log_enabled = log_enabled
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._durations = {}
+        self._events = collections.deque(maxlen=max_events)
+        self._log_file = None
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        stack = self._stack()
+        span = Span(name, attributes, stack[-1] if stack else None)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.outcome = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            self._record(span)
+
+    def traced(self, name=None):
+        """Decorator running the function inside a span (named after the function by default)."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def current(self):
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def stats(self):
+        """Return {name: {"count", "errors", "bytes", "p50_ms", "p95_ms"}} over the recent spans."""
+        with self._lock:
+            recent = {name: list(entries) for name, entries in self._durations.items()}
+        stats = {}
+        for name, entries in recent.items():
+            durations = sorted(duration for duration, _, _ in entries)
+            stats[name] = {
+                "count": len(entries),
+                "errors": sum(1 for _, outcome, _ in entries if outcome != "ok"),
+                "bytes": sum(byte_count for _, _, byte_count in entries),
+                "p50_ms": durations[int(0.50 * (len(durations) - 1))] * 1000,
+                "p95_ms": durations[int(0.95 * (len(durations) - 1))] * 1000
+            }
+        return stats
+
+    def export_chrome_trace(self, path):
+        """Write the spans kept in memory as a Chrome trace-event JSON file."""
+        with self._lock:
+            spans = list(self._events)
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": (span.start - self._origin) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": dict(span.attributes, outcome=span.outcome, bytes=span.bytes)
+            }
+            for span in spans
+        ]
+        thread_names = {span.thread_id: span.thread for span in spans}
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in thread_names.items()
+        )
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+        return len(spans)
+
+    def close(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span):
+        with self._lock:
+            entries = self._durations.get(span.name)
+            if entries is None:
+                entries = self._durations[span.name] = collections.deque(maxlen=self.window)
+            entries.append((span.duration, span.outcome, span.bytes))
+            self._events.append(span)
+            if self.log_enabled:
+                self._write(span)
+
+    def _write(self, span):
+        """Append one JSON line to the log, rotating it past max_bytes; the caller holds the lock."""
+        try:
+            if self._log_file is None:
+                directory = os.path.dirname(self.log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._log_file = open(self.log_path, "a", encoding="utf-8")
+            self._log_file.write(json.dumps(span.to_dict(), default=str) + "\n")
+            self._log_file.flush()
+            if self._log_file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Error writing trace log: {e}")
+            self.log_enabled = False
+
+    def _rotate(self):
+        self._log_file.close()
+        self._log_file = None
+        # trace.jsonl -> trace.jsonl.1 -> ... -> trace.jsonl.<backups>, la plus ancienne est supprimée
+        for index in range(self.backups, 0, -1):
+            source = self.log_path if index == 1 else f"{self.log_path}.{index - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_path}.{index}")
+        if not self.backups:
+            os.remove(self.log_path)
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+current_span = tracer.current
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import queue
+import shutil
+import threading
+import zipfile
+
+from utils.tracing import traced, current_span
+from utils.zip_stream import safe_member_path
+
+
+class ParallelZipExtractor:
+    """Extract a zip archive with several workers, each with its own handle on the file.
+
+    Members are spread across workers by uncompressed size (largest first) so the
+    workers finish at about the same time. zlib releases the GIL while inflating, so
+    plain threads use several cores without the cost of spawning processes.
+    """
+
+    COPY_SIZE = 1024 * 1024
+
+    def __init__(self, workers=None):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    @traced("extract")
+    def extract(self, zip_path, destination, progress_callback=None, reuse=None):
+        """Extract zip_path into destination.
+
+        progress_callback(extracted_members, total_members) is called from the calling
+        thread each time a member has been written. reuse(target_path, crc, size,
+        member_digest) may materialize a member itself and return True to skip writing it;
+        member_digest() returns the SHA-256 of the member, inflated without being written.
+        The hook is called from the worker threads.
+        """
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            members = zip_ref.infolist()
+        current_span().set(members=len(members))
+
+        # Créer tous les dossiers avant de lancer les workers pour éviter les courses sur makedirs
+        files = []
+        for member in members:
+            target_path = safe_member_path(destination, member.filename)
+            if member.is_dir():
+                os.makedirs(target_path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                files.append((member, target_path))
+
+        buckets = self._partition(files)
+        completed = queue.Queue()
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self._extract_bucket, args=(zip_path, bucket, completed, stop, reuse), daemon=True)
+            for bucket in buckets if bucket
+        ]
+        for thread in threads:
+            thread.start()
+
+        extracted = len(members) - len(files)
+        error = None
+        for _ in range(len(files)):
+            result = completed.get()
+            if isinstance(result, Exception):
+                error = result
+                stop.set()
+                break
+            extracted += 1
+            if progress_callback:
+                progress_callback(extracted, len(members))
+
+        for thread in threads:
+            thread.join()
+        if error is None:
+            while not completed.empty():
+                result = completed.get()
+                if isinstance(result, Exception):
+                    error = result
+        if error is not None:
+            raise error
+
+    def _partition(self, files):
+        buckets = [[] for _ in range(self.workers)]
+        loads = [0] * self.workers
+        for member, target_path in sorted(files, key=lambda item: item[0].file_size, reverse=True):
+            index = loads.index(min(loads))
+            buckets[index].append((member, target_path))
+            loads[index] += member.file_size
+        return buckets
+
+    def _extract_bucket(self, zip_path, bucket, completed, stop, reuse):
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+
+                def member_digest(member):
+                    sha256 = hashlib.sha256()
+                    with zip_ref.open(member) as source:
+                        for data in iter(lambda: source.read(self.COPY_SIZE), b""):
+                            sha256.update(data)
+                    return sha256.hexdigest()
+
+                for member, target_path in bucket:
+                    if stop.is_set():
+                        return
+                    if reuse is not None and reuse(target_path, member.CRC, member.file_size,
+                                                   lambda: member_digest(member)):
+                        completed.put(member.filename)
+                        continue
+                    with zip_ref.open(member) as source, open(target_path, "wb") as target:
+                        self._preallocate(target, member.file_size)
+                        shutil.copyfileobj(source, target, self.COPY_SIZE)
+                    completed.put(member.filename)
+        except Exception as e:
+            completed.put(e)
+
+    @staticmethod
+    def _preallocate(file, size):
+        """Reserve the member's size up front so the filesystem can lay it out contiguously."""
+        if size <= 0:
+            return
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(file.fileno(), 0, size)
+                return
+            except OSError:
+                pass
+        file.truncate(size)
+        file.seek(0)
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import struct
+import zlib
+
+
+class UnsupportedZipError(Exception):
+    """Raised when an archive cannot be extracted sequentially and needs the regular zipfile path."""
+
+
+def safe_member_path(destination, name):
+    """Resolve a member name inside destination, refusing absolute paths and '..'."""
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    if ".." in parts or (parts and parts[0].endswith(":")):
+        raise UnsupportedZipError(f"Unsafe member path '{name}'.")
+    return os.path.join(destination, *parts)
+
+
+class _ChunkReader:
+    """Byte reader over an iterator of chunks (e.g. ``response.iter_content``)."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read_some(self, size):
+        """Return up to size bytes, or b"" at the end of the stream."""
+        if not self._buffer:
+            self._buffer = next(self._chunks, b"")
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def read_exact(self, size):
+        parts = []
+        while size > 0:
+            data = self.read_some(size)
+            if not data:
+                raise zlib.error("Unexpected end of archive stream.")
+            parts.append(data)
+            size -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data):
+        self._buffer = data + self._buffer
+
+    def drain(self):
+        for _ in self._chunks:
+            pass
+
+
+class StreamingZipExtractor:
+    """Extract a zip archive while it is still being downloaded.
+
+    Members are read in order through their local file headers, so each one is
+    inflated and written as soon as its bytes arrive; the central directory at the
+    end of the archive is never needed. Stored members whose size is only given in a
+    trailing data descriptor cannot be delimited this way and raise UnsupportedZipError.
+    """
+
+    LOCAL_HEADER = b"PK\x03\x04"
+    DATA_DESCRIPTOR = b"PK\x07\x08"
+    WRITE_SIZE = 64 * 1024
+
+    def extract(self, chunks, destination, reuse=None):
+        """Extract the archive read from chunks into destination and return the member names.
+
+        reuse(target_path, crc, size, member_digest) may materialize a member itself (e.g.
+        from BuildStore) and return True, in which case nothing is written for it.
+        member_digest() returns the SHA-256 of the member, inflated in memory: the member's
+        compressed bytes are held in memory until the hook has decided.
+        """
+        reader = _ChunkReader(chunks)
+        names = []
+        while True:
+            signature = reader.read_exact(4)
+            if signature != self.LOCAL_HEADER:
+                # Répertoire central atteint : plus aucun fichier à extraire
+                reader.drain()
+                return names
+            names.append(self._extract_member(reader, destination, reuse))
+
+    def _extract_member(self, reader, destination, reuse):
+        (_, flags, method, _, _, crc, compressed_size, size,
+         name_length, extra_length) = struct.unpack("<HHHHHIIIHH", reader.read_exact(26))
+        raw_name = reader.read_exact(name_length)
+        extra = reader.read_exact(extra_length)
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+
+        if flags & 0x1:
+            raise UnsupportedZipError(f"Encrypted member '{name}' is not supported.")
+        if method not in (0, 8):
+            raise UnsupportedZipError(f"Compression method {method} of '{name}' is not supported.")
+
+        zip64 = False
+        if compressed_size == 0xFFFFFFFF or size == 0xFFFFFFFF:
+            zip64 = True
+            size, compressed_size = self._zip64_sizes(extra, size, compressed_size)
+
+        has_descriptor = bool(flags & 0x8)
+        if has_descriptor and method == 0:
+            raise UnsupportedZipError(f"Stored member '{name}' has no size in its local header.")
+
+        target_path = safe_member_path(destination, name)
+        if reuse is not None and not has_descriptor and not name.endswith("/"):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            compressed = reader.read_exact(compressed_size)
+
+            def member_digest():
+                sha256 = hashlib.sha256()
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == 8 else None
+                for offset in range(0, len(compressed), self.WRITE_SIZE):
+                    data = compressed[offset:offset + self.WRITE_SIZE]
+                    sha256.update(decompressor.decompress(data) if decompressor else data)
+                if decompressor:
+                    sha256.update(decompressor.flush())
+                return sha256.hexdigest()
+
+            if reuse(target_path, crc, size, member_digest):
+                return name
+            # Membre à écrire : ses octets déjà lus sont remis en tête du flux
+            reader.unread(compressed)
+
+        if name.endswith("/"):
+            os.makedirs(target_path, exist_ok=True)
+            output = None
+        else:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            output = open(target_path, "wb")
+
+        try:
+            if method == 8:
+                actual_crc = self._inflate(reader, output, None if has_descriptor else compressed_size)
+            else:
+                actual_crc = self._copy(reader, output, compressed_size)
+        finally:
+            if output is not None:
+                output.close()
+
+        if has_descriptor:
+            crc = self._read_descriptor(reader, zip64)
+        if actual_crc != crc:
+            raise zlib.error(f"CRC mismatch for '{name}'.")
+        return name
+
+    def _inflate(self, reader, output, compressed_size):
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        crc = 0
+        remaining = compressed_size
+        while not decompressor.eof:
+            to_read = self.WRITE_SIZE if remaining is None else min(self.WRITE_SIZE, remaining)
+            data = reader.read_some(to_read) if to_read else b""
+            if not data and to_read:
+                raise zlib.error("Unexpected end of archive stream.")
+            if remaining is not None:
+                remaining -= len(data)
+            inflated = decompressor.decompress(data)
+            if inflated:
+                crc = zlib.crc32(inflated, crc)
+                if output is not None:
+                    output.write(inflated)
+            if not to_read and not decompressor.eof:
+                raise zlib.error("Truncated deflate stream.")
+        # Les octets lus au-delà de la fin du flux deflate appartiennent à l'entrée suivante
+        reader.unread(decompressor.unused_data)
+        return crc
+
+    def _copy(self, reader, output, size):
+        crc = 0
+        while size > 0:
+            data = reader.read_some(min(self.WRITE_SIZE, size))
+            if not data:
+                raise zlib.error("Unexpected end of archive stream.")
+            size -= len(data)
+            crc = zlib.crc32(data, crc)
+            if output is not None:
+                output.write(data)
+        return crc
+
+    def _read_descriptor(self, reader, zip64):
+        head = reader.read_exact(4)
+        if head == self.DATA_DESCRIPTOR:
+            head = reader.read_exact(4)
+        crc = struct.unpack("<I", head)[0]
+        reader.read_exact(16 if zip64 else 8)
+        return crc
+
+    @staticmethod
+    def _zip64_sizes(extra, size, compressed_size):
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, data_size = struct.unpack("<HH", extra[offset:offset + 4])
+            data = extra[offset + 4:offset + 4 + data_size]
+            if header_id == 0x0001:
+                values = list(struct.unpack("<%dQ" % (len(data) // 8), data[:len(data) // 8 * 8]))
+                if size == 0xFFFFFFFF and values:
+                    size = values.pop(0)
+                if compressed_size == 0xFFFFFFFF and values:
+                    compressed_size = values.pop(0)
+                break
+            offset += 4 + data_size
+        return size, compressed_size